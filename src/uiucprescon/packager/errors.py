@@ -1,6 +1,6 @@
 """Custom exceptions."""
 # pylint: disable=unsubscriptable-object
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
 class ZipFileException(KeyError):
@@ -24,3 +24,30 @@ class ZipFileException(KeyError):
         self.src_zip_file = zip_file
         self.problem_files = problem_files or []
         super().__init__(*args)
+
+
+class TransformError(Exception):
+    """One or more items of a package could not be transformed.
+
+    .. versionadded:: 0.2.16
+    """
+
+    def __init__(
+            self,
+            failures: List[Tuple[str, str, BaseException]]
+    ) -> None:
+        """TransformError.
+
+        Args:
+            failures:
+                Object ID, item name and error of each item that failed, in
+                the order of the items
+        """
+        self.failures = failures
+        details = "; ".join(
+            f"{object_id} {item_name}: {error}"
+            for object_id, item_name, error in failures
+        )
+        super().__init__(
+            f"{len(failures)} item(s) failed to transform. {details}"
+        )
@@ -1,9 +1,14 @@
 """Package level."""
 
 # This is the abstract factory
+import copy
 import typing
 from .packages import collection
 from .packages.abs_package_builder import AbsPackageBuilder
+from .packages.filesystem import AbsFileSystem
+from .packages.manifest import load_manifest, ManifestSource
+from .packages.transform_engine import EXECUTORS
+from .packages.zip_output import get_compression
 
 
 class PackageFactory:
@@ -19,25 +24,113 @@ class PackageFactory:
 
     def locate_packages(
             self,
-            path: str
-    ) -> typing.Iterator[collection.Package]:
+            path: str,
+            max_workers: typing.Optional[int] = None,
+            streaming: typing.Optional[bool] = None,
+            filesystem: typing.Optional[AbsFileSystem] = None,
+            manifest: typing.Optional[ManifestSource] = None,
+            manifest_format: typing.Optional[str] = None
+    ) -> typing.Iterator[collection.AbsPackageComponent]:
         """Locate packages for a given type.
 
         Args:
             path: File path to locate packages
+            max_workers: Number of threads used to scan package
+                subdirectories, for package types that support it. Defaults
+                to the max_workers of the package type.
+            streaming: Yield each package as soon as its files are located,
+                for package types that support it. Defaults to the
+                streaming setting of the package type.
+            filesystem: File system to locate the packages on, such as a
+                ScanCache, to avoid reading the directories that have not
+                changed since the last time packages were located. Defaults
+                to the filesystem of the package type, or the local file
+                system.
+            manifest: Listing of the files in the batch, such as the output
+                of find. If provided, the packages are located from the
+                listing instead of the file system. Relative paths in it are
+                relative to path.
+            manifest_format: Format of the manifest, one of "lines", "csv"
+                or "json". By default, identified from its file extension.
 
         Yields:
             A new package if found
 
+        .. versionchanged:: 0.2.16
+            Added max_workers, streaming, filesystem, manifest
+            and manifest_format parameters
+
         """
-        yield from self._package_type.locate_packages(path)
+        if manifest is not None:
+            if filesystem is not None:
+                raise ValueError("Use either a manifest or a filesystem")
+            filesystem = load_manifest(manifest, manifest_format, root=path)
+        options = {
+            "max_workers": max_workers,
+            "streaming": streaming,
+            "filesystem": filesystem,
+        }
+        package_type = self._package_type
+        if any(value is not None for value in options.values()):
+            package_type = copy.copy(package_type)
+            for name, value in options.items():
+                if value is not None:
+                    setattr(package_type, name, value)
+        yield from package_type.locate_packages(path)
 
-    def transform(self, package: collection.Package, dest: str) -> None:
+    def transform(self,
+                  package: collection.Package,
+                  dest: str,
+                  zip_output: typing.Optional[str] = None,
+                  max_workers: typing.Optional[int] = None,
+                  executor: typing.Optional[str] = None) -> None:
         """Transform a given package into the current type.
 
         Args:
             package: Package to transform
             dest: File path to save the transformed package
+            zip_output: Write each object into a zip file in dest named
+                after the object, instead of a directory. Either "stored"
+                or "deflated". Defaults to the zip_output setting of the
+                package type.
+            max_workers: Number of items transformed at the same time.
+                Defaults to the transform_workers setting of the package
+                type.
+            executor: Either "thread" or "process", the kind of pool used
+                when max_workers is more than 1. Defaults to the
+                transform_executor setting of the package type.
+
+        Raises:
+            ValueError: if zip_output is given to a package type that only
+                writes directories, or executor is unknown
+            TransformError: if any item failed to transform while
+                transforming more than one item at a time
+
+        .. versionchanged:: 0.2.16
+            Added zip_output, max_workers and executor parameters
 
         """
-        self._package_type.transform(package, dest)
+        package_type = self._package_type
+        options: typing.Dict[str, typing.Any] = {}
+        if zip_output is not None:
+            if not package_type.supports_zip_output:
+                raise ValueError(
+                    f"{type(package_type).__name__} does not support zip "
+                    f"output"
+                )
+            get_compression(zip_output)
+            options["zip_output"] = zip_output
+        if max_workers is not None:
+            options["transform_workers"] = max_workers
+        if executor is not None:
+            if executor not in EXECUTORS:
+                raise ValueError(
+                    f"Unknown executor {executor}. "
+                    f"Expected one of {', '.join(EXECUTORS)}"
+                )
+            options["transform_executor"] = executor
+        if options:
+            package_type = copy.copy(package_type)
+            for key, value in options.items():
+                setattr(package_type, key, value)
+        package_type.transform(package, dest)
@@ -7,6 +7,11 @@ from .hathi_jp2_package import HathiJp2
 from .hathi_limited_package import HathiLimitedView
 from .eas import Eas
 from .noneas import CatalogedNonEAS, ArchivalNonEAS
+from .scan_cache import ScanCache
+from .filesystem import InMemoryFileSystem, LocalFileSystem
+from .file_table import FileTable
+from .zip_session import ZipSession
+from .item_task import ItemTask
 
 __all__ = [
     "CaptureOnePackage",
@@ -16,5 +21,11 @@ __all__ = [
     "HathiLimitedView",
     "CatalogedNonEAS",
     "ArchivalNonEAS",
-    "Eas"
+    "Eas",
+    "ScanCache",
+    "InMemoryFileSystem",
+    "LocalFileSystem",
+    "FileTable",
+    "ZipSession",
+    "ItemTask",
 ]
@@ -2,18 +2,140 @@
 import abc
 import logging
 import typing
-from .collection import Package
+from .collection import AbsPackageComponent, Item, Package
+from .item_task import ItemTask
+from .filesystem import AbsFileSystem
+from .scan_cache import ScanCache
+from .transform_engine import run_item_transforms
 
 
 class AbsPackageBuilder(metaclass=abc.ABCMeta):
-    """Base class for working with file packages."""
+    """Base class for working with file packages.
+
+    Attributes:
+        max_workers:
+            Number of threads used to locate packages in separate
+            subdirectories, for package types that support it. If None, they
+            are located one at a time.
+        streaming:
+            If True, package types that support it yield each package as
+            soon as its files are located instead of building the whole
+            batch first. The packages yielded are not kept as children of
+            their parent.
+        filesystem:
+            File system the packages are located on. If None, the local file
+            system is used. Set it to a ScanCache to read the listings of
+            directories that have not changed since they were last read
+            from the cache.
+        zip_output:
+            If set, package types that support it write each transformed
+            object into a zip file named after the object, instead of a
+            directory. Either "stored" or "deflated".
+        supports_zip_output:
+            If the package type can write transformed objects into zip
+            files.
+        transform_workers:
+            Number of items transformed at the same time. If None, they are
+            transformed one at a time.
+        transform_executor:
+            Either "thread" or "process", the kind of pool that items are
+            transformed on when transform_workers is more than 1.
+
+    .. versionchanged:: 0.2.16
+        Added max_workers, streaming, filesystem, zip_output,
+        supports_zip_output, transform_workers and transform_executor
+        attributes
+
+    """
 
     log_level = logging.INFO
+    max_workers: typing.Optional[int] = None
+    streaming: bool = False
+    filesystem: typing.Optional[AbsFileSystem] = None
+    zip_output: typing.Optional[str] = None
+    supports_zip_output: bool = False
+    transform_workers: typing.Optional[int] = None
+    transform_executor: str = "thread"
+
+    def __getstate__(self) -> typing.Dict[str, typing.Any]:
+        """Pickle the builder without the scan cache it locates with."""
+        state = self.__dict__.copy()
+        # A scan cache holds an open database connection and is only needed
+        # to locate packages, not to transform them in a worker process.
+        filesystem = state.get("filesystem")
+        if isinstance(filesystem, ScanCache):
+            state["filesystem"] = filesystem.filesystem
+        return state
 
     @abc.abstractmethod
-    def locate_packages(self, path: str) -> typing.Iterator[Package]:
-        """Locate packages found at a given path."""
+    def locate_packages(
+            self,
+            path: str
+    ) -> typing.Iterator[AbsPackageComponent]:
+        """Locate packages found at a given path.
+
+        .. versionchanged:: 0.2.16
+            Annotated as yielding package components, as package types that
+                stream yield the package objects.
+        """
 
     @abc.abstractmethod
     def transform(self, package: Package, dest: str) -> None:
         """Transform a package into a the current type at given destination."""
+
+    def transform_items(
+            self,
+            items: typing.Iterable[Item],
+            transform_item: typing.Callable[[Item], None],
+            executor: typing.Optional[str] = None,
+            transform_task: typing.Optional[
+                typing.Callable[[ItemTask], None]
+            ] = None,
+            finish_item: typing.Optional[typing.Callable[[Item], None]] = None
+    ) -> None:
+        """Call transform_item with each item, using transform_workers.
+
+        See :py:func:`run_item_transforms` for how errors and log messages
+        are handled when the items are transformed concurrently.
+
+        Args:
+            items: Items to transform
+            transform_item: Function transforming a single item
+            executor: Overrides transform_executor
+            transform_task: Used instead of transform_item on a process
+                pool. Each item is turned into an ItemTask by create_task in
+                the current process and only the task is sent to the worker
+                process. Package types that do not give one send the items
+                themselves.
+            finish_item: Called with each item in order once it has been
+                transformed by transform_item
+
+        .. versionadded:: 0.2.16
+        """
+        executor = executor or self.transform_executor
+        if executor == "process" and transform_task is not None and \
+                (self.transform_workers or 0) > 1:
+            run_item_transforms(
+                map(self.create_task, items),
+                transform_task,
+                max_workers=self.transform_workers,
+                executor=executor
+            )
+            return
+        run_item_transforms(
+            items,
+            transform_item,
+            max_workers=self.transform_workers,
+            executor=executor,
+            finish_item=finish_item
+        )
+
+    def create_task(self, item: Item) -> ItemTask:
+        """Describe how to transform an item, for transform_task.
+
+        By default, the task has the files of every instantiation of the
+        item and no strategy name.
+
+        .. versionadded:: 0.2.16
+        """
+        return ItemTask.from_item(item)
@@ -3,16 +3,25 @@
 # pylint: disable=unsubscriptable-object
 from __future__ import annotations
 
+import copy
+import functools
 import logging
 import os
 import re
 import typing
-from typing import Optional, Dict, Callable, Iterator, Iterable
+from typing import Optional, Dict, Callable, Iterator, Iterable, List
 from uiucprescon.packager import transformations
 from uiucprescon.packager.common import \
     Metadata, PackageTypes, InstantiationTypes
 from uiucprescon.packager.packages import collection_builder, collection
 from .abs_package_builder import AbsPackageBuilder
+from .item_task import ItemTask
+from .zip_session import ZipSession
+from .filesystem import AbsFileSystem, LocalFileSystem
+
+FileIndex = Dict[str, Dict[str, List[str]]]
+
+SPLITTER_CACHE_SIZE = 65536
 
 
 class CaptureOneBuilder(collection_builder.AbsCollectionBuilder):
@@ -23,11 +32,31 @@ class CaptureOneBuilder(collection_builder.AbsCollectionBuilder):
         adding a function to the splitter property
     """
 
-    def __init__(self) -> None:
-        """Init a new CaptureOneBuilder."""
-        super().__init__()
+    def __init__(self,
+                 filesystem: Optional[AbsFileSystem] = None) -> None:
+        """Init a new CaptureOneBuilder.
+
+        Args:
+            filesystem: File system the files are located on. Defaults to
+                the local file system.
+
+        .. versionchanged:: 0.2.16
+            Added filesystem parameter
+        """
+        super().__init__(filesystem=filesystem)
         self.splitter: \
             Optional[Callable[[str], Optional[Dict[str, str]]]] = None
+        self._file_indexes: Dict[str, FileIndex] = {}
+
+    def __copy__(self) -> "CaptureOneBuilder":
+        """Copy the settings of the builder, without its file indexes.
+
+        .. versionadded:: 0.2.16
+        """
+        new_builder = self.__class__.__new__(self.__class__)
+        new_builder.__dict__.update(self.__dict__)
+        new_builder._file_indexes = {}
+        return new_builder
 
     def identify_file_name_parts(self,
                                  file_name: str) -> Optional[Dict[str, str]]:
@@ -48,65 +77,157 @@ class CaptureOneBuilder(collection_builder.AbsCollectionBuilder):
         return underscore_splitter(file_name)
 
     @classmethod
-    def locate_batch_files(cls, root: str) -> Iterable["os.DirEntry[str]"]:
-        """Locate tiff files found on root."""
+    def locate_batch_files(
+            cls,
+            root: str,
+            scandir: Optional[collection_builder.Scandir] = None
+    ) -> Iterable["os.DirEntry[str]"]:
+        """Locate tiff files found on root.
+
+        .. versionchanged:: 0.2.16
+            Added scandir argument, used to list root. Defaults to
+            os.scandir.
+        """
         def filter_only_tiff(item: "os.DirEntry[str]") -> bool:
             return item.name.lower().endswith(".tif")
 
         for file_ in filter(
                 filter_only_tiff,
                 filter(
-                    CaptureOneBuilder.filter_nonsystem_files_only,
-                    os.scandir(root)
+                    cls.filter_nonsystem_files_only,
+                    (scandir or os.scandir)(root)
                 )):
             yield file_
 
     def build_batch(self, root: str) -> collection_builder.AbsPackageComponent:
-        """Build a capture one style batch object."""
+        """Build a capture one style batch object.
+
+        .. versionchanged:: 0.2.16
+            The root is scanned and every file name is parsed only once. The
+            resulting index is reused by build_package and build_instance.
+        """
         new_batch = collection.Package(root)
         new_batch.component_metadata[Metadata.PATH] = root
 
-        files = list(self.locate_batch_files(root=root))
+        file_index = self.build_file_index(root)
+        self._file_indexes = {root: file_index}
+
+        for object_name in sorted(file_index):
+            new_object = collection.PackageObject(parent=new_batch)
+            new_object.component_metadata[Metadata.ID] = object_name
+
+            new_object.component_metadata[Metadata.PACKAGE_TYPE] = \
+                PackageTypes.CAPTURE_ONE_SESSION
+            self.build_package(new_object, root)
+        return new_batch
 
-        files.sort(key=lambda f: f.name)
+    def iter_objects(self, root: str) -> Iterator[collection.PackageObject]:
+        """Build the objects of a capture one batch one at a time.
+
+        Each object is yielded as soon as it is built. The batch does not
+        keep the objects as children, so they can be released by the caller
+        once they are no longer needed.
+
+        .. versionadded:: 0.2.16
+
+        Args:
+            root: path to the Capture One session folder
 
-        group_ids = set()
+        Yields:
+            Package objects in the order of their group ids
 
-        for file_ in files:
+        """
+        new_batch = collection.Package(root)
+        new_batch.component_metadata[Metadata.PATH] = root
+
+        file_index = self.build_file_index(root)
+        self._file_indexes = {root: file_index}
+        try:
+            for object_name in sorted(file_index):
+                new_object = collection.PackageObject(parent=new_batch)
+                new_object.component_metadata[Metadata.ID] = object_name
+
+                new_object.component_metadata[Metadata.PACKAGE_TYPE] = \
+                    PackageTypes.CAPTURE_ONE_SESSION
+                self.build_package(new_object, root)
+                new_batch.objects.remove(new_object)
+                del file_index[object_name]
+                yield new_object
+        finally:
+            self._file_indexes.pop(root, None)
+
+    def build_file_index(self, root: str) -> FileIndex:
+        """Scan root once and index the tiff files by group and part.
+
+        Args:
+            root: path to the Capture One session folder
+
+        Returns:
+            Mapping of group id to a mapping of part to the file paths of
+            that part, sorted by file name.
+
+        """
+        def is_file(item: "os.DirEntry[str]") -> bool:
+            return item.is_file()
+
+        file_index: FileIndex = {}
+        for file_path in sorted(
+                self.locate_tiff_instances(root, is_file,
+                                           scandir=self.scandir),
+                key=os.path.basename
+        ):
+            file_name = os.path.basename(file_path)
             try:
-                file_name_parts = self.identify_file_name_parts(file_.name)
+                file_name_parts = self.identify_file_name_parts(file_name)
                 if file_name_parts is None:
                     raise ValueError(
-                        f"File {file_.name} doesn't match expected pattern"
+                        f"File {file_name} doesn't match expected pattern"
                     )
-
                 group_id = file_name_parts['group']
-                group_ids.add(group_id)
+                part = file_name_parts['part']
             except ValueError as error:
-                raise ValueError(
-                    f"Unable to split {file_.name}") from error
+                raise ValueError(f"Unable to split {file_name}") from error
 
-        for object_name in sorted(group_ids):
-            new_object = collection.PackageObject(parent=new_batch)
-            new_object.component_metadata[Metadata.ID] = object_name
+            file_index.setdefault(group_id, {}).setdefault(part, []).append(
+                file_path
+            )
+        return file_index
 
-            new_object.component_metadata[Metadata.PACKAGE_TYPE] = \
-                PackageTypes.CAPTURE_ONE_SESSION
-            self.build_package(new_object, root)
-        return new_batch
+    def get_file_index(self, path: str) -> FileIndex:
+        """Get the file index for a path, scanning it if not already indexed.
+
+        Args:
+            path: path to the Capture One session folder
+
+        Returns:
+            Mapping of group id to part to file paths
+
+        """
+        file_index = self._file_indexes.get(path)
+        if file_index is None:
+            file_index = self.build_file_index(path)
+            self._file_indexes[path] = file_index
+        return file_index
 
     @classmethod
     def locate_tiff_instances(
             cls,
             path: str,
-            is_it_an_instance: typing.Callable[["os.DirEntry[str]"], bool]
+            is_it_an_instance: typing.Callable[["os.DirEntry[str]"], bool],
+            scandir: Optional[collection_builder.Scandir] = None
     ) -> Iterable[str]:
-        """Locate tiff files on the path."""
+        """Locate tiff files on the path.
+
+        .. versionchanged:: 0.2.16
+            Added scandir argument, used to list the path. Defaults to
+            os.scandir.
+        """
         return [
             file.path
             for file in filter(
                 is_it_an_instance,
-                filter(cls.filter_nonsystem_files_only, os.scandir(path)),
+                filter(cls.filter_nonsystem_files_only,
+                       (scandir or os.scandir)(path)),
             )
             if file.name.lower().endswith(".tif")
         ]
@@ -121,25 +242,9 @@ class CaptureOneBuilder(collection_builder.AbsCollectionBuilder):
     ) -> None:
         """Build a capture one style instance object."""
         group_id = parent.metadata[Metadata.ID]
-
-        def is_it_an_instance(item: "os.DirEntry[str]") -> bool:
-            if not item.is_file():
-                return False
-            file_name_parts = self.identify_file_name_parts(item.name)
-            if file_name_parts is None:
-                raise ValueError(
-                    f"File does not match expected naming pattern {item.path}"
-                )
-            item_group = file_name_parts['group']
-            item_inst = file_name_parts['part']
-            if item_inst != filename:
-                return False
-
-            if item_group != group_id:
-                return False
-            return True
-
-        files = self.locate_tiff_instances(path, is_it_an_instance)
+        files = list(
+            self.get_file_index(path).get(group_id, {}).get(filename, [])
+        )
 
         collection.Instantiation(
             category=InstantiationTypes.PRESERVATION,
@@ -147,31 +252,29 @@ class CaptureOneBuilder(collection_builder.AbsCollectionBuilder):
             files=files)
 
     @classmethod
-    def get_non_system_files(cls, path: str) -> Iterable["os.DirEntry[str]"]:
-        """Locate files that aren't generated by the os."""
-        return filter(cls.filter_nonsystem_files_only, os.scandir(path))
+    def get_non_system_files(
+            cls,
+            path: str,
+            scandir: Optional[collection_builder.Scandir] = None
+    ) -> Iterable["os.DirEntry[str]"]:
+        """Locate files that aren't generated by the os.
+
+        .. versionchanged:: 0.2.16
+            Added scandir argument, used to list the path. Defaults to
+            os.scandir.
+        """
+        return filter(cls.filter_nonsystem_files_only,
+                      (scandir or os.scandir)(path))
 
     def build_package(self, parent, path: str, *args, **kwargs) -> None:
         """Build a capture one style package object."""
         group_id = parent.metadata[Metadata.ID]
-        non_system_files = self.get_non_system_files(path)
-
-        def filter_by_group(candidate_file: "os.DirEntry[str]") -> bool:
-            parts = self.identify_file_name_parts(candidate_file.name)
-            return parts is not None and parts['group'] == group_id
-
-        for file_ in filter(filter_by_group, non_system_files):
-            file_name_parts = self.identify_file_name_parts(file_.name)
-            if file_name_parts is None:
-                raise ValueError(
-                    f"File does not match expected naming pattern {file_.path}"
-                )
-            if file_name_parts['extension'].lower() != ".tif":
-                continue
-            item_part = file_name_parts['part']
-            new_item = collection.Item(parent=parent)
-            new_item.component_metadata[Metadata.ITEM_NAME] = item_part
-            self.build_instance(new_item, path, item_part)
+        parts = self.get_file_index(path).get(group_id, {})
+        for item_part, files in parts.items():
+            for _ in files:
+                new_item = collection.Item(parent=parent)
+                new_item.component_metadata[Metadata.ITEM_NAME] = item_part
+                self.build_instance(new_item, path, item_part)
 
 
 def underscore_splitter(file_name: str) -> Optional[Dict[str, str]]:
@@ -182,13 +285,10 @@ def underscore_splitter(file_name: str) -> Optional[Dict[str, str]]:
 
     Returns: Dictionary containing the identified components
 
+    .. versionchanged:: 0.2.16
+        The regex is compiled once and results are cached by file name.
     """
-    regex_builder = GrouperRegexBuilder()
-    group_regex = regex_builder.build()
-    result = group_regex.match(file_name)
-    if result is None or len(result.groups()) == 0:
-        return None
-    return result.groupdict()
+    return get_splitter(part_delimiter='_')(file_name)
 
 
 def dash_splitter(file_name: str) -> Optional[Dict[str, str]]:
@@ -199,15 +299,10 @@ def dash_splitter(file_name: str) -> Optional[Dict[str, str]]:
 
     Returns: Dictionary containing the identified components
 
+    .. versionchanged:: 0.2.16
+        The regex is compiled once and results are cached by file name.
     """
-    regex_builder = GrouperRegexBuilder()
-    regex_builder.part_delimiter = '-'
-    regex_builder.volume_delimiter = '_'
-    group_regex = regex_builder.build()
-    result = group_regex.match(file_name)
-    if result is None or len(result.groups()) == 0:
-        return None
-    return result.groupdict()
+    return get_splitter(part_delimiter='-', volume_delimiter='_')(file_name)
 
 
 class CaptureOnePackage(AbsPackageBuilder):
@@ -246,46 +341,84 @@ class CaptureOnePackage(AbsPackageBuilder):
         self.delimiter = delimiter
         splitter = CaptureOnePackage.delimiter_splitters.get(delimiter)
         if splitter is None:
-            def splitter(filename: str) -> Optional[Dict[str, str]]:
-                return delimiter_splitter(
-                    file_name=filename,
-                    delimiter=delimiter
-                )
+            splitter = get_delimiter_splitter(delimiter)
 
         self.package_builder = CaptureOneBuilder()
         self.package_builder.splitter = splitter
 
-    def locate_packages(self, path: str) -> Iterator[collection.Package]:
-        """Locate Capture One style packages."""
-        yield from self.package_builder.build_batch(path)
+    def locate_packages(
+            self,
+            path: str
+    ) -> Iterator[collection.AbsPackageComponent]:
+        """Locate Capture One style packages.
+
+        .. versionchanged:: 0.2.16
+            If streaming is set, each package is yielded as soon as it is
+                located.
+        """
+        # The package type may be a copy sharing package_builder with
+        # others, see PackageFactory.locate_packages
+        package_builder = copy.copy(self.package_builder)
+        package_builder.filesystem = LocalFileSystem() \
+            if self.filesystem is None else self.filesystem
+        if self.streaming:
+            yield from package_builder.iter_objects(path)
+            return
+        yield from package_builder.build_batch(path)
 
     def transform(self, package: collection.Package, dest: str) -> None:
-        """Transform package into a capture one style package."""
+        """Transform package into a capture one style package.
+
+        Files extracted from a zipped source package are removed once the
+        package has been transformed.
+
+        .. versionchanged:: 0.2.16
+            Supports transform_workers and transform_executor
+        """
         logger = logging.getLogger(__name__)
         logger.setLevel(AbsPackageBuilder.log_level)
+        with ZipSession():
+            self.transform_items(
+                package,
+                functools.partial(self.transform_one_item, dest=dest),
+                transform_task=functools.partial(
+                    self.transform_task, dest=dest
+                )
+            )
 
-        item: collection.Item
-        for item in package:
-            item_name = item.metadata[Metadata.ITEM_NAME]
-            object_name = item.metadata[Metadata.ID]
-
-            inst: collection.Instantiation
-            for inst in item:
-                files = list(inst.get_files())
-                if len(files) != 1:
-                    raise AssertionError("More than one file found")
-
-                for file_ in files:
-                    _, ext = os.path.splitext(file_)
-                    new_file_name = \
-                        f"{object_name}{self.delimiter}{item_name}{ext}"
-
-                    copy = transformations.Transformers(
-                        strategy=transformations.CopyFile(),
-                        logger=logger
-                    )
-                    new_file_path = os.path.join(dest, new_file_name)
-                    copy.transform(source=file_, destination=new_file_path)
+    def transform_task(self, task: ItemTask, dest: str) -> None:
+        """Transform a single item from its task.
+
+        .. versionadded:: 0.2.16
+        """
+        self.transform_one_item(task.to_item(), dest)
+
+    def transform_one_item(self, item: collection.Item, dest: str) -> None:
+        """Copy the files of a single item into dest.
+
+        .. versionadded:: 0.2.16
+        """
+        logger = logging.getLogger(__name__)
+        item_name = item.metadata[Metadata.ITEM_NAME]
+        object_name = item.metadata[Metadata.ID]
+
+        inst: collection.Instantiation
+        for inst in item:
+            files = list(inst.get_files())
+            if len(files) != 1:
+                raise AssertionError("More than one file found")
+
+            for file_ in files:
+                _, ext = os.path.splitext(file_)
+                new_file_name = \
+                    f"{object_name}{self.delimiter}{item_name}{ext}"
+
+                copier = transformations.Transformers(
+                    strategy=transformations.CopyFile(),
+                    logger=logger
+                )
+                new_file_path = os.path.join(dest, new_file_name)
+                copier.transform(source=file_, destination=new_file_path)
 
 
 def delimiter_splitter(
@@ -299,16 +432,12 @@ def delimiter_splitter(
         delimiter: string that splits the group from the part in the file name
 
     Returns: Dictionary containing the identified components
+
+    .. versionchanged:: 0.2.16
+        The regex is compiled once per delimiter and results are cached by
+        file name.
     """
-    result = re.match(r'^'
-                      r'(?P<group>\d*)'
-                      f'[{delimiter}]'
-                      r'(?P<part>[0-9]*)'
-                      r'(?P<extension>\.[A-Za-z0-9]*)?'
-                      r'$', file_name)
-    if result is None or len(result.groups()) == 0:
-        return None
-    return result.groupdict()
+    return get_delimiter_splitter(delimiter)(file_name)
 
 
 class GrouperRegexBuilder:
@@ -358,3 +487,133 @@ class GrouperRegexBuilder:
         else:
             volume_delimiter = self.volume_delimiter
         return fr"(?P<group>([0-9]+?({volume_delimiter}[0-9]+)?))"
+
+
+class FileNameSplitter:
+    """Split file names into components using a precompiled regex.
+
+    Results are kept in a bounded LRU cache keyed by the file name so that
+    the same name seen again is not matched a second time.
+
+    .. versionadded:: 0.2.16
+
+    Examples:
+        >>> splitter = FileNameSplitter(compile_grouper_regex('_'))
+        >>> splitter("000001_00000001.tif")['part']
+        '00000001'
+        >>> splitter("000001_00000001.tif")['group']
+        '000001'
+        >>> splitter.cache_info().hits, splitter.cache_info().misses
+        (1, 1)
+    """
+
+    def __init__(
+            self,
+            pattern: typing.Pattern[str],
+            cache_size: Optional[int] = SPLITTER_CACHE_SIZE
+    ) -> None:
+        """Create a new splitter.
+
+        Args:
+            pattern: compiled regex with group, part and extension groups
+            cache_size: maximum number of file names to remember. Use None
+                for no limit.
+        """
+        self.pattern = pattern
+        self._split = functools.lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, file_name: str) -> Optional[Dict[str, str]]:
+        result = self.pattern.match(file_name)
+        if result is None or len(result.groups()) == 0:
+            return None
+        return result.groupdict()
+
+    def __call__(self, file_name: str) -> Optional[Dict[str, str]]:
+        """Split the file name into components.
+
+        Args:
+            file_name: the name of a given file
+
+        Returns: Dictionary containing the identified components
+
+        """
+        result = self._split(file_name)
+        if result is None:
+            return None
+        # Copy so that callers can't modify the cached value
+        return dict(result)
+
+    def cache_info(self) -> "functools._CacheInfo":
+        """Get the hit and miss statistics of the parse cache."""
+        return self._split.cache_info()
+
+    def cache_clear(self) -> None:
+        """Clear the parse cache and its statistics."""
+        self._split.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def compile_grouper_regex(
+        part_delimiter: str = "_",
+        volume_delimiter: Optional[str] = None
+) -> typing.Pattern[str]:
+    """Compile the regex for the delimiters only once.
+
+    .. versionadded:: 0.2.16
+
+    Args:
+        part_delimiter: Character used to split the part from the group
+        volume_delimiter: Character used to split the volume from the group
+
+    Returns: compiled regex generated by GrouperRegexBuilder
+
+    """
+    regex_builder = GrouperRegexBuilder()
+    regex_builder.part_delimiter = part_delimiter
+    regex_builder.volume_delimiter = volume_delimiter
+    return regex_builder.build()
+
+
+@functools.lru_cache(maxsize=None)
+def get_splitter(
+        part_delimiter: str = "_",
+        volume_delimiter: Optional[str] = None
+) -> FileNameSplitter:
+    """Get a shared splitter for the given delimiters.
+
+    .. versionadded:: 0.2.16
+
+    Args:
+        part_delimiter: Character used to split the part from the group
+        volume_delimiter: Character used to split the volume from the group
+
+    Returns: splitter that caches the results of the file names it parsed
+
+    """
+    return FileNameSplitter(
+        compile_grouper_regex(part_delimiter, volume_delimiter)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_delimiter_splitter(delimiter: str) -> FileNameSplitter:
+    """Get a shared splitter that splits group and part by a delimiter.
+
+    .. versionadded:: 0.2.16
+
+    Args:
+        delimiter: string that splits the group from the part in the file name
+
+    Returns: splitter that caches the results of the file names it parsed
+
+    """
+    return FileNameSplitter(
+        re.compile(
+            r'^'
+            r'(?P<group>\d*)'
+            f'[{delimiter}]'
+            r'(?P<part>[0-9]*)'
+            r'(?P<extension>\.[A-Za-z0-9]*)?'
+            r'$'
+        )
+    )
@@ -2,22 +2,235 @@
 # pylint: disable=unsubscriptable-object
 import abc
 import collections
+import contextlib
 import os
+import sys
 import typing
-from tempfile import TemporaryDirectory
-from typing import Optional, Union, Dict, ChainMap, List, Tuple
+from typing import Optional, Union, Dict, ChainMap, List, Tuple, Iterable, \
+    Iterator, Mapping, Sequence
 import warnings
-from zipfile import ZipFile
 
 from uiucprescon.packager.common import Metadata, CollectionEnums
 from uiucprescon.packager.common import InstantiationTypes
 from uiucprescon.packager.errors import ZipFileException
+from .zip_session import ExtractionReport, ZipSession, current_session
 
 MetadataTypes = Optional[Union[str, CollectionEnums]]
 
 
+def _split_common_prefix(
+        paths: Iterable[str]
+) -> Tuple[Optional[str], List[str]]:
+    """Split paths into the directory prefix they share and their names.
+
+    The prefix keeps its trailing separator, so joining it back to a name
+    gives the exact same path. If the paths are not all in the same
+    directory, they are returned whole with no prefix.
+    """
+    paths = list(paths)
+    prefix: Optional[str] = None
+    names = []
+    for path in paths:
+        if not isinstance(path, str):
+            return None, paths
+        index = path.rfind(os.sep)
+        if os.altsep:
+            index = max(index, path.rfind(os.altsep))
+        path_prefix = path[:index + 1]
+        if prefix is None:
+            prefix = path_prefix
+        elif path_prefix != prefix:
+            return None, paths
+        names.append(path[index + 1:])
+    if not prefix:
+        return None, paths
+    return sys.intern(prefix), names
+
+
+@contextlib.contextmanager
+def _session_or_own(session: Optional[ZipSession]) -> Iterator[ZipSession]:
+    """Use the session given or the current one, or else one for the block.
+
+    A session created for the block is cleaned up when the block is
+    finished, so the files it extracted only last as long as the block.
+    """
+    zip_session = session or current_session()
+    if zip_session is not None:
+        yield zip_session
+        return
+    own_session = ZipSession()
+    try:
+        yield own_session
+    finally:
+        own_session.cleanup()
+
+
+class _FileList(typing.MutableSequence[str]):
+    """List of the files of an instantiation, stored as prefix and names.
+
+    Changes made through the list are written back to the instantiation.
+    Appending a path only adds its name if it is in the same directory as
+    the others, or adds it whole if the paths are already stored whole.
+    Any other change splits the paths into prefix and names again.
+    """
+
+    __slots__ = ("_instantiation",)
+
+    def __init__(self, instantiation: "Instantiation") -> None:
+        self._instantiation = instantiation
+
+    def _paths(self) -> List[str]:
+        # pylint: disable=protected-access
+        prefix = self._instantiation._file_prefix
+        names = self._instantiation._file_names
+        if prefix is None:
+            return list(names)
+        return [prefix + name for name in names]
+
+    def _store(self, paths: List[str]) -> None:
+        # pylint: disable=protected-access
+        self._instantiation._file_prefix, self._instantiation._file_names = \
+            _split_common_prefix(paths)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index):
+        return self._paths()[index]
+
+    def __setitem__(self, index, value) -> None:
+        paths = self._paths()
+        paths[index] = value
+        self._store(paths)
+
+    def __delitem__(self, index) -> None:
+        paths = self._paths()
+        del paths[index]
+        self._store(paths)
+
+    def __len__(self) -> int:
+        # pylint: disable=protected-access
+        return len(self._instantiation._file_names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths())
+
+    def insert(self, index: int, value: str) -> None:
+        paths = self._paths()
+        paths.insert(index, value)
+        self._store(paths)
+
+    def append(self, value: str) -> None:
+        # pylint: disable=protected-access
+        instantiation = self._instantiation
+        prefix = instantiation._file_prefix
+        if prefix is None and instantiation._file_names:
+            instantiation._file_names.append(value)
+            return
+        if prefix is not None and isinstance(value, str) and \
+                value.startswith(prefix):
+            name = value[len(prefix):]
+            if os.sep not in name and \
+                    (not os.altsep or os.altsep not in name):
+                instantiation._file_names.append(name)
+                return
+        paths = self._paths()
+        paths.append(value)
+        self._store(paths)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (_FileList, list, tuple)):
+            return self._paths() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._paths())
+
+
+_MISSING = object()
+
+
+class MetadataView(Mapping[Metadata, MetadataTypes]):
+    """Read-only view of the metadata of a component and its parents.
+
+    Looking up a key checks the component_metadata of the component and
+    then of each of its parents, without copying any of them. Changes to
+    the component_metadata of any of them are seen right away.
+
+    .. versionadded:: 0.2.16
+    """
+
+    __slots__ = ("_component",)
+
+    def __init__(self, component: "AbsPackageComponent") -> None:
+        """Create a view of the metadata of a component.
+
+        Args:
+            component: Component to view the metadata of
+        """
+        self._component = component
+
+    def __getitem__(self, key: Metadata) -> MetadataTypes:
+        """Get the value set closest to the component."""
+        component: Optional[AbsPackageComponent] = self._component
+        while component is not None:
+            value = component.component_metadata.get(key, _MISSING)
+            if value is not _MISSING:
+                return typing.cast(MetadataTypes, value)
+            component = component.parent
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        """Get the value of a key, or default if it is not set."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        """Check if the component or any of its parents set the key."""
+        component: Optional[AbsPackageComponent] = self._component
+        while component is not None:
+            if key in component.component_metadata:
+                return True
+            component = component.parent
+        return False
+
+    def __iter__(self) -> Iterator[Metadata]:
+        """Iterate over the keys set as they are right now."""
+        return iter(self.snapshot())
+
+    def __len__(self) -> int:
+        """Count the keys set on the component and its parents."""
+        return len(self.snapshot())
+
+    def snapshot(self) -> Dict[Metadata, MetadataTypes]:
+        """Copy the metadata into a new dictionary."""
+        component = self._component
+        if component.parent is None:
+            return dict(component.component_metadata)
+        metadata = component.parent.metadata.snapshot()
+        metadata.update(component.component_metadata)
+        return metadata
+
+    def __repr__(self) -> str:
+        """Show the metadata as they are right now."""
+        return f"{self.__class__.__name__}({self.snapshot()!r})"
+
+
 class AbsPackageComponent(metaclass=abc.ABCMeta):
-    """Abstract base class for creating package components."""
+    """Abstract base class for creating package components.
+
+    .. versionchanged:: 0.2.16
+        Components use __slots__. Metadata is combined with the metadata of
+        the parents when it is requested, instead of copying the metadata
+        of the parent into every component when it is created.
+    """
+
+    __slots__ = ("parent", "_component_metadata", "_metadata_view")
 
     def __init__(self, parent: Optional['AbsPackageComponent'] = None) -> None:
         """AbsPackageComponent.
@@ -26,26 +239,71 @@ class AbsPackageComponent(metaclass=abc.ABCMeta):
             parent: The parent this package component belongs to
         """
         self.parent = parent
+        self._component_metadata = \
+            _ComponentMetadata(self, self.init_local_metadata())
+        self._metadata_view: Optional[MetadataView] = None
         if parent is not None:
             self.add_to_parent(child=self)
 
-        self.component_metadata: \
-            Dict[Metadata, MetadataTypes] = self.init_local_metadata()
+    @property
+    def component_metadata(self) -> Dict[Metadata, MetadataTypes]:
+        """Metadata set on the component itself, without its parents."""
+        return self._component_metadata
+
+    @component_metadata.setter
+    def component_metadata(
+            self,
+            value: Mapping[Metadata, MetadataTypes]
+    ) -> None:
+        self._component_metadata = _ComponentMetadata(self, value)
+        self._component_metadata.changed()
 
-        metadata = self._gen_combined_metadata()
+    def _child_changed(self, child: "AbsPackageComponent") -> None:
+        """Handle a child being added or its indexed metadata changing."""
 
-        self._metadata: ChainMap[Metadata, MetadataTypes] = metadata
+    def __setstate__(self, state) -> None:
+        """Restore the slots of a pickled component."""
+        dict_state, slot_state = \
+            state if isinstance(state, tuple) else (state, None)
+        for key, value in {**(dict_state or {}), **(slot_state or {})}.items():
+            object.__setattr__(self, key, value)
+        self._component_metadata = \
+            _ComponentMetadata(self, self._component_metadata)
 
     @property
-    def metadata(self) -> Dict[Metadata, MetadataTypes]:
-        """Metadata about the component."""
-        return dict(self._metadata)
+    def metadata(self) -> MetadataView:
+        """Metadata about the component, including that of its parents.
+
+        .. versionchanged:: 0.2.16
+            Returns a read-only view instead of a copy. The view is live:
+            it shows changes made afterwards to the component_metadata of
+            the component or of its parents, including parents changed
+            after the component was created, which the copy did not. Use
+            snapshot for a copy that can be changed and stays as it was.
+        """
+        view = self._metadata_view
+        if view is None:
+            view = self._metadata_view = MetadataView(self)
+        return view
+
+    def snapshot(self) -> Dict[Metadata, MetadataTypes]:
+        """Copy the metadata of the component, including that of its parents.
+
+        .. versionadded:: 0.2.16
+        """
+        return self.metadata.snapshot()
+
+    @property
+    def _metadata(self) -> ChainMap[Metadata, MetadataTypes]:
+        return self._gen_combined_metadata()
 
     def add_to_parent(self, child) -> None:
         """Add child to parent object."""
         if self.parent is None:
             raise AttributeError("Root objects do not have parents")
         self.parent.children.append(child)
+        # pylint: disable=protected-access
+        self.parent._child_changed(child)
 
     def __len__(self) -> int:
         """Get the number of children."""
@@ -61,21 +319,84 @@ class AbsPackageComponent(metaclass=abc.ABCMeta):
 
     def __str__(self) -> str:
         """Present the name and metadata of the given component."""
-        return f"{super().__str__()} {dict(self.metadata)}"
+        return f"{super().__str__()} {self.snapshot()}"
 
     @property
     @abc.abstractmethod
     def children(self) -> List["AbsPackageComponent"]:
         """Child components of the package."""
 
-    def _gen_combined_metadata(self) -> ChainMap[Metadata, MetadataTypes]:
-        if self.parent:
+    def extract_files(
+            self,
+            session: Optional[ZipSession] = None,
+            max_workers: Optional[int] = None
+    ) -> ExtractionReport:
+        """Extract every zipped file of the component ahead of time.
+
+        The files are extracted into the session, so get_files returns them
+        afterwards without extracting them again. Files that are not in a
+        zip file are left as they are.
+
+        Args:
+            session: Session to extract the files into. Defaults to the
+                session of the current ``with ZipSession()`` block.
+            max_workers: Number of threads extracting the files of each zip
+                file. If None or less than 2, the files are extracted on the
+                current thread.
+
+        Returns:
+            Paths to the extracted files and the throughput of the
+            extraction
+
+        Raises:
+            ValueError: if no session is given outside a
+                ``with ZipSession()`` block, since nothing would keep the
+                files
+
+        .. versionadded:: 0.2.16
 
-            return collections.ChainMap(
-                self.component_metadata,
-                self.parent.metadata
+        """
+        zip_session = session or current_session()
+        if zip_session is None:
+            raise ValueError(
+                "Files can only be extracted ahead of time into a ZipSession"
             )
-        return collections.ChainMap(self.component_metadata)
+        members_by_archive: Dict[str, List[str]] = {}
+        stack: List[AbsPackageComponent] = [self]
+        while stack:
+            component = stack.pop()
+            stack.extend(reversed(list(component.children)))
+            if not isinstance(component, Instantiation):
+                continue
+            # pylint: disable=protected-access
+            archive, members = component._locate_files()
+            if archive is not None:
+                members_by_archive.setdefault(archive, []).extend(members)
+
+        files: List[str] = []
+        bytes_extracted = 0
+        seconds = 0.0
+        for archive, members in members_by_archive.items():
+            try:
+                report = zip_session.extract_many(
+                    archive, members, max_workers=max_workers
+                )
+            except KeyError as error:
+                raise ZipFileException(
+                    error, zip_file=archive, problem_files=[error.args[0]]
+                ) from error
+            files += report.files
+            bytes_extracted += report.bytes_extracted
+            seconds += report.seconds
+        return ExtractionReport(files, bytes_extracted, seconds)
+
+    def _gen_combined_metadata(self) -> ChainMap[Metadata, MetadataTypes]:
+        maps = [self.component_metadata]
+        parent = self.parent
+        while parent is not None:
+            maps.append(parent.component_metadata)
+            parent = parent.parent
+        return collections.ChainMap(*maps)
 
     @staticmethod
     def init_local_metadata() -> dict:
@@ -83,9 +404,156 @@ class AbsPackageComponent(metaclass=abc.ABCMeta):
         return {}
 
 
+_INDEXED_KEYS = frozenset({Metadata.ID, Metadata.ITEM_NAME})
+
+
+class _ComponentMetadata(Dict[Metadata, MetadataTypes]):
+    """Metadata of a component that tells its parent when an ID changes.
+
+    Package and PackageObject index their children by ID and ITEM_NAME, so
+    those keys are reported to the parent of the component when they are
+    changed.
+    """
+
+    __slots__ = ("_component",)
+
+    def __init__(self,
+                 component: "AbsPackageComponent",
+                 values: Mapping[Metadata, MetadataTypes]) -> None:
+        super().__init__(values)
+        self._component = component
+
+    def changed(self) -> None:
+        """Tell the parent of the component that its metadata changed."""
+        component = getattr(self, "_component", None)
+        if component is not None and component.parent is not None:
+            # pylint: disable=protected-access
+            component.parent._child_changed(component)
+
+    def __setitem__(self, key: Metadata, value: MetadataTypes) -> None:
+        super().__setitem__(key, value)
+        if key in _INDEXED_KEYS:
+            self.changed()
+
+    def __delitem__(self, key: Metadata) -> None:
+        super().__delitem__(key)
+        if key in _INDEXED_KEYS:
+            self.changed()
+
+    def pop(self, key, *default):  # type: ignore[override]
+        value = super().pop(key, *default)
+        if key in _INDEXED_KEYS:
+            self.changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.changed()
+        return item
+
+    def setdefault(self, key, default=None):  # type: ignore[override]
+        value = super().setdefault(key, default)
+        if key in _INDEXED_KEYS:
+            self.changed()
+        return value
+
+    def update(self, *args, **kwargs) -> None:  # type: ignore[override]
+        super().update(*args, **kwargs)
+        self.changed()
+
+    def clear(self) -> None:
+        super().clear()
+        self.changed()
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class _ChildIndex:
+    """Lookup of the children of a component by a metadata value.
+
+    The index is kept current as children are added and as their metadata
+    changes, so a lookup, found or not, never goes through every child.
+    If the list of children was changed directly, such as a child being
+    removed, the index is built again on the next lookup.
+    """
+
+    __slots__ = ("key", "_index", "_values", "_count")
+
+    def __init__(self,
+                 key: Metadata,
+                 children: Iterable["AbsPackageComponent"]) -> None:
+        self.key = key
+        self._index: Dict[MetadataTypes, List[AbsPackageComponent]] = {}
+        self._values: Dict[int, MetadataTypes] = {}
+        self._count = 0
+        self._build(children)
+
+    def _build(self, children: Iterable["AbsPackageComponent"]) -> None:
+        self._index.clear()
+        self._values.clear()
+        self._count = 0
+        for child in children:
+            self.add(child)
+
+    def add(self, child: "AbsPackageComponent") -> None:
+        """Index a child added after the others."""
+        value = child.metadata.get(self.key)
+        self._index.setdefault(value, []).append(child)
+        self._values[id(child)] = value
+        self._count += 1
+
+    def update(self,
+               child: "AbsPackageComponent",
+               children: Sequence["AbsPackageComponent"]) -> None:
+        """Index a child again after its metadata changed."""
+        if id(child) not in self._values:
+            self.add(child)
+            return
+        old_value = self._values[id(child)]
+        value = child.metadata.get(self.key)
+        if value == old_value:
+            return
+        old_matches = self._index[old_value]
+        old_matches.remove(child)
+        if not old_matches:
+            del self._index[old_value]
+        self._values[id(child)] = value
+        matches = self._index.setdefault(value, [])
+        matches.append(child)
+        if len(matches) > 1:
+            # Keep the children with the same value in the order of the
+            # children, so the first one is found
+            positions = {id(child): index
+                         for index, child in enumerate(children)}
+            matches.sort(key=lambda match: positions[id(match)])
+
+    def __getstate__(self) -> Metadata:
+        # Children are indexed by their id(), which does not survive
+        # pickling, so the index is built again after it is unpickled.
+        return self.key
+
+    def __setstate__(self, state: Metadata) -> None:
+        self.key = state
+        self._index = {}
+        self._values = {}
+        self._count = -1
+
+    def find(self,
+             children: Sequence["AbsPackageComponent"],
+             value: MetadataTypes) -> Optional["AbsPackageComponent"]:
+        """Get the first of the children with the value, if any."""
+        if len(children) != self._count:
+            self._build(children)
+        matches = self._index.get(value)
+        return matches[0] if matches else None
+
+
 class Batch(AbsPackageComponent):
     """Batch."""
 
+    __slots__ = ("path", "packages")
+
     @property
     def children(self):
         """Get the packages that belong to the given batch."""
@@ -110,6 +578,8 @@ class Batch(AbsPackageComponent):
 class Package(AbsPackageComponent):
     """Package."""
 
+    __slots__ = ("path", "objects", "unidentified_objects", "_object_index")
+
     def __init__(
             self,
             path: Optional[str] = None,
@@ -125,6 +595,7 @@ class Package(AbsPackageComponent):
         self.path = path
         self.objects: List[PackageObject] = []
         self.unidentified_objects: List[Tuple[str, str]] = []
+        self._object_index: Optional[_ChildIndex] = None
 
     @property
     def children(self):
@@ -136,10 +607,38 @@ class Package(AbsPackageComponent):
         """Other items that are not children of the package."""
         return self.unidentified_objects
 
+    def find_object(self, object_id: str) -> Optional["PackageObject"]:
+        """Find the package object with the given id.
+
+        Objects are indexed by id, so finding one does not compare the id
+        of every object in the package.
+
+        .. versionadded:: 0.2.16
+
+        Args:
+            object_id: Value of the Metadata.ID of the object
+
+        Returns:
+            The first object with the id, or None if none is found.
+
+        """
+        if self._object_index is None:
+            self._object_index = _ChildIndex(Metadata.ID, self.objects)
+        return typing.cast(
+            Optional[PackageObject],
+            self._object_index.find(self.objects, object_id)
+        )
+
+    def _child_changed(self, child: AbsPackageComponent) -> None:
+        if self._object_index is not None:
+            self._object_index.update(child, self.objects)
+
 
 class PackageObject(AbsPackageComponent):
     """Package Object."""
 
+    __slots__ = ("package_files", "items", "_item_index")
+
     def __init__(self, parent: Optional[Package] = None) -> None:
         """PackageObject.
 
@@ -149,16 +648,45 @@ class PackageObject(AbsPackageComponent):
         super().__init__(parent)
         self.package_files: List[str] = []
         self.items: List[Item] = []
+        self._item_index: Optional[_ChildIndex] = None
 
     @property
     def children(self):
         """Objects's children."""
         return self.items
 
+    def find_item(self, item_name: str) -> Optional["Item"]:
+        """Find the item with the given name.
+
+        Items are indexed by name, so finding one does not compare the name
+        of every item in the object.
+
+        .. versionadded:: 0.2.16
+
+        Args:
+            item_name: Value of the Metadata.ITEM_NAME of the item
+
+        Returns:
+            The first item with the name, or None if none is found.
+
+        """
+        if self._item_index is None:
+            self._item_index = _ChildIndex(Metadata.ITEM_NAME, self.items)
+        return typing.cast(
+            Optional[Item],
+            self._item_index.find(self.items, item_name)
+        )
+
+    def _child_changed(self, child: AbsPackageComponent) -> None:
+        if self._item_index is not None:
+            self._item_index.update(child, self.items)
+
 
 class Item(AbsPackageComponent):
     """Collection item."""
 
+    __slots__ = ("instantiations",)
+
     def __init__(self, parent: Optional[PackageObject] = None) -> None:
         """Item.
 
@@ -175,7 +703,19 @@ class Item(AbsPackageComponent):
 
 
 class Instantiation(AbsPackageComponent):
-    """File Instantiation."""
+    """File Instantiation.
+
+    .. versionchanged:: 0.2.16
+        Files in the same directory are stored as a shared directory prefix
+        and their file names, and joined again when they are requested.
+    """
+
+    __slots__ = (
+        "category",
+        "_file_prefix",
+        "_file_names",
+        "_sidecar_files",
+    )
 
     def __init__(self,
                  category: InstantiationTypes = InstantiationTypes.GENERIC,
@@ -190,8 +730,29 @@ class Instantiation(AbsPackageComponent):
         self.category = category
         super().__init__(parent)
         self.component_metadata[Metadata.CATEGORY] = category
-        self._files: List[str] = files or []
-        self.sidecar_files: List[str] = []
+        self._file_prefix: Optional[str] = None
+        self._file_names: List[str] = []
+        self._files = files or []
+        self._sidecar_files: Optional[List[str]] = None
+
+    @property
+    def _files(self) -> typing.MutableSequence[str]:
+        return _FileList(self)
+
+    @_files.setter
+    def _files(self, value: Iterable[str]) -> None:
+        self._file_prefix, self._file_names = _split_common_prefix(value)
+
+    @property
+    def sidecar_files(self) -> List[str]:
+        """Files that accompany the files of the instantiation."""
+        if self._sidecar_files is None:
+            self._sidecar_files = []
+        return self._sidecar_files
+
+    @sidecar_files.setter
+    def sidecar_files(self, value: List[str]) -> None:
+        self._sidecar_files = value
 
     @property
     def files(self):
@@ -204,16 +765,146 @@ class Instantiation(AbsPackageComponent):
         warnings.warn("Use get_files instead", DeprecationWarning)
         return self._files
 
-    def get_files(self) -> typing.Iterable[str]:
+    def get_files(
+            self,
+            session: Optional[ZipSession] = None
+    ) -> typing.Iterable[str]:
         """Make the files contained available.
 
         If source is a zip file, files are extracted
 
+        Args:
+            session: Session used to open the zip file and to extract the
+                files into. Defaults to the session of the current
+                ``with ZipSession()`` block. The files stay available until
+                the session is cleaned up. Outside a session, they are
+                removed once the iteration is finished.
+
         Yields:
             File path to files located in instance
 
+        .. versionchanged:: 0.2.16
+            Added the session argument. Files extracted into a session are
+            no longer removed as soon as the iteration is finished.
+
+        """
+        archive, paths = self._locate_files()
+        if archive is None:
+            yield from paths
+            return
+
+        with _session_or_own(session) as zip_session:
+            for member in paths:
+                try:
+                    extracted = zip_session.extract(archive, member)
+                except KeyError as error:
+                    raise ZipFileException(
+                        error, zip_file=archive, problem_files=[member]
+                    ) from error
+                yield extracted
+
+    def list_file_names(self) -> List[str]:
+        """List the files contained without reading or extracting them.
+
+        The names are the same paths yielded by get_files for files that
+        are not in a zip file, and the names of the members for files in a
+        zip file. Useful when only the names or the extensions of the files
+        are needed.
+
+        Returns:
+            Path of each file, or its name inside the zip file
+
+        .. versionadded:: 0.2.16
+
+        """
+        return self._locate_files()[1]
+
+    def open_files(
+            self,
+            session: Optional[ZipSession] = None
+    ) -> Iterator[typing.BinaryIO]:
+        """Open the files contained for reading, without extracting them.
+
+        Files inside a zip file are read directly from it. Each file is
+        only opened when the next one is requested, and it is up to the
+        caller to close it.
+
+        Args:
+            session: Session used to open the zip file. Defaults to the
+                same session as get_files.
+
+        Yields:
+            Binary stream of each file
+
+        .. versionadded:: 0.2.16
+
+        """
+        for _, stream in self._open_streams(session):
+            yield stream
+
+    def iter_streams(
+            self,
+            session: Optional[ZipSession] = None
+    ) -> Iterator[Tuple[str, typing.BinaryIO]]:
+        """Iterate over the name and the content of each file contained.
+
+        Unlike open_files, each stream is closed once the next one is
+        requested or the iteration is finished.
+
+        Args:
+            session: Session used to open the zip file. Defaults to the
+                same session as get_files.
+
+        Yields:
+            Path of the file, or its name inside the zip file, and a
+            binary stream of it
+
+        .. versionadded:: 0.2.16
+
+        """
+        for name, stream in self._open_streams(session):
+            with stream:
+                yield name, stream
+
+    def _open_streams(
+            self,
+            session: Optional[ZipSession]
+    ) -> Iterator[Tuple[str, typing.BinaryIO]]:
+        archive, paths = self._locate_files()
+        if archive is None:
+            for path in paths:
+                yield path, open(path, "rb")
+            return
+
+        with _session_or_own(session) as zip_session:
+            for member in paths:
+                try:
+                    stream = zip_session.open(archive, member)
+                except KeyError as error:
+                    raise ZipFileException(
+                        error, zip_file=archive, problem_files=[member]
+                    ) from error
+                yield member, typing.cast(typing.BinaryIO, stream)
+
+    @property
+    def archive(self) -> Optional[str]:
+        """Path to the zip file that contains the files, if any.
+
+        .. versionadded:: 0.2.16
+        """
+        if self.parent is None:
+            return None
+        parent_path = self.parent.metadata.get(Metadata.PATH)
+        if parent_path is None or ".zip" not in str(parent_path):
+            return None
+        return str(parent_path)
+
+    def _locate_files(self) -> Tuple[Optional[str], List[str]]:
+        """Get the zip file containing the files and their paths in it.
+
+        If the files are not in a zip file, the zip file is None and the
+        paths are on the file system.
         """
-        temp_dir = TemporaryDirectory()
         if self.parent is None:
             raise ValueError(
                 "Unable to get files if instance is missing a parent"
@@ -229,27 +920,13 @@ class Instantiation(AbsPackageComponent):
             raise KeyError('Instance is missing path metadata')
         instance_path = typing.cast(str, instance_path)
 
-        for pkg_file in self._files:
-            if ".zip" in parent_path:
-                zip_file_name = parent_path
-                with ZipFile(zip_file_name) as zip_file:
-
-                    # On Windows ZipFile expects unix-style slashes
-                    file_to_extract = \
-                        os.path.join(instance_path,
-                                     pkg_file).replace("\\", "/")
-                    try:
-                        yield zip_file.extract(file_to_extract,
-                                               path=temp_dir.name)
-
-                    except KeyError as error:
-                        raise ZipFileException(
-                            error, zip_file=zip_file_name,
-                            problem_files=[file_to_extract]
-                        ) from error
-
-            else:
-                yield os.path.join(instance_path, pkg_file)
+        paths = [
+            os.path.join(instance_path, pkg_file) for pkg_file in self._files
+        ]
+        if ".zip" not in parent_path:
+            return None, paths
+        # On Windows ZipFile expects unix-style slashes
+        return parent_path, [path.replace("\\", "/") for path in paths]
 
     @property
     def children(self):
@@ -1,13 +1,15 @@
 """Collection builder."""
 # pylint: disable=unsubscriptable-object
 import abc
+import concurrent.futures
 import itertools
 import logging
 import os
 import re
 import warnings
 import zipfile
-from typing import Tuple, Optional, Iterator, Iterable, List
+from typing import Tuple, Optional, Iterator, Iterable, List, Dict, \
+    NamedTuple, Callable
 
 from uiucprescon.packager.common import Metadata, PackageTypes
 from uiucprescon.packager.common import InstantiationTypes
@@ -17,32 +19,69 @@ from .collection import \
     Package, \
     PackageObject, \
     AbsPackageComponent
+from .filesystem import \
+    AbsFileSystem, \
+    LocalFileSystem, \
+    read_archive_members
 
 
-def _build_ds_instance(item, name: str, path: str) -> None:
+class StemFiles(NamedTuple):
+    """Files in the same directory sharing the same file name stem.
+
+    .. versionadded:: 0.2.16
+    """
+
+    main_files: List[str]
+    sidecar_files: List[str]
+
+
+Scandir = Callable[[str], Iterable["os.DirEntry[str]"]]
+
+
+def _list_files_by_stem(
+        path: str,
+        scandir: Optional[Scandir] = None
+) -> Dict[str, List[str]]:
+    """Read a directory once and group the file paths in it by stem.
+
+    Every entry adds its stem, but only files are added to the paths.
+    """
+    scandir = scandir or os.scandir
+    stems: Dict[str, List[str]] = {}
+    for entry in scandir(path):
+        files = stems.setdefault(os.path.splitext(entry.name)[0], [])
+        if entry.is_file():
+            files.append(entry.path)
+    return stems
+
+
+def _build_ds_instance(item,
+                       name: str,
+                       path: str,
+                       files: Optional[List[str]] = None) -> None:
     warnings.warn("Use DSBuilder.build_instance instead",
                   PendingDeprecationWarning)
+    if files is None:
+        files = _list_files_by_stem(path).get(name, [])
 
-    new_instantiation = Instantiation(category=InstantiationTypes.ACCESS,
-                                      parent=item)
-
-    for file in filter(lambda i: i.is_file(), os.scandir(path)):
-        if os.path.splitext(os.path.basename(file))[0] == name:
-            new_instantiation.files.append(file.path)
+    Instantiation(category=InstantiationTypes.ACCESS,
+                  parent=item,
+                  files=list(files))
 
 
 def _build_ds_items(package, path: str) -> None:
     logger = logging.getLogger(__name__)
 
-    files = sorted(set(
-        map(lambda item: os.path.splitext(item)[0], os.listdir(path)))
-    )
+    stems = _list_files_by_stem(path)
 
-    for unique_item in files:
+    for unique_item in sorted(stems):
         logger.debug(unique_item)
         new_item = Item(parent=package)
         new_item.component_metadata[Metadata.ITEM_NAME] = unique_item
-        _build_ds_instance(new_item, name=unique_item, path=path)
+        _build_ds_instance(new_item,
+                           name=unique_item,
+                           path=path,
+                           files=stems[unique_item])
 
 
 def _build_ds_object(parent_batch, path: str) -> None:
@@ -78,23 +117,31 @@ def build_ds_batch(root: str):
     return new_batch
 
 
-def build_bb_instance(new_item, path: str, name: str) -> None:
+def build_bb_instance(new_item,
+                      path: str,
+                      name: str,
+                      files: Optional[List[str]] = None) -> None:
     """Build a brittle books instance.
 
     Args:
         new_item:
         path: Root path where the instance is located.
         name:
+        files: Paths of the files named name. If not provided, path is
+            scanned for them.
+
+    .. versionchanged:: 0.2.16
+        Added files parameter
 
     """
     warnings.warn("Use BrittleBooksBuilder.build_instance instead ",
                   PendingDeprecationWarning)
-    new_instantiation = Instantiation(category=InstantiationTypes.ACCESS,
-                                      parent=new_item)
+    if files is None:
+        files = _list_files_by_stem(path).get(name, [])
 
-    for file in filter(lambda i: i.is_file(), os.scandir(path)):
-        if os.path.splitext(os.path.basename(file))[0] == name:
-            new_instantiation.files.append(file.path)
+    Instantiation(category=InstantiationTypes.ACCESS,
+                  parent=new_item,
+                  files=list(files))
 
 
 def build_bb_package(new_package, path: str) -> None:
@@ -111,12 +158,15 @@ def build_bb_package(new_package, path: str) -> None:
     warnings.warn("Use BrittleBooksBuilder.build_package instead ",
                   PendingDeprecationWarning)
     logger = logging.getLogger(__name__)
-    files = set(map(lambda item: os.path.splitext(item)[0], os.listdir(path)))
-    for unique_item in sorted(files):
+    stems = _list_files_by_stem(path)
+    for unique_item in sorted(stems):
         logger.debug(unique_item)
         new_item = Item(parent=new_package)
         new_item.component_metadata[Metadata.ITEM_NAME] = unique_item
-        build_bb_instance(new_item, name=unique_item, path=path)
+        build_bb_instance(new_item,
+                          name=unique_item,
+                          path=path,
+                          files=stems[unique_item])
 
 
 def build_bb_batch(root: str) -> Package:
@@ -153,8 +203,54 @@ class AbsCollectionBuilder(metaclass=abc.ABCMeta):
     .. versionchanged :: 0.2.11
         Many of the abstract methods are no longer class methods.
 
+    .. versionchanged :: 0.2.16
+        Added max_workers for building packages on a thread pool.
+
+    .. versionchanged :: 0.2.16
+        Added filesystem. Directories are read with the scandir and exists
+        methods.
+
     """
 
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 filesystem: Optional[AbsFileSystem] = None) -> None:
+        """Create a new builder.
+
+        Args:
+            max_workers: Number of threads used by build_packages to build
+                package objects located in separate subdirectories. By
+                default, they are built one at a time.
+            filesystem: File system the packages are located on, such as a
+                ScanCache of the listings of directories that have not
+                changed since they were last read. Defaults to the local
+                file system.
+        """
+        self.max_workers = max_workers
+        self.filesystem: AbsFileSystem = \
+            LocalFileSystem() if filesystem is None else filesystem
+
+    def scandir(self, path: str) -> Iterable["os.DirEntry[str]"]:
+        """List the entries of a directory.
+
+        .. versionadded:: 0.2.16
+
+        Args:
+            path: Path of the directory
+
+        Returns:
+            Entries of the directory, from the file system.
+
+        """
+        return self.filesystem.scandir(path)
+
+    def exists(self, path: str) -> bool:
+        """Check if a file or directory exists on the file system.
+
+        .. versionadded:: 0.2.16
+        """
+        return self.filesystem.exists(path)
+
     @abc.abstractmethod
     def build_batch(self, root: str) -> AbsPackageComponent:
         """Build a new batch of a given packaging type.
@@ -199,6 +295,41 @@ class AbsCollectionBuilder(metaclass=abc.ABCMeta):
 
         """
 
+    def build_packages(
+            self,
+            packages: Iterable[Tuple[AbsPackageComponent, str]]
+    ) -> None:
+        """Build package objects with the files found at their paths.
+
+        The objects are expected to be already added to their parent, so the
+        order of the tree is the same no matter which one finishes first.
+        If max_workers is more than one, the paths are scanned concurrently
+        on a thread pool.
+
+        .. versionadded:: 0.2.16
+
+        Args:
+            packages: package objects paired with the path to build them from
+
+        """
+        packages = list(packages)
+        if self.max_workers is None or \
+                self.max_workers < 2 or \
+                len(packages) < 2:
+            for parent, path in packages:
+                self.build_package(parent, path=path)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers
+        ) as executor:
+            futures = [
+                executor.submit(self.build_package, parent, path=path)
+                for parent, path in packages
+            ]
+            for future in futures:
+                future.result()
+
     @staticmethod
     def filter_same_name_files(item: "os.DirEntry[str]",
                                filename: str) -> bool:
@@ -231,6 +362,41 @@ class AbsCollectionBuilder(metaclass=abc.ABCMeta):
             return False
         return item.name not in system_files
 
+    @staticmethod
+    def group_files_by_stem(
+            entries: Iterable["os.DirEntry[str]"],
+            main_file_extension: str
+    ) -> Dict[str, StemFiles]:
+        """Group the files of a directory listing by their file name stem.
+
+        .. versionadded:: 0.2.16
+
+        Args:
+            entries: DirEntry objects from a single directory scan
+            main_file_extension: extension, such as ".tif", used to identify
+                main files. Any other file is a sidecar. Not case sensitive.
+
+        Returns:
+            Mapping of stem to the main files and sidecar files with that
+            stem, in the order they were listed.
+
+        """
+        stems: Dict[str, StemFiles] = {}
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            stem, ext = os.path.splitext(entry.name)
+            stem_files = stems.get(stem)
+            if stem_files is None:
+                stem_files = StemFiles([], [])
+                stems[stem] = stem_files
+
+            if ext.lower() == main_file_extension:
+                stem_files.main_files.append(entry.path)
+            else:
+                stem_files.sidecar_files.append(entry.path)
+        return stems
+
 
 class DSBuilder(AbsCollectionBuilder):
     """DSBuilder."""
@@ -254,17 +420,24 @@ class DSBuilder(AbsCollectionBuilder):
             *args,
             **kwargs
     ) -> None:
-        """Build Instance."""
-        new_instantiation = Instantiation(category=InstantiationTypes.ACCESS,
-                                          parent=parent)
+        """Build Instance.
 
-        for file in filter(lambda i: i.is_file(), os.scandir(path)):
-            if os.path.splitext(os.path.basename(file))[0] == filename:
-                new_instantiation.files.append(file.path)
+        .. versionchanged:: 0.2.16
+            Added files keyword argument. If provided, the path is not
+                scanned again to locate files with the same name.
+        """
+        files = kwargs.get("files")
+        if files is None:
+            stems = _list_files_by_stem(path, scandir=self.scandir)
+            files = stems.get(filename, [])
+
+        Instantiation(category=InstantiationTypes.ACCESS,
+                      parent=parent,
+                      files=list(files))
 
     def build_package(self, parent, path: str, *args, **kwargs) -> None:
         """Build package."""
-        for folder in filter(lambda i: i.is_dir(), os.scandir(path)):
+        for folder in filter(lambda i: i.is_dir(), self.scandir(path)):
             new_package = PackageObject(parent=parent)
             new_package.component_metadata[Metadata.PATH] = folder.path
             new_package.component_metadata[Metadata.ID] = folder.name
@@ -274,15 +447,16 @@ class DSBuilder(AbsCollectionBuilder):
     def _build_ds_items(self, parent, path: str) -> None:
         logger = logging.getLogger(__name__)
 
-        files = sorted(set(
-            map(lambda item: os.path.splitext(item)[0], os.listdir(path)))
-        )
+        stems = _list_files_by_stem(path, scandir=self.scandir)
 
-        for unique_item in files:
+        for unique_item in sorted(stems):
             logger.debug(unique_item)
             new_item = Item(parent=parent)
             new_item.component_metadata[Metadata.ITEM_NAME] = unique_item
-            self.build_instance(new_item, filename=unique_item, path=path)
+            self.build_instance(new_item,
+                                filename=unique_item,
+                                path=path,
+                                files=stems[unique_item])
 
 
 class BrittleBooksBuilder(AbsCollectionBuilder):
@@ -296,33 +470,47 @@ class BrittleBooksBuilder(AbsCollectionBuilder):
             *args,
             **kwargs
     ) -> None:
-        """Build Instance."""
-        new_instantiation = Instantiation(
-            category=InstantiationTypes.ACCESS,
-            parent=parent)
+        """Build Instance.
+
+        .. versionchanged:: 0.2.16
+            Added files keyword argument. If provided, the path is not
+                scanned again to locate files with the same name.
+        """
+        files = kwargs.get("files")
+        if files is None:
+            stems = _list_files_by_stem(path, scandir=self.scandir)
+            files = stems.get(filename, [])
 
-        for file in filter(lambda i: i.is_file(), os.scandir(path)):
-            if os.path.splitext(os.path.basename(file))[0] == filename:
-                new_instantiation.files.append(file.path)
+        Instantiation(
+            category=InstantiationTypes.ACCESS,
+            parent=parent,
+            files=list(files))
 
     def build_package(self, parent, path: str, *args, **kwargs) -> None:
-        """Build package."""
+        """Build package.
+
+        .. versionchanged:: 0.2.16
+            The path is read only once.
+        """
         logger = logging.getLogger(__name__)
 
-        files = set(
-            map(lambda item: os.path.splitext(item)[0], os.listdir(path)))
+        stems = _list_files_by_stem(path, scandir=self.scandir)
 
-        for unique_item in sorted(files):
+        for unique_item in sorted(stems):
             logger.debug(unique_item)
             new_item = Item(parent=parent)
             new_item.component_metadata[Metadata.ITEM_NAME] = unique_item
-            self.build_instance(new_item, filename=unique_item, path=path)
+            self.build_instance(new_item,
+                                filename=unique_item,
+                                path=path,
+                                files=stems[unique_item])
 
     def build_batch(self, root: str) -> AbsPackageComponent:
         """Build batch."""
         logger = logging.getLogger(__name__)
         new_batch = Package(root)
-        for directory in filter(lambda i: i.is_dir(), os.scandir(root)):
+        packages = []
+        for directory in filter(lambda i: i.is_dir(), self.scandir(root)):
             logger.debug("scanning %s", directory.path)
             new_object = PackageObject(parent=new_batch)
             new_object.component_metadata[Metadata.PATH] = directory.path
@@ -331,7 +519,8 @@ class BrittleBooksBuilder(AbsCollectionBuilder):
             new_object.component_metadata[Metadata.PACKAGE_TYPE] = \
                 PackageTypes.BRITTLE_BOOKS_HATHI_TRUST_SUBMISSION
 
-            self.build_package(new_object, path=directory.path)
+            packages.append((new_object, directory.path))
+        self.build_packages(packages)
         return new_batch
 
 
@@ -343,14 +532,16 @@ class HathiTiffBuilder(AbsCollectionBuilder):
         new_batch = Package(root)
         new_batch.component_metadata[Metadata.PATH] = root
 
-        for dir_ in filter(lambda i: i.is_dir(), os.scandir(root)):
+        packages = []
+        for dir_ in filter(lambda i: i.is_dir(), self.scandir(root)):
             new_object = PackageObject(parent=new_batch)
             new_object.component_metadata[Metadata.ID] = dir_.name
             new_object.component_metadata[Metadata.PATH] = dir_.path
 
             new_object.component_metadata[Metadata.PACKAGE_TYPE] = \
                 PackageTypes.HATHI_TRUST_TIFF_SUBMISSION
-            self.build_package(new_object, path=dir_.path)
+            packages.append((new_object, dir_.path))
+        self.build_packages(packages)
 
         return new_batch
 
@@ -372,42 +563,47 @@ class HathiTiffBuilder(AbsCollectionBuilder):
         return ext.lower() == ".tif"
 
     def build_package(self, parent, path: str, *args, **kwargs) -> None:
-        """Build package."""
-        for file_ in filter(self.filter_tiff_files, os.scandir(path)):
+        """Build package.
+
+        .. versionchanged:: 0.2.16
+            The path is scanned once and the files are grouped by stem
+                before building the instances.
+        """
+        stems = self.group_files_by_stem(self.scandir(path), ".tif")
+        for item_part in sorted(stems):
+            stem_files = stems[item_part]
+            if not stem_files.main_files:
+                continue
             new_item = Item(parent=parent)
-            item_part, _ = os.path.splitext(file_.name)
             new_item.component_metadata[Metadata.ITEM_NAME] = item_part
-            self.build_instance(new_item, path=path, filename=item_part)
+            self.build_instance(new_item,
+                                path=path,
+                                filename=item_part,
+                                stem_files=stem_files)
 
     def build_instance(self, parent, path, filename, *args, **kwargs):
-        """Build Instance."""
-        def _organize_files(item: 'os.DirEntry[str]') -> str:
-            ext = os.path.splitext(item.name)[1]
-            if ext.lower() == ".tif":
-                return "main_files"
-            return "sidecar"
-
-        matching_files = \
-            filter(lambda x, file_name=filename:
-                   self.filter_same_name_files(x, file_name), os.scandir(path))
-
-        sidecar_files = []
-        main_files = []
-        for key, value in itertools.groupby(
-                matching_files, key=_organize_files
-        ):
-            if key == "sidecar":
-                for file_ in value:
-                    sidecar_files.append(file_)
-            elif key == "main_files":
-                for file_ in value:
-                    main_files.append(file_)
+        """Build Instance.
+
+        .. versionchanged:: 0.2.16
+            Added stem_files keyword argument. If provided, the path is not
+                scanned again to locate files with the same name.
+        """
+        stem_files: Optional[StemFiles] = kwargs.get("stem_files")
+        if stem_files is None:
+            stem_files = self.group_files_by_stem(
+                filter(
+                    lambda x, file_name=filename:
+                    self.filter_same_name_files(x, file_name),
+                    self.scandir(path)
+                ),
+                ".tif"
+            ).get(filename, StemFiles([], []))
+
         new_instantiation = Instantiation(category=InstantiationTypes.ACCESS,
                                           parent=parent,
-                                          files=main_files)
+                                          files=list(stem_files.main_files))
 
-        for file_ in sidecar_files:
-            new_instantiation.sidecar_files.append(file_.path)
+        new_instantiation.sidecar_files.extend(stem_files.sidecar_files)
 
 
 class DigitalLibraryCompoundBuilder(AbsCollectionBuilder):
@@ -418,16 +614,17 @@ class DigitalLibraryCompoundBuilder(AbsCollectionBuilder):
         new_batch = Package(root)
         new_batch.component_metadata[Metadata.PATH] = root
 
+        packages = []
         dir_: os.DirEntry[str]
-        for dir_ in filter(lambda i: i.is_dir(), os.scandir(root)):
+        for dir_ in filter(lambda i: i.is_dir(), self.scandir(root)):
             new_object = PackageObject(parent=new_batch)
             new_object.component_metadata[Metadata.ID] = dir_.name
-            new_object.metadata[Metadata.PATH] = dir_.path
 
             new_object.component_metadata[Metadata.PACKAGE_TYPE] = \
                 PackageTypes.DIGITAL_LIBRARY_COMPOUND
 
-            self.build_package(new_object, path=dir_.path)
+            packages.append((new_object, dir_.path))
+        self.build_packages(packages)
         return new_batch
 
     def build_instance(
@@ -446,10 +643,10 @@ class DigitalLibraryCompoundBuilder(AbsCollectionBuilder):
         preservation_file = os.path.join(preservation_path,
                                          filename + ".tif")
 
-        if not os.path.exists(access_file):
+        if not self.exists(access_file):
             raise FileNotFoundError(f"Access file {access_file} not found")
 
-        if not os.path.exists(preservation_file):
+        if not self.exists(preservation_file):
             raise FileNotFoundError(
                 f"Preservation file {preservation_file} not found")
 
@@ -486,21 +683,21 @@ class DigitalLibraryCompoundBuilder(AbsCollectionBuilder):
         access_path = os.path.join(path, "access")
         preservation_path = os.path.join(path, "preservation")
 
-        if not os.path.exists(access_path):
+        if not self.exists(access_path):
             raise FileNotFoundError(f"Access path {access_path} not found")
 
-        if not os.path.exists(preservation_path):
+        if not self.exists(preservation_path):
             raise FileNotFoundError(
                 f"Preservation path {preservation_path} not found")
 
         access_files = sorted(
             filter(lambda i: self.file_type_filter(i, ".jp2"),
-                   os.scandir(access_path)),
+                   self.scandir(access_path)),
             key=lambda f: f.name)
 
         preservation_files = sorted(
             filter(lambda i: self.file_type_filter(i, ".tif"),
-                   os.scandir(preservation_path)),
+                   self.scandir(preservation_path)),
             key=lambda f: f.name)
 
         if len(access_files) != len(preservation_files):
@@ -542,7 +739,7 @@ class HathiLimitedViewBuilder(AbsCollectionBuilder):
     def build_batch(self, root: str):
         """Build batch."""
         others = []
-        for item in os.scandir(root):
+        for item in self.scandir(root):
 
             if not item.is_dir() or not self.is_package_dir_name(item.name):
                 others.append((item.path, item.is_dir()))
@@ -607,7 +804,10 @@ class HathiLimitedViewBuilder(AbsCollectionBuilder):
 
     def build_package(self, parent, path: str, *args, **kwargs) -> None:
         """Build Package."""
-        package_builder = HathiLimitedViewPackageBuilder(path=path)
+        package_builder = HathiLimitedViewPackageBuilder(
+            path=path,
+            filesystem=self.filesystem
+        )
         zip_files, mets_files, invalid_files = package_builder.get_content()
 
         if len(zip_files) != 1:
@@ -629,15 +829,18 @@ class HathiLimitedViewBuilder(AbsCollectionBuilder):
 
     @classmethod
     def get_zip_content(cls, package_builder, zip_files):
-        """Access the content of the zip file."""
-        contents = {}
-
-        for i in itertools.groupby(sorted(
-                package_builder.iter_items_from_archive(zip_files[0]),
-                key=package_builder.get_item_type),
-                key=package_builder.get_item_type):
-            files = i[1]
-            contents[i[0]] = dict(files)
+        """Access the content of the zip file.
+
+        .. versionchanged:: 0.2.16
+            Items are grouped by type in a single pass over the index of
+            the zip file.
+        """
+        contents: Dict[str, Dict[str, List[str]]] = {}
+        for item_group in \
+                package_builder.get_archive_index(zip_files[0]).items():
+            item_type = package_builder.get_item_type(item_group)
+            item_key, files = item_group
+            contents.setdefault(item_type, {})[item_key] = files
         return contents
 
     # pylint: disable=unused-argument
@@ -711,13 +914,22 @@ class HathiLimitedViewPackageBuilder:
     zip_file_matcher = re.compile(f"^{BIB_ID_REGEX}({ZIP_FILE_REGEX})$")
     mets_file_matcher = re.compile(f"^{BIB_ID_REGEX}({METS_FILE_REGEX})$")
 
-    def __init__(self, path: str) -> None:
+    def __init__(self,
+                 path: str,
+                 filesystem: Optional[AbsFileSystem] = None) -> None:
         """HathiLimitedViewPackageBuilder.
 
         Args:
             path: Path that the package is located in
+            filesystem: File system the package is located on. Defaults to
+                the local file system.
+
+        .. versionchanged:: 0.2.16
+            Added filesystem parameter
         """
         self.path = path
+        self.filesystem: AbsFileSystem = \
+            LocalFileSystem() if filesystem is None else filesystem
 
     @classmethod
     def split_package_content(cls, item: "os.DirEntry[str]") -> \
@@ -777,21 +989,47 @@ class HathiLimitedViewPackageBuilder:
         ext = os.path.splitext(file_name)[1]
         return ext in valid_images_extension
 
+    @classmethod
+    def index_archive_members(
+            cls,
+            members: Iterable[str]
+    ) -> Dict[str, List[str]]:
+        """Group the files of a zip file by item key in a single pass.
+
+        Args:
+            members: Names of the files in the zip file
+
+        Returns:
+            Files of each item, sorted by item key. The files of an item
+            keep the order of the zip file.
+
+        .. versionadded:: 0.2.16
+        """
+        index: Dict[str, List[str]] = {}
+        for member in members:
+            index.setdefault(cls.get_item_key(member), []).append(member)
+        return {key: index[key] for key in sorted(index)}
+
     @classmethod
     def iter_items_from_archive(cls, zip_file: str) -> \
             Iterator[Tuple[str, Iterable[str]]]:
         """Iterate items from a zip archive."""
-        with zipfile.ZipFile(zip_file) as item_contents:
-            for file_group in itertools.groupby(
-                    sorted(
-                        filter(
-                            lambda x: cls.filter_files_only(item_contents, x),
-                            item_contents.namelist()
-                        ),
-                        key=cls.get_item_key),
-                    cls.get_item_key):
-                files = list(file_group[1])
-                yield file_group[0], list(files)
+        yield from cls.index_archive_members(
+            read_archive_members(zip_file)
+        ).items()
+
+    def get_archive_index(self, zip_file: str) -> Dict[str, List[str]]:
+        """Get the files of each item in a zip file, sorted by item key.
+
+        The names of the files are listed by the file system, so they are
+        read from the cache if the file system is a ScanCache and the zip
+        file has not changed since they were cached.
+
+        .. versionadded:: 0.2.16
+        """
+        return self.index_archive_members(
+            self.filesystem.list_archive(zip_file)
+        )
 
     def get_content(self) -> Tuple[
         List["os.DirEntry[str]"],
@@ -803,7 +1041,7 @@ class HathiLimitedViewPackageBuilder:
         mets_files = []
         unidentified_files = []
 
-        for item in os.scandir(self.path):
+        for item in self.filesystem.scandir(self.path):
             zip_file, mets_file, unidentified_file = \
                 self.split_package_content(item)
 
@@ -1,5 +1,6 @@
 """Compound objects for the Medusa Digital Library."""
 import abc
+import functools
 import logging
 import os
 
@@ -12,6 +13,9 @@ from uiucprescon.packager.common import Metadata, InstantiationTypes
 from uiucprescon.packager import transformations
 from . import collection_builder
 from .abs_package_builder import AbsPackageBuilder
+from .item_task import ItemTask
+from .transform_engine import StageGraph
+from .zip_session import ZipSession
 
 __all__ = [
     'DigitalLibraryCompound'
@@ -58,6 +62,21 @@ class AbsItemTransformStrategy(abc.ABC):
         if supplementary is None:
             return
 
+        if supplementary.archive is not None:
+            # Copy straight out of the zip file instead of extracting first
+            for name, stream in supplementary.iter_streams():
+                self.process_stream(
+                    source=stream,
+                    dest=os.path.join(
+                        dest,
+                        typing.cast(str, item.metadata[Metadata.ID]),
+                        "supplementary",
+                        name.split("/")[-1]
+                    ),
+                    logger=logger
+                )
+            return
+
         files: typing.Iterable[str] = supplementary.get_files()
 
         for file in files:
@@ -91,10 +110,29 @@ class AbsItemTransformStrategy(abc.ABC):
         """
         transformer = strategy()
         output_path = os.path.split(dest)[0]
-        if not os.path.exists(output_path):
-            os.makedirs(output_path)
+        os.makedirs(output_path, exist_ok=True)
         transformer.transform(source, dest, logger)
 
+    @staticmethod
+    def process_stream(
+            source: typing.BinaryIO,
+            dest: str,
+            logger: logging.Logger
+    ) -> None:
+        """Copy the content of a stream to a destination.
+
+        Args:
+            source: binary stream of the source file
+            dest: path and file name to generate
+            logger:
+
+        .. versionadded:: 0.2.16
+        """
+        output_path = os.path.split(dest)[0]
+        os.makedirs(output_path, exist_ok=True)
+        logger.debug("Copying stream to %s", dest)
+        transformations.CopyFile.copy_stream(source, dest)
+
 
 class DigitalLibraryTransformItem:
     """Transform items for the digital library."""
@@ -400,7 +438,10 @@ class DigitalLibraryCompound(AbsPackageBuilder):
             Digital Library packages
 
         """
-        builder = collection_builder.DigitalLibraryCompoundBuilder()
+        builder = collection_builder.DigitalLibraryCompoundBuilder(
+            max_workers=self.max_workers,
+            filesystem=self.filesystem
+        )
 
         yield from builder.build_batch(path)
 
@@ -416,26 +457,70 @@ class DigitalLibraryCompound(AbsPackageBuilder):
     def transform(self, package: Package, dest: str) -> None:
         """Transform package into a Digital library package.
 
+        Files extracted from a zipped source package are removed once the
+        package has been transformed.
+
         Args:
             package: Source package to transform
             dest: File path to save the transformed package
 
+        .. versionchanged:: 0.2.16
+            Supports transform_workers and transform_executor
+
         """
         logger: logging.Logger = logging.getLogger(__name__)
         logger.setLevel(AbsPackageBuilder.log_level)
 
-        item: Item
-        for item in package:
-            self.transform_one_item(item, dest, logger=logger)
+        with ZipSession():
+            self.transform_items(
+                package,
+                functools.partial(
+                    self.transform_one_item, dest=dest, logger=logger
+                ),
+                transform_task=functools.partial(
+                    self.transform_task, dest=dest
+                )
+            )
+
+    def create_task(self, item: Item) -> ItemTask:
+        """Describe an item with the name of the strategy chosen for it.
+
+        .. versionadded:: 0.2.16
+        """
+        return ItemTask.from_item(
+            item, strategy=self._get_item_strategy_name(item)
+        )
+
+    def transform_task(self, task: ItemTask, dest: str) -> None:
+        """Transform a single item from its task.
+
+        .. versionadded:: 0.2.16
+        """
+        self.transform_one_item(
+            task.to_item(), dest, self._create_strategy(task.strategy)
+        )
 
     def transform_one_item(
             self,
             item: Item,
             dest: str,
-            transformation_strategy: AbsItemTransformStrategy = None,
+            transformation_strategy: typing.Optional[
+                AbsItemTransformStrategy
+            ] = None,
             logger: typing.Optional[logging.Logger] = None
     ) -> None:
-        """Transform a single item."""
+        """Transform a single item.
+
+        The supplementary, preservation and access stages run in that order,
+        unless the package is transformed with a thread pool. Then the
+        stages run at the same time, such as copying the preservation file
+        while encoding the access file. Every strategy creates the files of
+        a stage from the source files of the item only, never from the
+        output of another stage, so the stages do not depend on each other.
+
+        .. versionchanged:: 0.2.16
+            The stages run concurrently when transformed on a thread pool
+        """
         strategy = \
             transformation_strategy or \
             self._get_item_transformer_strategy(item)
@@ -443,9 +528,14 @@ class DigitalLibraryCompound(AbsPackageBuilder):
         transformer = \
             DigitalLibraryTransformItem(strategy)
 
-        transformer.transform_supplementary_data(item, dest, logger)
-        transformer.transform_preservation_file(item, dest, logger)
-        transformer.transform_access_file(item, dest, logger)
+        stages = StageGraph()
+        for name, stage in [
+            ("supplementary", transformer.transform_supplementary_data),
+            ("preservation", transformer.transform_preservation_file),
+            ("access", transformer.transform_access_file),
+        ]:
+            stages.add(name, functools.partial(stage, item, dest, logger))
+        stages.run()
 
     @staticmethod
     def get_file_base_name(item_name: str) -> str:
@@ -456,21 +546,32 @@ class DigitalLibraryCompound(AbsPackageBuilder):
             self,
             item: Item
     ) -> AbsItemTransformStrategy:
+        return self._create_strategy(self._get_item_strategy_name(item))
 
+    @staticmethod
+    def _get_item_strategy_name(item: Item) -> str:
         access = item.instantiations.get(InstantiationTypes.ACCESS)
         if access is None:
-            return UsePreservationForAll(
-                package_builder=self,
-            )
-        if any(file.lower().endswith(".jp2") for file in access.get_files()):
-            return UsePreservationForAll(
-                package_builder=self,
-            )
+            return UsePreservationForAll.__name__
+        if any(file.lower().endswith(".jp2")
+               for file in access.list_file_names()):
+            return UsePreservationForAll.__name__
         # If no preservation files, generate them with the access files
         preservation = item.instantiations.get(InstantiationTypes.PRESERVATION)
         if preservation is None:
+            return UseAccessJp2ForAll.__name__
+        return UseAccessTiffs.__name__
+
+    def _create_strategy(self, name: str) -> AbsItemTransformStrategy:
+        if name == UsePreservationForAll.__name__:
+            return UsePreservationForAll(
+                package_builder=self,
+            )
+        if name == UseAccessJp2ForAll.__name__:
             return UseAccessJp2ForAll()
-        return UseAccessTiffs()
+        if name == UseAccessTiffs.__name__:
+            return UseAccessTiffs()
+        raise ValueError(f"Unknown item transform strategy {name}")
 
 
 class Transform:
@@ -519,8 +620,7 @@ class Transform:
             InstantiationTypes.SUPPLEMENTARY.value  # pylint: disable=no-member
         )
 
-        if not os.path.exists(supplementary_dir):
-            os.makedirs(supplementary_dir)
+        os.makedirs(supplementary_dir, exist_ok=True)
 
         base_name = self._package_builder.get_file_base_name(item_name)
         ext = os.path.splitext(src)[1]
@@ -554,8 +654,7 @@ class Transform:
             object_name,
             InstantiationTypes.ACCESS.value  # pylint: disable=no-member
         )
-        if not os.path.exists(access_path):
-            os.makedirs(access_path)
+        os.makedirs(access_path, exist_ok=True)
         item_name_part = self._package_builder.get_file_base_name(item_name)
         access_file = f"{object_name}-{item_name_part}.jp2"
 
@@ -588,8 +687,7 @@ class Transform:
             InstantiationTypes.PRESERVATION.value  # pylint: disable=no-member
         )
 
-        if not os.path.exists(preservation_path):
-            os.makedirs(preservation_path)
+        os.makedirs(preservation_path, exist_ok=True)
 
         new_base_name = self._package_builder.get_file_base_name(item_name)
 
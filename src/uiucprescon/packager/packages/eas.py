@@ -6,14 +6,15 @@ import os
 import pathlib
 import re
 import typing
-from typing import Iterable, Iterator
+from typing import Iterable, Iterator, Optional, List, Tuple, Dict
 from collections import defaultdict
 
 from uiucprescon.packager.common import Metadata
 from uiucprescon.packager.packages.abs_package_builder import AbsPackageBuilder
 from uiucprescon.packager.packages import collection
 from uiucprescon.packager.packages.collection_builder import \
-    AbsCollectionBuilder
+    AbsCollectionBuilder, \
+    Scandir
 
 __all__ = ['Eas']
 
@@ -21,7 +22,10 @@ __all__ = ['Eas']
 class Eas(AbsPackageBuilder):
     """EAS package."""
 
-    def locate_packages(self, path: str) -> Iterator[collection.Package]:
+    def locate_packages(
+            self,
+            path: str
+    ) -> Iterator[collection.AbsPackageComponent]:
         """Locate EAS packages on a given file path.
 
         Args:
@@ -30,8 +34,16 @@ class Eas(AbsPackageBuilder):
         Yields:
             EAS package
 
+        .. versionchanged:: 0.2.16
+            If streaming is set, each package is yielded as soon as it is
+                located.
+
         """
-        yield from EASBuilder().build_batch(path)
+        builder = EASBuilder(filesystem=self.filesystem)
+        if self.streaming:
+            yield from builder.iter_objects(path)
+            return
+        yield from builder.build_batch(path)
 
     def transform(self, package: collection.Package, dest: str) -> None:
         """Not Implemented."""
@@ -91,9 +103,67 @@ class EASBuilder(AbsCollectionBuilder):
                       *args: None,
                       **kwargs: None) -> None:
 
-        groups = defaultdict(list)
+        groups = self.group_package_files(path)
+        new_package = collection.Package(path, parent=parent)
+        for group_name, files in groups.items():
+            self.build_object(
+                parent=new_package,
+                group_id=group_name,
+                path=path,
+                files=files
+            )
+
+    def iter_objects(self, root: str) -> Iterator[collection.PackageObject]:
+        """Build the objects of a package one at a time.
+
+        Each object is yielded as soon as it is built. The package does not
+        keep the objects as children, so they can be released by the caller
+        once they are no longer needed.
+
+        .. versionadded:: 0.2.16
+
+        Args:
+            root: path to the package
+
+        Yields:
+            EAS package objects
+
+        """
+        groups = self.group_package_files(root)
+        new_package = collection.Package(
+            root,
+            parent=collection.Batch(root)
+        )
+        while groups:
+            group_name = next(iter(groups))
+            files = groups.pop(group_name)
+            new_object = self.build_object(
+                parent=new_package,
+                group_id=group_name,
+                path=root,
+                files=files
+            )
+            new_package.objects.remove(new_object)
+            yield new_object
+
+    def group_package_files(
+            self,
+            path: str
+    ) -> Dict[str, List[Tuple[str, pathlib.Path]]]:
+        """Scan the access directory once and group the files found.
+
+        .. versionadded:: 0.2.16
+
+        Args:
+            path: path to the package containing an access directory
+
+        Returns:
+            Mapping of group to the part and path of each file in the group
+
+        """
+        groups: Dict[str, List[Tuple[str, pathlib.Path]]] = defaultdict(list)
         access_path = os.path.join(path, "access")
-        if not os.path.exists(access_path):
+        if not self.exists(access_path):
             raise FileNotFoundError(f"No access directory located in {path}")
 
         for file in self.locate_package_files(access_path):
@@ -104,15 +174,8 @@ class EASBuilder(AbsCollectionBuilder):
                 )
 
             group = match_result.groupdict()
-            groups[group['group']].append(file)
-
-        new_package = collection.Package(path, parent=parent)
-        for group_name, _ in groups.items():
-            self.build_object(
-                parent=new_package,
-                group_id=group_name,
-                path=path
-            )
+            groups[group['group']].append((group['part'], file))
+        return groups
 
     @staticmethod
     def is_eas_file(path: 'os.PathLike[str]') -> bool:
@@ -130,51 +193,121 @@ class EASBuilder(AbsCollectionBuilder):
             return False
         return EASBuilder.grouper_regex.match(path.name) is not None
 
+    @staticmethod
+    def is_eas_entry(entry: 'os.DirEntry[str]') -> bool:
+        """Check if a directory entry belongs in an EAS package.
+
+        Unlike is_eas_file, this uses the file type information cached by
+        the directory scan instead of making another stat call.
+
+        .. versionadded:: 0.2.16
+
+        Args:
+            entry: DirEntry from scandir
+
+        Returns:
+            Returns True if file matches expected, else returns False
+
+        """
+        if not entry.is_file():
+            return False
+        return EASBuilder.grouper_regex.match(
+            os.path.basename(entry.path)
+        ) is not None
+
     def locate_package_files(
             self,
-            path: str, search_strategy=os.scandir
+            path: str,
+            search_strategy: Optional[
+                typing.Callable[[str], Iterable['os.DirEntry[str]']]
+            ] = None
     ) -> Iterable[pathlib.Path]:
         """Locate any EAS files at the given path.
 
         Args:
             path:
-            search_strategy:
+            search_strategy: function to list the directory. Defaults to
+                the scandir method
 
         Yields:
             Any valid files at the path
 
+        .. versionchanged:: 0.2.16
+            Files are identified with is_eas_entry.
+
         """
+        search_strategy = search_strategy or self.scandir
         for item in typing.cast(
                 Iterable['os.DirEntry[str]'],
-                filter(lambda p: self.is_eas_file(pathlib.Path(p.path)),
-                       search_strategy(path))
+                filter(self.is_eas_entry, search_strategy(path))
         ):
             yield pathlib.Path(item.path)
 
     @staticmethod
-    def locate_files_access(path: str) -> 'Iterable[os.DirEntry[str]]':
-        """Locate access files."""
-        return os.scandir(path)
+    def locate_files_access(
+            path: str,
+            scandir: Optional[Scandir] = None
+    ) -> 'Iterable[os.DirEntry[str]]':
+        """Locate access files.
+
+        .. versionchanged:: 0.2.16
+            Added scandir argument, used to list the path. Defaults to
+            os.scandir.
+        """
+        return (scandir or os.scandir)(path)
 
     def build_object(self,
                      parent: collection.Package,
                      group_id: str,
-                     path: str) -> None:
+                     path: str,
+                     files: Optional[List[Tuple[str, pathlib.Path]]] = None
+                     ) -> collection.PackageObject:
         """Build a new object.
 
         Args:
             parent:
             group_id:
             path:
+            files: part and file path of every file in the group. If not
+                provided, the access directory is scanned for them.
+
+        Returns:
+            The new object
+
+        .. versionchanged:: 0.2.16
+            Added files parameter so that the files found by build_package
+                don't need to be located again.
 
         """
         new_object = collection.PackageObject(parent=parent)
         new_object.component_metadata[Metadata.ID] = group_id
         new_object.component_metadata[Metadata.PATH] = path
-        access_path = os.path.join(path, "access")
+        if files is None:
+            files = self._locate_group_files(
+                os.path.join(path, "access"),
+                group_id
+            )
+
+        for part, file in files:
+            new_item = collection.Item(parent=new_object)
+            new_item.component_metadata[Metadata.ITEM_NAME] = part
+
+            self.build_instance(
+                new_item,
+                path=str(file.parent),
+                filename=file.name
+            )
+        return new_object
+
+    def _locate_group_files(
+            self,
+            access_path: str,
+            group_id: str
+    ) -> List[Tuple[str, pathlib.Path]]:
+        files = []
         for directory_item in filter(
-                lambda item: self.is_eas_file(pathlib.Path(item.path)),
-                self.locate_files_access(access_path)
+                self.is_eas_entry,
+                self.locate_files_access(access_path, scandir=self.scandir)
         ):
             regex_result = EASBuilder.grouper_regex.match(directory_item.name)
             if regex_result is None:
@@ -183,13 +316,7 @@ class EASBuilder(AbsCollectionBuilder):
             groups = regex_result.groupdict()
             if groups['group'] != group_id:
                 continue
-
-            new_item = collection.Item(parent=new_object)
-            new_item.component_metadata[Metadata.ITEM_NAME] = \
-                regex_result['part']
-
-            self.build_instance(
-                new_item,
-                path=os.path.dirname(directory_item.path),
-                filename=directory_item.name
+            files.append(
+                (regex_result['part'], pathlib.Path(directory_item.path))
             )
+        return files
@@ -0,0 +1,433 @@
+"""Flat table of the files in located packages.
+
+Questions such as how many pages or how many bytes each object has can be
+answered from a :py:class:`FileTable` without walking the package tree
+again. The table has one row for each file of each instantiation, stored
+column by column:
+
+* ``object_id``, ``item_name``, ``category`` and ``extension`` are stored as
+  an array of codes into the list of their distinct values.
+* ``path`` is stored as a single UTF-8 buffer and an array of offsets.
+* ``size`` is stored as an array of integers, -1 if unknown.
+
+Examples:
+    >>> table = FileTable()
+    >>> table.append(
+    ...     FileRecord("000001", "00000001", "access",
+    ...                "000001/00000001.jp2", 120, ".jp2")
+    ... )
+    >>> table.append(
+    ...     FileRecord("000001", "00000002", "access",
+    ...                "000001/00000002.jp2", 80, ".jp2")
+    ... )
+    >>> len(table)
+    2
+    >>> table.count_by("object_id")
+    {'000001': 2}
+    >>> table.sum_by("object_id")
+    {'000001': 200}
+
+.. versionadded:: 0.2.16
+
+"""
+import array
+import io
+import os
+import struct
+import sys
+from typing import \
+    BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, \
+    Optional, Sequence, Union
+
+from uiucprescon.packager.common import Metadata
+from .collection import AbsPackageComponent, Instantiation
+
+__all__ = ["FileTable", "FileRecord"]
+
+MAGIC = b"PKGFTBL1"
+
+CATEGORICAL_COLUMNS = ("object_id", "item_name", "category", "extension")
+COLUMNS = ("object_id", "item_name", "category", "path", "size", "extension")
+
+
+class FileRecord(NamedTuple):
+    """A single row of a :py:class:`FileTable`."""
+
+    object_id: str
+    item_name: str
+    category: str
+    path: str
+    size: int
+    extension: str
+
+
+def _to_little_endian(values: array.array) -> bytes:
+    if sys.byteorder == "big":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array.array:
+    values = array.array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class _CategoricalColumn:
+    """Column of strings stored as codes into the list of distinct values."""
+
+    __slots__ = ("values", "codes", "_lookup")
+
+    def __init__(self,
+                 values: Optional[List[str]] = None,
+                 codes: Optional[array.array] = None) -> None:
+        self.values: List[str] = values if values is not None else []
+        self.codes = codes if codes is not None else array.array("L")
+        self._lookup = {value: code for code, value in enumerate(self.values)}
+
+    def append(self, value: str) -> None:
+        """Add a value to the end of the column."""
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def code_of(self, value: str) -> Optional[int]:
+        """Get the code of a value, or None if no row has that value."""
+        return self._lookup.get(value)
+
+    def __getitem__(self, row: int) -> str:
+        """Get the value of a row."""
+        return self.values[self.codes[row]]
+
+    def take(self, rows: Sequence[int]) -> "_CategoricalColumn":
+        """Make a new column with the given rows only."""
+        codes = self.codes
+        return _CategoricalColumn(
+            list(self.values),
+            array.array("L", [codes[row] for row in rows])
+        )
+
+
+class _StringColumn:
+    """Column of strings stored as one UTF-8 buffer and their offsets."""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self,
+                 data: Optional[bytearray] = None,
+                 offsets: Optional[array.array] = None) -> None:
+        self.data = data if data is not None else bytearray()
+        self.offsets = offsets if offsets is not None \
+            else array.array("Q", [0])
+
+    def append(self, value: str) -> None:
+        """Add a value to the end of the column."""
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, row: int) -> str:
+        """Get the value of a row."""
+        return self.data[self.offsets[row]:self.offsets[row + 1]].decode(
+            "utf-8"
+        )
+
+    def take(self, rows: Sequence[int]) -> "_StringColumn":
+        """Make a new column with the given rows only."""
+        column = _StringColumn()
+        data, offsets = self.data, self.offsets
+        for row in rows:
+            column.data += data[offsets[row]:offsets[row + 1]]
+            column.offsets.append(len(column.data))
+        return column
+
+
+def _instantiation_paths(instantiation: Instantiation) -> Iterator[str]:
+    # Same as the paths given by get_files for files that are not in a
+    # zip file, but without extracting anything.
+    instance_path = instantiation.metadata.get(Metadata.PATH)
+    # pylint: disable=protected-access
+    for file_name in instantiation._files:
+        if instance_path is None:
+            yield file_name
+        else:
+            yield os.path.join(str(instance_path), file_name)
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return -1
+
+
+class FileTable:
+    """Columnar table with a row for each file of located packages.
+
+    .. versionadded:: 0.2.16
+    """
+
+    def __init__(self) -> None:
+        """Create an empty table."""
+        self._categorical: Dict[str, _CategoricalColumn] = {
+            name: _CategoricalColumn() for name in CATEGORICAL_COLUMNS
+        }
+        self._paths = _StringColumn()
+        self._sizes = array.array("q")
+
+    def append(self, record: FileRecord) -> None:
+        """Add a row to the table."""
+        for name in CATEGORICAL_COLUMNS:
+            self._categorical[name].append(getattr(record, name))
+        self._paths.append(record.path)
+        self._sizes.append(record.size)
+
+    @classmethod
+    def from_component(cls,
+                       components: Union[Iterable[AbsPackageComponent],
+                                         AbsPackageComponent],
+                       include_sizes: bool = False) -> "FileTable":
+        """Build a table of every file in the components given.
+
+        Args:
+            components: A located batch, or the packages yielded by
+                locate_packages
+            include_sizes: Read the size of every file from the file
+                system. Otherwise, sizes are -1.
+
+        Returns:
+            Table with a row for each file of each instantiation
+
+        """
+        if isinstance(components, AbsPackageComponent):
+            components = [components]
+        table = cls()
+        for component in components:
+            for instantiation in _iter_instantiations(component):
+                metadata = instantiation.metadata
+                object_id = metadata.get(Metadata.ID)
+                item_name = metadata.get(Metadata.ITEM_NAME)
+                category = instantiation.category.value
+                for path in _instantiation_paths(instantiation):
+                    table.append(FileRecord(
+                        object_id="" if object_id is None else str(object_id),
+                        item_name="" if item_name is None
+                        else str(item_name),
+                        category=category,
+                        path=path,
+                        size=_file_size(path) if include_sizes else -1,
+                        extension=os.path.splitext(path)[1].lower()
+                    ))
+        return table
+
+    def __len__(self) -> int:
+        """Count the rows of the table."""
+        return len(self._sizes)
+
+    def __getitem__(self, row: int) -> FileRecord:
+        """Get a row of the table. Negative rows count from the end."""
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return FileRecord(
+            object_id=self._categorical["object_id"][row],
+            item_name=self._categorical["item_name"][row],
+            category=self._categorical["category"][row],
+            path=self._paths[row],
+            size=self._sizes[row],
+            extension=self._categorical["extension"][row],
+        )
+
+    def __iter__(self) -> Iterator[FileRecord]:
+        """Iterate over the rows of the table."""
+        for row in range(len(self)):
+            yield self[row]
+
+    def column(self, name: str) -> List:
+        """Get every value of a column."""
+        if name in self._categorical:
+            column = self._categorical[name]
+            values = column.values
+            return [values[code] for code in column.codes]
+        if name == "path":
+            return [self._paths[row] for row in range(len(self))]
+        if name == "size":
+            return self._sizes.tolist()
+        raise KeyError(f"No column named {name}. Expected one of {COLUMNS}")
+
+    def _matching_rows(self, name: str, value) -> List[int]:
+        if name in self._categorical:
+            column = self._categorical[name]
+            code = column.code_of(value)
+            if code is None:
+                return []
+            return [row for row, row_code in enumerate(column.codes)
+                    if row_code == code]
+        if name == "size":
+            return [row for row, size in enumerate(self._sizes)
+                    if size == value]
+        if name == "path":
+            return [row for row in range(len(self))
+                    if self._paths[row] == value]
+        raise KeyError(f"No column named {name}. Expected one of {COLUMNS}")
+
+    def _row_matcher(self, name: str, value) -> Callable[[int], bool]:
+        if name in self._categorical:
+            codes = self._categorical[name].codes
+            code = self._categorical[name].code_of(value)
+            return lambda row: codes[row] == code
+        if name == "size":
+            sizes = self._sizes
+            return lambda row: sizes[row] == value
+        if name == "path":
+            paths = self._paths
+            return lambda row: paths[row] == value
+        raise KeyError(f"No column named {name}. Expected one of {COLUMNS}")
+
+    def take(self, rows: Sequence[int]) -> "FileTable":
+        """Make a new table with the given rows only."""
+        table = FileTable()
+        table._categorical = {
+            name: column.take(rows)
+            for name, column in self._categorical.items()
+        }
+        table._paths = self._paths.take(rows)
+        sizes = self._sizes
+        table._sizes = array.array("q", [sizes[row] for row in rows])
+        return table
+
+    def select(self, **conditions) -> "FileTable":
+        """Make a new table with the rows where every column matches.
+
+        Examples:
+            >>> table = FileTable()
+            >>> table.append(FileRecord("1", "01", "access", "a.jp2", 10,
+            ...                         ".jp2"))
+            >>> table.append(FileRecord("1", "01", "preservation", "a.tif",
+            ...                         20, ".tif"))
+            >>> len(table.select(object_id="1", category="access"))
+            1
+
+        """
+        if not conditions:
+            return self.take(range(len(self)))
+        # Only the rows matching the first condition are checked against
+        # the others.
+        (name, value), *others = conditions.items()
+        rows = self._matching_rows(name, value)
+        for name, value in others:
+            matches = self._row_matcher(name, value)
+            rows = [row for row in rows if matches(row)]
+        return self.take(rows)
+
+    def count_by(self, name: str) -> Dict[str, int]:
+        """Count the rows with each value of a categorical column."""
+        column = self._categorical[name]
+        counts = [0] * len(column.values)
+        for code in column.codes:
+            counts[code] += 1
+        return {
+            value: count
+            for value, count in zip(column.values, counts) if count
+        }
+
+    def sum_by(self, name: str) -> Dict[str, int]:
+        """Sum the known sizes of the rows with each value of a column."""
+        column = self._categorical[name]
+        totals = [0] * len(column.values)
+        seen = [False] * len(column.values)
+        for code, size in zip(column.codes, self._sizes):
+            seen[code] = True
+            if size > 0:
+                totals[code] += size
+        return {
+            value: total
+            for value, total, was_seen in zip(column.values, totals, seen)
+            if was_seen
+        }
+
+    def dump(self, stream: BinaryIO) -> None:
+        """Write the table to a binary stream.
+
+        The stream starts with a magic number and the number of rows,
+        followed by each column. Arrays are written as little-endian, and
+        the distinct values of a column each with their length, so they can
+        contain any character.
+        """
+        stream.write(MAGIC)
+        stream.write(struct.pack("<Q", len(self)))
+        for name in CATEGORICAL_COLUMNS:
+            column = self._categorical[name]
+            stream.write(struct.pack("<Q", len(column.values)))
+            for value in column.values:
+                _write_block(stream, value.encode("utf-8"))
+            _write_block(
+                stream,
+                _to_little_endian(array.array("Q", column.codes))
+            )
+        _write_block(stream, bytes(self._paths.data))
+        _write_block(stream, _to_little_endian(self._paths.offsets))
+        _write_block(stream, _to_little_endian(self._sizes))
+
+    @classmethod
+    def load(cls, stream: BinaryIO) -> "FileTable":
+        """Read a table written by dump."""
+        if stream.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Stream does not contain a file table")
+        rows, = struct.unpack("<Q", _read_exactly(stream, 8))
+        table = cls()
+        for name in CATEGORICAL_COLUMNS:
+            count, = struct.unpack("<Q", _read_exactly(stream, 8))
+            values = [
+                _read_block(stream).decode("utf-8") for _ in range(count)
+            ]
+            codes = array.array(
+                "L", _from_little_endian("Q", _read_block(stream))
+            )
+            table._categorical[name] = _CategoricalColumn(values, codes)
+        table._paths = _StringColumn(
+            bytearray(_read_block(stream)),
+            _from_little_endian("Q", _read_block(stream))
+        )
+        table._sizes = _from_little_endian("q", _read_block(stream))
+        if len(table._sizes) != rows:
+            raise ValueError("File table is incomplete")
+        return table
+
+    def to_bytes(self) -> bytes:
+        """Get the table in the format written by dump."""
+        stream = io.BytesIO()
+        self.dump(stream)
+        return stream.getvalue()
+
+
+def _iter_instantiations(
+        component: AbsPackageComponent
+) -> Iterator[Instantiation]:
+    if isinstance(component, Instantiation):
+        yield component
+        return
+    for child in component.children:
+        yield from _iter_instantiations(child)
+
+
+def _write_block(stream: BinaryIO, data: bytes) -> None:
+    stream.write(struct.pack("<Q", len(data)))
+    stream.write(data)
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("File table is incomplete")
+    return data
+
+
+def _read_block(stream: BinaryIO) -> bytes:
+    size, = struct.unpack("<Q", _read_exactly(stream, 8))
+    return _read_exactly(stream, size)
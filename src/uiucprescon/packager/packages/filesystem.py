@@ -0,0 +1,327 @@
+"""File systems used to locate the files of packages.
+
+Collection builders never read a directory themselves. They ask a
+:py:class:`AbsFileSystem` for the listing, so the same builder can locate
+packages on the local disk, from a synthetic tree held in memory, or from a
+:py:class:`~uiucprescon.packager.packages.scan_cache.ScanCache` of the
+listings of another file system.
+
+.. versionadded:: 0.2.16
+
+"""
+import abc
+import errno
+import os
+import stat
+import time
+import typing
+import zipfile
+from typing import Dict, Iterable, List, Optional
+
+__all__ = [
+    "AbsFileSystem",
+    "DirectoryEntry",
+    "InMemoryFileSystem",
+    "LocalFileSystem",
+    "read_archive_members",
+]
+
+FILE = "f"
+DIRECTORY = "d"
+OTHER = "o"
+
+
+class DirectoryEntry:
+    """Directory entry not backed by a call to os.scandir.
+
+    Provides the parts of :py:class:`os.DirEntry` used to locate packages.
+    """
+
+    __slots__ = ("name", "path", "_kind")
+
+    def __init__(self, directory: str, name: str, kind: str) -> None:
+        """Create a new entry.
+
+        Args:
+            directory: Path of the directory the entry was listed in
+            name: File name of the entry
+            kind: Type of the entry. Either "f" for files, "d" for
+                directories or "o" for anything else.
+        """
+        self.name = name
+        self.path = os.path.join(directory, name)
+        self._kind = kind
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        """Check if the entry is a file."""
+        return self._kind == FILE
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        """Check if the entry is a directory."""
+        return self._kind == DIRECTORY
+
+    def __fspath__(self) -> str:
+        """Get the path of the entry, the same as os.DirEntry."""
+        return self.path
+
+    def __repr__(self) -> str:
+        """Show the type of the entry and its name."""
+        return f"<{self.__class__.__name__} {self.name!r}>"
+
+
+class AbsFileSystem(metaclass=abc.ABCMeta):
+    """Source of the directory listings used to locate packages."""
+
+    @abc.abstractmethod
+    def scandir(self, path: str) -> Iterable["os.DirEntry[str]"]:
+        """List the entries of a directory, the same as os.scandir.
+
+        Raises:
+            FileNotFoundError: if the directory does not exist
+        """
+
+    @abc.abstractmethod
+    def exists(self, path: str) -> bool:
+        """Check if a file or directory exists."""
+
+    def listdir(self, path: str) -> List[str]:
+        """List the names of the entries of a directory."""
+        return [entry.name for entry in self.scandir(path)]
+
+    def stat(self, path: str) -> os.stat_result:
+        """Get the status of a file or directory, the same as os.stat.
+
+        File systems that can't tell when a directory changed raise
+        NotImplementedError, so their listings are never cached.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not provide stat"
+        )
+
+    def list_archive(self, path: str) -> List[str]:
+        """List the names of the files inside a zip file.
+
+        Returns:
+            Names of the members of the zip file that are not directories,
+            in the order of its central directory.
+
+        """
+        return read_archive_members(path)
+
+
+class LocalFileSystem(AbsFileSystem):
+    """Files on the local file system."""
+
+    def scandir(self, path: str) -> Iterable["os.DirEntry[str]"]:
+        """List the entries of a directory with os.scandir."""
+        return os.scandir(path)
+
+    def exists(self, path: str) -> bool:
+        """Check if a file or directory exists with os.path.exists."""
+        return os.path.exists(path)
+
+    def listdir(self, path: str) -> List[str]:
+        """List the names of the entries of a directory with os.listdir."""
+        return os.listdir(path)
+
+    def stat(self, path: str) -> os.stat_result:
+        """Get the status of a file or directory with os.stat."""
+        return os.stat(path)
+
+
+class InMemoryFileSystem(AbsFileSystem):
+    """Directory tree that only exists in memory.
+
+    Useful for locating packages in large synthetic batches without
+    creating any files. Only the names of files and directories are kept,
+    not their content.
+
+    Examples:
+        >>> filesystem = InMemoryFileSystem(["batch/000001/00000001.jp2"])
+        >>> filesystem.listdir("batch")
+        ['000001']
+        >>> filesystem.exists("batch/000001/00000001.jp2")
+        True
+
+    """
+
+    def __init__(self, files: Iterable[str] = ()) -> None:
+        """Create a new in-memory file system.
+
+        Args:
+            files: Paths of files to add. Their parent directories are added
+                as well.
+        """
+        self._directories: Dict[str, Dict[str, str]] = {}
+        self._archives: Dict[str, List[str]] = {}
+        self._changed_ns = 0
+        self.add_files(files)
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.normpath(os.fspath(path))
+
+    def _changed(self) -> None:
+        # Always move forward, even if the clock has not ticked since the
+        # last change.
+        self._changed_ns = max(time.time_ns(), self._changed_ns + 1)
+
+    def add_directory(self, path: str) -> None:
+        """Add a directory and any of its missing parents."""
+        self._changed()
+        key = self._normalize(path)
+        child = None
+        while True:
+            contents = self._directories.get(key)
+            is_new = contents is None
+            if contents is None:
+                contents = self._directories[key] = {}
+            if child is not None:
+                contents[child] = DIRECTORY
+            if not is_new:
+                return
+            parent, name = os.path.split(key)
+            if not name or key == os.curdir:
+                return
+            key, child = parent or os.curdir, name
+
+    def add_file(self, path: str) -> None:
+        """Add a file and any of its missing parent directories.
+
+        Nothing is changed if the path was already added as a directory.
+        """
+        self._changed()
+        self._add_file(path)
+
+    def _add_file(self, path: str) -> Optional[Dict[str, str]]:
+        key = self._normalize(path)
+        if key in self._directories:
+            return None
+        parent, name = os.path.split(key)
+        parent = parent or os.curdir
+        contents = self._directories.get(parent)
+        if contents is None:
+            self.add_directory(parent)
+            contents = self._directories[parent]
+        contents[name] = FILE
+        return contents
+
+    def add_archive_member(self, archive: str, member: str) -> None:
+        """Add a file inside a zip file, and the zip file itself.
+
+        Args:
+            archive: Path of the zip file
+            member: Name of the file inside the zip file
+
+        .. versionadded:: 0.2.16
+        """
+        self.add_file(archive)
+        self._archives.setdefault(self._normalize(archive), []).append(member)
+
+    def add_files(self,
+                  paths: Iterable[str],
+                  root: Optional[str] = None) -> None:
+        """Add many files and any of their missing parent directories.
+
+        A path is only normalized if its directory is not the same as the
+        one of the path before it, so listings grouped by directory, such as
+        the output of find, are added quickly.
+
+        Args:
+            paths: Paths of the files to add
+            root: Path that relative paths are relative to. Defaults to the
+                current directory.
+
+        .. versionadded:: 0.2.16
+        """
+        self._changed()
+        last_head: Optional[str] = None
+        last_contents: Dict[str, str] = {}
+        for path in paths:
+            index = path.rfind(os.sep)
+            if os.altsep:
+                index = max(index, path.rfind(os.altsep))
+            head = path[:index] if index > 0 else None
+            name = path[index + 1:]
+            if head is not None and head == last_head and \
+                    name not in ("", os.curdir, os.pardir):
+                if last_contents.get(name) != DIRECTORY:
+                    last_contents[name] = FILE
+                continue
+            contents = self._add_file(
+                path if root is None else os.path.join(root, path)
+            )
+            if contents is None:
+                last_head = None
+            else:
+                last_contents, last_head = contents, head
+
+    def scandir(self, path: str) -> Iterable["os.DirEntry[str]"]:
+        """List the entries of a directory added to the file system."""
+        contents = self._directories.get(self._normalize(path))
+        if contents is None:
+            raise FileNotFoundError(
+                errno.ENOENT, os.strerror(errno.ENOENT), path
+            )
+        return typing.cast(List["os.DirEntry[str]"], [
+            DirectoryEntry(path, name, kind)
+            for name, kind in contents.items()
+        ])
+
+    def exists(self, path: str) -> bool:
+        """Check if a file or directory was added to the file system."""
+        key = self._normalize(path)
+        if key in self._directories:
+            return True
+        parent, name = os.path.split(key)
+        return name in self._directories.get(parent or os.curdir, {})
+
+    def stat(self, path: str) -> os.stat_result:
+        """Get a status made up for a file or directory that was added.
+
+        Only the type is set, and the modification time is when anything
+        was last added to the file system, so a
+        :py:class:`~uiucprescon.packager.packages.scan_cache.ScanCache`
+        reads the listings again once the file system changes.
+
+        Raises:
+            FileNotFoundError: if the path was not added
+
+        .. versionadded:: 0.2.16
+        """
+        if self._normalize(path) in self._directories:
+            mode = stat.S_IFDIR | 0o755
+        elif self.exists(path):
+            mode = stat.S_IFREG | 0o644
+        else:
+            raise FileNotFoundError(
+                errno.ENOENT, os.strerror(errno.ENOENT), path
+            )
+        seconds = self._changed_ns / 1e9
+        return os.stat_result((
+            mode, 0, 0, 1, 0, 0, 0,
+            int(seconds), int(seconds), int(seconds),
+            seconds, seconds, seconds,
+            self._changed_ns, self._changed_ns, self._changed_ns,
+        ))
+
+    def list_archive(self, path: str) -> List[str]:
+        """List the files added to a zip file with add_archive_member.
+
+        A zip file with no files added is read from disk instead.
+        """
+        members = self._archives.get(self._normalize(path))
+        if members is None:
+            return super().list_archive(path)
+        return list(members)
+
+
+def read_archive_members(path: str) -> List[str]:
+    """Read the names of the files in a zip file from its central directory.
+
+    .. versionadded:: 0.2.16
+    """
+    with zipfile.ZipFile(path) as archive:
+        return [
+            info.filename for info in archive.infolist() if not info.is_dir()
+        ]
@@ -2,7 +2,7 @@
 
 # pylint: disable=unsubscriptable-object
 import abc
-import itertools
+import functools
 import logging
 import os
 import pathlib
@@ -16,7 +16,10 @@ from uiucprescon.packager.common import \
     PackageTypes, \
     InstantiationTypes
 from .abs_package_builder import AbsPackageBuilder
-from .collection_builder import AbsCollectionBuilder
+from .collection_builder import AbsCollectionBuilder, StemFiles
+from .item_task import ItemTask
+from .zip_session import ZipSession
+from .zip_output import ZipMemberWriter, ZipPackageWriters
 
 
 __all__ = ['HathiJp2']
@@ -37,6 +40,17 @@ class AbsItemTransformStrategy(abc.ABC):  # pylint: disable=R0903
     ) -> None:
         """Transform the access files of an item."""
 
+    @abc.abstractmethod
+    def write_access_file(
+            self,
+            item: Item,
+            writer: ZipMemberWriter
+    ) -> None:
+        """Transform the access files of an item into a zip file.
+
+        .. versionadded:: 0.2.16
+        """
+
 
 class CopyStrategy(AbsItemTransformStrategy):
     """Copy files without modifying them."""
@@ -60,13 +74,42 @@ class CopyStrategy(AbsItemTransformStrategy):
                 f"Expected 1 file, found {len(files)}")
 
         for file_ in files:
-            file_name = pathlib.Path(file_).name
-            _, ext = os.path.splitext(file_name)
-
-            new_file_name = str(int(item_name)).zfill(8) + ext
+            new_file_name = self.get_new_file_name(item_name, file_)
             new_file_path = os.path.join(new_item_path, new_file_name)
             self.transform_file(file_, new_file_path)
 
+    def write_access_file(
+            self,
+            item: Item,
+            writer: ZipMemberWriter
+    ) -> None:
+        """Copy the access file of an item into a zip file.
+
+        The file is read straight from its source, even if that is a zip
+        file, without being copied or extracted first.
+
+        .. versionadded:: 0.2.16
+        """
+        item_name = typing.cast(str, item.metadata[Metadata.ITEM_NAME])
+        inst = item.instantiations[InstantiationTypes.ACCESS]
+
+        files = inst.list_file_names()
+        if len(files) != 1:
+            raise AssertionError(
+                f"Expected 1 file, found {len(files)}")
+
+        for name, stream in inst.iter_streams():
+            self.logger.debug("Adding %s to %s", name, writer.path)
+            writer.add_stream(
+                stream, self.get_new_file_name(item_name, name)
+            )
+
+    @staticmethod
+    def get_new_file_name(item_name: str, source: str) -> str:
+        """Get the file name of a copied file from its item name."""
+        _, ext = os.path.splitext(pathlib.PurePath(source).name)
+        return str(int(item_name)).zfill(8) + ext
+
     def transform_file(self, source: str, destination: str) -> None:
         """Copy file from source to destination."""
         self.transformer.transform(
@@ -101,6 +144,29 @@ class ConvertStrategy(AbsItemTransformStrategy):
         new_file_path = self.get_output_name(item, dest)
         self.convert(source, new_file_path)
 
+    def write_access_file(
+            self,
+            item: Item,
+            writer: ZipMemberWriter
+    ) -> None:
+        """Convert the file of an item into a zip file.
+
+        The encoder can only write to a path, so the converted file is
+        written to scratch space and removed once it is in the zip file.
+
+        .. versionadded:: 0.2.16
+        """
+        inst = item.instantiations[self._instance_type]
+        files = list(inst.get_files())
+        if len(files) != 1:
+            raise AssertionError(
+                "write_access_file only works with an instance that has "
+                "a single file"
+            )
+        arcname = os.path.basename(self.get_output_name(item, ""))
+        with writer.add_generated(arcname) as scratch_path:
+            self.convert(files[0], scratch_path)
+
     @staticmethod
     def get_output_name(reference_item: Item, dest: str) -> str:
         """Derive output file name and path from reference item."""
@@ -125,14 +191,38 @@ class ConvertStrategy(AbsItemTransformStrategy):
             strategy=packager.transformations.ConvertJp2Hathi(),
             logger=self.logger
         )
-        if pathlib.Path(destination).parent.exists() is False:
-            pathlib.Path(destination).parent.mkdir()
+        pathlib.Path(destination).parent.mkdir(exist_ok=True)
         file_transformer.transform(source, destination)
 
 
+STRATEGIES: typing.Dict[
+    str,
+    typing.Tuple[
+        InstantiationTypes,
+        typing.Callable[[], AbsItemTransformStrategy]
+    ]
+] = {
+    "copy": (InstantiationTypes.ACCESS, CopyStrategy),
+    "convert_access": (
+        InstantiationTypes.ACCESS,
+        functools.partial(ConvertStrategy, InstantiationTypes.ACCESS)
+    ),
+    "convert_preservation": (
+        InstantiationTypes.PRESERVATION,
+        functools.partial(ConvertStrategy, InstantiationTypes.PRESERVATION)
+    ),
+}
+"""Source category and factory of each item strategy, by name.
+
+.. versionadded:: 0.2.16
+"""
+
+
 class HathiJp2(AbsPackageBuilder):
     """Packaged files for submitting to HathiTrust with JPEG 2000 files."""
 
+    supports_zip_output = True
+
     def locate_packages(self, path: str) -> Iterator[Package]:
         """Locate Hathi jp2 packages on a given file path.
 
@@ -143,24 +233,74 @@ class HathiJp2(AbsPackageBuilder):
             Hathi Jpeg2000 packages
 
         """
-        builder = HathiJp2Builder()
+        builder = HathiJp2Builder(max_workers=self.max_workers,
+                                  filesystem=self.filesystem)
         batch = builder.build_batch(path)
         yield from batch
 
     def transform(self, package: Package, dest: str) -> None:
         """Transform package into a Hathi jp2k package.
 
+        If zip_output is set, each object is written into a zip file in
+        dest named after the object, instead of a directory. Zip files are
+        always written by threads of the current process, even if
+        transform_executor is "process", and the files are added in the
+        order of the items even when they are transformed at the same time.
+
+        Files extracted from a zipped source package are removed once the
+        package has been transformed.
+
         Args:
             package: Source package to transform
             dest: File path to save the transformed package
 
+        .. versionchanged:: 0.2.16
+            Supports zip_output, transform_workers and transform_executor
+
         """
         logger = logging.getLogger(__name__)
         logger.setLevel(AbsPackageBuilder.log_level)
-        item: Item
-        for item in package:
-            transformation_strategy = self._get_item_transformer_strategy(item)
-            self.transform_one_item(item, dest, transformation_strategy)
+        with ZipSession():
+            if self.zip_output is not None:
+                with ZipPackageWriters(
+                        dest, self.zip_output,
+                        staged=(self.transform_workers or 0) > 1
+                ) as writers:
+                    self.transform_items(
+                        package,
+                        functools.partial(
+                            self.write_one_item, writers=writers
+                        ),
+                        executor="thread",
+                        finish_item=writers.commit
+                    )
+                return
+            self.transform_items(
+                package,
+                functools.partial(self.transform_one_item, dest=dest),
+                transform_task=functools.partial(
+                    self.transform_task, dest=dest
+                )
+            )
+
+    def create_task(self, item: Item) -> ItemTask:
+        """Describe an item with the source files its strategy uses.
+
+        .. versionadded:: 0.2.16
+        """
+        strategy_name = self._get_item_strategy_name(item)
+        category, _ = STRATEGIES[strategy_name]
+        return ItemTask.from_item(
+            item, strategy=strategy_name, categories=[category]
+        )
+
+    def transform_task(self, task: ItemTask, dest: str) -> None:
+        """Transform a single item from its task.
+
+        .. versionadded:: 0.2.16
+        """
+        _, create_strategy = STRATEGIES[task.strategy]
+        self.transform_one_item(task.to_item(), dest, create_strategy())
 
     def transform_one_item(
             self,
@@ -175,17 +315,31 @@ class HathiJp2(AbsPackageBuilder):
 
         strategy.transform_access_file(item, dest)
 
+    def write_one_item(self, item: Item, writers: ZipPackageWriters) -> None:
+        """Write a single item into the zip file of its object.
+
+        .. versionadded:: 0.2.16
+        """
+        strategy = self._get_item_transformer_strategy(item)
+        strategy.write_access_file(item, writers.get_item_writer(item))
+
     @staticmethod
     def _get_item_transformer_strategy(
             item: Item
     ) -> AbsItemTransformStrategy:
+        _, create_strategy = \
+            STRATEGIES[HathiJp2._get_item_strategy_name(item)]
+        return create_strategy()
 
+    @staticmethod
+    def _get_item_strategy_name(item: Item) -> str:
         if InstantiationTypes.ACCESS in item.instantiations:
             access = item.instantiations[InstantiationTypes.ACCESS]
-            if any(f.lower().endswith(".tif") for f in access.get_files()):
-                return ConvertStrategy(InstantiationTypes.ACCESS)
-            return CopyStrategy()
-        return ConvertStrategy(InstantiationTypes.PRESERVATION)
+            if any(f.lower().endswith(".tif")
+                   for f in access.list_file_names()):
+                return "convert_access"
+            return "copy"
+        return "convert_preservation"
 
 
 class HathiJp2Builder(AbsCollectionBuilder):
@@ -196,7 +350,8 @@ class HathiJp2Builder(AbsCollectionBuilder):
         new_batch = Package(root)
         new_batch.component_metadata[Metadata.PATH] = root
 
-        for dir_ in filter(lambda i: i.is_dir(), os.scandir(root)):
+        packages = []
+        for dir_ in filter(lambda i: i.is_dir(), self.scandir(root)):
             new_object = PackageObject(parent=new_batch)
             new_object.component_metadata[Metadata.ID] = dir_.name
             new_object.component_metadata[Metadata.PATH] = dir_.path
@@ -204,7 +359,8 @@ class HathiJp2Builder(AbsCollectionBuilder):
             new_object.component_metadata[Metadata.PACKAGE_TYPE] = \
                 PackageTypes.HATHI_TRUST_JP2_SUBMISSION
 
-            self.build_package(new_object, path=dir_.path)
+            packages.append((new_object, dir_.path))
+        self.build_packages(packages)
 
         return new_batch
 
@@ -218,19 +374,23 @@ class HathiJp2Builder(AbsCollectionBuilder):
         return ext.lower() == ".jp2"
 
     def build_package(self, parent, path: str, *args, **kwargs) -> None:
-        """Build package."""
-        for file_ in filter(self.filter_tiff_files, os.scandir(path)):
+        """Build package.
+
+        .. versionchanged:: 0.2.16
+            The path is scanned once and the files are grouped by stem
+                before building the instances.
+        """
+        stems = self.group_files_by_stem(self.scandir(path), ".jp2")
+        for item_part in sorted(stems):
+            stem_files = stems[item_part]
+            if not stem_files.main_files:
+                continue
             new_item = Item(parent=parent)
-            item_part, _ = os.path.splitext(file_.name)
             new_item.component_metadata[Metadata.ITEM_NAME] = item_part
-            self.build_instance(new_item, path=path, filename=item_part)
-
-    @staticmethod
-    def _organize_files(item: 'os.DirEntry[str]') -> str:
-        ext = os.path.splitext(item.name)[1]
-        if ext.lower() == ".jp2":
-            return "main_files"
-        return "sidecar"
+            self.build_instance(new_item,
+                                path=path,
+                                filename=item_part,
+                                stem_files=stem_files)
 
     def build_instance(
             self,
@@ -240,36 +400,29 @@ class HathiJp2Builder(AbsCollectionBuilder):
             *args,
             **kwargs
     ) -> None:
-        """Build Instance."""
-        sidecar_files: typing.List[os.DirEntry[str]]
-        main_files: typing.List[os.DirEntry[str]]
-        main_files, sidecar_files = self._locate_instance_files(filename, path)
+        """Build Instance.
+
+        .. versionchanged:: 0.2.16
+            Added stem_files keyword argument. If provided, the path is not
+                scanned again to locate files with the same name.
+        """
+        stem_files: typing.Optional[StemFiles] = kwargs.get("stem_files")
+        if stem_files is None:
+            stem_files = self._locate_instance_files(filename, path)
 
         new_instantiation = Instantiation(category=InstantiationTypes.ACCESS,
                                           parent=parent,
-                                          files=main_files
+                                          files=list(stem_files.main_files)
                                           )
 
-        for file_ in sidecar_files:
-            new_instantiation.sidecar_files.append(file_.path)
-
-    def _locate_instance_files(self, filename, path):
-        matching_files = \
-            filter(lambda x, file_name=filename:
-                   self.filter_same_name_files(x, file_name), os.scandir(path))
-        sidecar_files: typing.List[os.DirEntry[str]] = []
-        main_files: typing.List[os.DirEntry[str]] = []
-        key: str
-        value: typing.Iterator[os.DirEntry[str]]
-        file_: os.DirEntry[str]
-
-        for key, value in itertools.groupby(
-                matching_files,
-                key=self._organize_files
-        ):
-            for file_ in value:
-                if key == "sidecar":
-                    sidecar_files.append(file_)
-                elif key == "main_files":
-                    main_files.append(file_)
-        return main_files, sidecar_files
+        new_instantiation.sidecar_files.extend(stem_files.sidecar_files)
+
+    def _locate_instance_files(self, filename: str, path: str) -> StemFiles:
+        matching_files: typing.List["os.DirEntry[str]"] = [
+            entry for entry in self.scandir(path)
+            if self.filter_same_name_files(entry, filename)
+        ]
+        return self.group_files_by_stem(matching_files, ".jp2").get(
+            filename,
+            StemFiles([], [])
+        )
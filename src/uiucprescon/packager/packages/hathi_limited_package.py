@@ -45,7 +45,9 @@ class HathiLimitedView(AbsPackageBuilder):
             Hathi limited view packages
 
         """
-        builder = collection_builder.HathiLimitedViewBuilder()
+        builder = collection_builder.HathiLimitedViewBuilder(
+            filesystem=self.filesystem
+        )
         batch = builder.build_batch(path)
         yield from batch
 
@@ -1,5 +1,6 @@
 """Packaged files for submitting to HathiTrust containing only Tiff files."""
 
+import functools
 import logging
 import os
 import pathlib
@@ -12,11 +13,16 @@ from uiucprescon.packager.packages.collection import \
 from uiucprescon.packager import transformations
 from uiucprescon.packager.common import Metadata
 from .abs_package_builder import AbsPackageBuilder
+from .item_task import ItemTask
+from .zip_session import ZipSession
+from .zip_output import ZipMemberWriter, ZipPackageWriters
 
 
 class HathiTiff(AbsPackageBuilder):
     """Packaged files for submitting to HathiTrust containing Tiff files."""
 
+    supports_zip_output = True
+
     def locate_packages(self, path: str) -> Iterator[Package]:
         """Locate Hathi tiff packages on a given file path.
 
@@ -27,45 +33,117 @@ class HathiTiff(AbsPackageBuilder):
             Hathi Tiff packages
 
         """
-        builder = collection_builder.HathiTiffBuilder()
+        builder = collection_builder.HathiTiffBuilder(
+            max_workers=self.max_workers,
+            filesystem=self.filesystem
+        )
         yield from builder.build_batch(path)
 
     def transform(self, package: Package, dest: str) -> None:
         """Transform package into a Hathi Tiff package.
 
+        If zip_output is set, each object is written into a zip file in
+        dest named after the object, instead of a directory. Zip files are
+        always written by threads of the current process, even if
+        transform_executor is "process", and the files are added in the
+        order of the items even when they are transformed at the same time.
+
+        Files extracted from a zipped source package are removed once the
+        package has been transformed.
+
         Args:
             package: Source package to transform
             dest: File path to save the transformed package
 
+        .. versionchanged:: 0.2.16
+            Supports zip_output, transform_workers and transform_executor
+
         """
         logger = logging.getLogger(__name__)
         logger.setLevel(AbsPackageBuilder.log_level)
-        item: Item
-        for item in package:
-            item_name = typing.cast(str, item.metadata[Metadata.ITEM_NAME])
-            object_name = typing.cast(str, item.metadata[Metadata.ID])
-            new_item_path = os.path.join(dest, object_name)
-            if not os.path.exists(new_item_path):
-                os.makedirs(new_item_path)
-
-            inst: Instantiation
-            for inst in item:
-                files: typing.List[str] = list(inst.get_files())
-                if len(files) != 1:
-                    raise AssertionError(
-                        f"Expected 1 file, found {len(files)}")
-                for file_ in files:
-
-                    _, ext = os.path.splitext(pathlib.Path(file_).name)
-
-                    new_file_name = f"{item_name}{ext}"
-                    new_file_path = os.path.join(new_item_path, new_file_name)
-                    self.copy(file_, destination=new_file_path, logger=logger)
+        with ZipSession():
+            if self.zip_output is not None:
+                with ZipPackageWriters(
+                        dest, self.zip_output,
+                        staged=(self.transform_workers or 0) > 1
+                ) as writers:
+                    self.transform_items(
+                        package,
+                        lambda item: self.write_item(
+                            item, writers.get_item_writer(item), logger
+                        ),
+                        executor="thread",
+                        finish_item=writers.commit
+                    )
+                return
+            self.transform_items(
+                package,
+                functools.partial(self.transform_one_item, dest=dest),
+                transform_task=functools.partial(
+                    self.transform_task, dest=dest
+                )
+            )
+
+    def transform_task(self, task: ItemTask, dest: str) -> None:
+        """Transform a single item from its task.
+
+        .. versionadded:: 0.2.16
+        """
+        self.transform_one_item(task.to_item(), dest)
+
+    def transform_one_item(self, item: Item, dest: str) -> None:
+        """Copy the files of a single item into the directory of its object.
+
+        .. versionadded:: 0.2.16
+        """
+        logger = logging.getLogger(__name__)
+        item_name = typing.cast(str, item.metadata[Metadata.ITEM_NAME])
+        object_name = typing.cast(str, item.metadata[Metadata.ID])
+        new_item_path = os.path.join(dest, object_name)
+        os.makedirs(new_item_path, exist_ok=True)
+
+        inst: Instantiation
+        for inst in item:
+            files: typing.List[str] = list(inst.get_files())
+            if len(files) != 1:
+                raise AssertionError(
+                    f"Expected 1 file, found {len(files)}")
+            for file_ in files:
+
+                _, ext = os.path.splitext(pathlib.Path(file_).name)
+
+                new_file_name = f"{item_name}{ext}"
+                new_file_path = os.path.join(new_item_path, new_file_name)
+                self.copy(file_, destination=new_file_path, logger=logger)
+
+    @staticmethod
+    def write_item(item: Item,
+                   writer: ZipMemberWriter,
+                   logger: typing.Optional[logging.Logger] = None) -> None:
+        """Copy the files of an item into a zip file without modifications.
+
+        The files are read straight from their source, even if that is a
+        zip file, without being copied or extracted first.
+
+        .. versionadded:: 0.2.16
+        """
+        logger = logger or logging.getLogger(__name__)
+        item_name = typing.cast(str, item.metadata[Metadata.ITEM_NAME])
+        inst: Instantiation
+        for inst in item:
+            files = inst.list_file_names()
+            if len(files) != 1:
+                raise AssertionError(
+                    f"Expected 1 file, found {len(files)}")
+            for name, stream in inst.iter_streams():
+                _, ext = os.path.splitext(pathlib.PurePath(name).name)
+                logger.debug("Adding %s to %s", name, writer.path)
+                writer.add_stream(stream, f"{item_name}{ext}")
 
     @staticmethod
     def copy(source: str,
              destination: str,
-             logger: logging.Logger = None) -> None:
+             logger: typing.Optional[logging.Logger] = None) -> None:
         """Copy file without modifications."""
         logger = logger or logging.getLogger(__name__)
 
@@ -0,0 +1,121 @@
+"""Flat description of how to transform a single item.
+
+An :py:class:`Item` holds a reference to its parent object, which holds a
+reference to its package and so on up the batch, so pickling one item to
+send it to a worker process pickles most of the batch along with it. An
+:py:class:`ItemTask` only holds what a package builder needs to transform
+the item: the item and its parents written as JSON lines by
+:py:func:`serialization.dump`, without the other children of the parents,
+and the name of the strategy chosen for it.
+
+Files in a zip file are not extracted when the task is created. The task
+keeps the names of the members, and they are extracted by the worker
+process that transforms the item.
+
+Examples:
+    >>> import os
+    >>> package_object = collection.PackageObject()
+    >>> package_object.component_metadata[Metadata.ID] = "000001"
+    >>> package_object.component_metadata[Metadata.PATH] = "000001"
+    >>> item = collection.Item(package_object)
+    >>> item.component_metadata[Metadata.ITEM_NAME] = "00000001"
+    >>> _ = collection.Instantiation(
+    ...     InstantiationTypes.ACCESS, item, ["00000001.tif"])
+    >>> task = ItemTask.from_item(item, strategy="convert_access")
+    >>> task.object_id, task.item_name
+    ('000001', '00000001')
+    >>> rebuilt = task.to_item()
+    >>> rebuilt.metadata[Metadata.ITEM_NAME]
+    '00000001'
+    >>> expected = (os.path.join("000001", "00000001.tif"),)
+    >>> task.get_files(InstantiationTypes.ACCESS) == expected
+    True
+
+.. versionadded:: 0.2.16
+
+"""
+import io
+import typing
+from typing import Collection, NamedTuple, Optional, Tuple
+
+from uiucprescon.packager.common import InstantiationTypes, Metadata
+from . import collection, serialization
+from .zip_session import ZipSession
+
+__all__ = ["ItemTask"]
+
+
+class ItemTask(NamedTuple):
+    """Everything needed to transform an item, without the rest of the batch.
+
+    .. versionadded:: 0.2.16
+    """
+
+    object_id: str
+    item_name: str
+    components: str
+    categories: Tuple[InstantiationTypes, ...]
+    strategy: str = ""
+
+    @classmethod
+    def from_item(
+            cls,
+            item: collection.Item,
+            strategy: str = "",
+            categories: Optional[Collection[InstantiationTypes]] = None
+    ) -> "ItemTask":
+        """Describe an item.
+
+        Args:
+            item: Item to describe
+            strategy: Name of the strategy used to transform the item, as
+                understood by the package builder that transforms it
+            categories: Only include the files of these categories. All of
+                them if None.
+
+        """
+        stream = io.StringIO()
+        serialization.dump([item], stream)
+        return cls(
+            object_id=str(item.metadata[Metadata.ID]),
+            item_name=str(item.metadata[Metadata.ITEM_NAME]),
+            components=stream.getvalue(),
+            categories=tuple(
+                category for category in item.instantiations
+                if categories is None or category in categories
+            ),
+            strategy=strategy
+        )
+
+    def get_files(
+            self,
+            category: InstantiationTypes,
+            session: Optional[ZipSession] = None
+    ) -> Tuple[str, ...]:
+        """Get the source files of a category.
+
+        Files in a zip file are extracted, the same as with
+        :py:meth:`Instantiation.get_files`.
+
+        Raises:
+            KeyError: if the task has no files of that category
+
+        """
+        if category not in self.categories:
+            raise KeyError(category)
+        instantiation = self.to_item().instantiations[category]
+        return tuple(instantiation.get_files(session))
+
+    def to_item(self) -> collection.Item:
+        """Build the item of the task, with its metadata and files.
+
+        The parents of the item are rebuilt with their metadata, without
+        their other children, so the strategies written for items can
+        transform it as they would the original item.
+        """
+        components = serialization.load(io.StringIO(self.components))
+        item = typing.cast(collection.Item, components[0])
+        for category in list(item.instantiations):
+            if category not in self.categories:
+                del item.instantiations[category]
+        return item
@@ -0,0 +1,225 @@
+r"""Locate packages from a listing of their files.
+
+Instead of reading the directories of a batch, the builders can be given a
+manifest of the files in it, such as the output of ``find`` or an inventory
+exported by another tool. The manifest is loaded into an
+:py:class:`~uiucprescon.packager.packages.filesystem.InMemoryFileSystem`,
+which is then used in place of the local file system.
+
+Three formats are supported:
+
+* ``lines``: one path per line. A path ending with a path separator is a
+  directory.
+* ``csv``: a header row with a ``path`` column and an optional ``type``
+  column, which is either ``file`` or ``directory``.
+* ``json``: an array of paths, or an array of objects with ``path`` and an
+  optional ``type``, in the same way as the csv columns.
+
+Relative paths are resolved against the root given, which should be the
+same path later passed to locate_packages.
+
+A file inside a zip file, such as the packages located by HathiLimitedView,
+is written as the path of the zip file and the name of the file inside it,
+separated by ``!``, for example ``1234.zip!1234/00000001.jp2``. The files
+of a zip file that has none listed this way are read from the zip file
+itself when its package is located, so the zip file has to exist.
+
+Examples:
+    >>> import io
+    >>> manifest = io.StringIO("000001/00000001.jp2\n000001/00000002.jp2\n")
+    >>> filesystem = load_manifest(manifest, root="batch")
+    >>> filesystem.listdir("batch")
+    ['000001']
+    >>> manifest = io.StringIO("1234.zip!1234/00000001.jp2\n")
+    >>> load_manifest(manifest).list_archive("1234.zip")
+    ['1234/00000001.jp2']
+
+.. versionadded:: 0.2.16
+
+"""
+import csv
+import json
+import os
+from typing import IO, Iterator, Optional, Tuple, Union, cast
+
+from .filesystem import InMemoryFileSystem
+
+__all__ = [
+    "load_manifest",
+    "guess_manifest_format",
+    "parse_lines",
+    "parse_csv",
+    "parse_json",
+    "MANIFEST_FORMATS",
+]
+
+MANIFEST_FORMATS = ("lines", "csv", "json")
+
+_ARCHIVE_MEMBER_SEPARATOR = ".zip!"
+
+ManifestSource = Union[str, "os.PathLike[str]", IO[str]]
+
+
+def _is_directory_type(type_name: Optional[str]) -> bool:
+    if not type_name:
+        return False
+    type_name = type_name.strip().lower()
+    if type_name in ("d", "dir", "directory"):
+        return True
+    if type_name in ("f", "file"):
+        return False
+    raise ValueError(f"Unknown manifest entry type {type_name}")
+
+
+def _split_directory_marker(path: str) -> Tuple[str, bool]:
+    if path.endswith(("/", os.sep)):
+        return path.rstrip("/" + os.sep) or path, True
+    return path, False
+
+
+def parse_lines(stream: IO[str]) -> Iterator[Tuple[str, bool]]:
+    """Read a manifest with a path on each line.
+
+    Args:
+        stream: text of the manifest
+
+    Yields:
+        Path and if it is a directory
+
+    """
+    for line in stream:
+        path = line.rstrip("\r\n")
+        if path.strip():
+            yield _split_directory_marker(path)
+
+
+def parse_csv(stream: IO[str]) -> Iterator[Tuple[str, bool]]:
+    """Read a csv manifest with a path column and an optional type column.
+
+    Args:
+        stream: text of the manifest
+
+    Yields:
+        Path and if it is a directory
+
+    """
+    reader = csv.DictReader(stream)
+    if reader.fieldnames is None or "path" not in reader.fieldnames:
+        raise ValueError("CSV manifest requires a path column")
+    for row in reader:
+        path = row["path"]
+        if not path:
+            continue
+        path, is_dir = _split_directory_marker(path)
+        yield path, is_dir or _is_directory_type(row.get("type"))
+
+
+def parse_json(stream: IO[str]) -> Iterator[Tuple[str, bool]]:
+    """Read a json manifest with an array of paths or of objects.
+
+    Args:
+        stream: text of the manifest
+
+    Yields:
+        Path and if it is a directory
+
+    """
+    entries = json.load(stream)
+    if not isinstance(entries, list):
+        raise ValueError("JSON manifest requires an array of entries")
+    for entry in entries:
+        if isinstance(entry, str):
+            yield _split_directory_marker(entry)
+            continue
+        try:
+            path, is_dir = _split_directory_marker(entry["path"])
+        except (KeyError, TypeError) as error:
+            raise ValueError(
+                f"Invalid JSON manifest entry {entry!r}"
+            ) from error
+        yield path, is_dir or _is_directory_type(entry.get("type"))
+
+
+_PARSERS = {
+    "lines": parse_lines,
+    "csv": parse_csv,
+    "json": parse_json,
+}
+
+
+def guess_manifest_format(file_name: str) -> str:
+    """Identify the format of a manifest from its file extension.
+
+    Files ending with .csv are csv, .json are json and anything else is
+    read as a path on each line.
+    """
+    ext = os.path.splitext(file_name)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext == ".json":
+        return "json"
+    return "lines"
+
+
+def load_manifest(
+        manifest: ManifestSource,
+        manifest_format: Optional[str] = None,
+        root: Optional[str] = None
+) -> InMemoryFileSystem:
+    """Load a manifest into an in-memory file system.
+
+    Args:
+        manifest: Path to the manifest file, or a text stream of it
+        manifest_format: One of "lines", "csv" or "json". If not provided,
+            it is identified from the file extension of the manifest.
+        root: Path that relative paths in the manifest are relative to.
+            Defaults to the current directory.
+
+    Returns:
+        File system containing every file and directory in the manifest.
+
+    """
+    is_stream = hasattr(manifest, "read")
+    if manifest_format is None:
+        manifest_format = guess_manifest_format(
+            str(getattr(manifest, "name", "")) if is_stream
+            else os.fspath(cast("os.PathLike[str]", manifest))
+        )
+    parser = _PARSERS.get(manifest_format)
+    if parser is None:
+        raise ValueError(
+            f"Unknown manifest format {manifest_format}. "
+            f"Expected one of {', '.join(MANIFEST_FORMATS)}"
+        )
+
+    filesystem = InMemoryFileSystem()
+    if is_stream:
+        _add_entries(filesystem, parser(cast(IO[str], manifest)), root)
+    else:
+        with open(cast(str, manifest), "r",
+                  encoding="utf-8", newline="") as stream:
+            _add_entries(filesystem, parser(stream), root)
+    return filesystem
+
+
+def _add_entries(filesystem: InMemoryFileSystem,
+                 entries: Iterator[Tuple[str, bool]],
+                 root: Optional[str]) -> None:
+    def resolve(path: str) -> str:
+        return path if root is None else os.path.join(root, path)
+
+    def files() -> Iterator[str]:
+        for path, is_dir in entries:
+            archive, separator, member = \
+                path.partition(_ARCHIVE_MEMBER_SEPARATOR)
+            if separator:
+                if not is_dir:
+                    filesystem.add_archive_member(
+                        resolve(archive + ".zip"), member
+                    )
+            elif not is_dir:
+                yield path
+            else:
+                filesystem.add_directory(resolve(path))
+
+    filesystem.add_files(files(), root=root)
@@ -10,9 +10,11 @@ import typing
 
 from uiucprescon.packager.common import Metadata, InstantiationTypes
 from uiucprescon.packager.packages.collection_builder import \
-    AbsCollectionBuilder
+    AbsCollectionBuilder, \
+    Scandir
 from uiucprescon.packager.packages.abs_package_builder import AbsPackageBuilder
 from uiucprescon.packager.packages.collection import \
+    AbsPackageComponent, \
     Instantiation, \
     Item, \
     Package, \
@@ -22,6 +24,9 @@ from uiucprescon.packager.packages.collection import \
 
 __all__ = ['ArchivalNonEAS', 'CatalogedNonEAS']
 
+PartIndex = Dict[InstantiationTypes, List["os.DirEntry[str]"]]
+FileIndex = Dict[str, Dict[str, PartIndex]]
+
 
 class ArchivalNonEAS(AbsPackageBuilder):
     """Archival collections.
@@ -43,7 +48,10 @@ class ArchivalNonEAS(AbsPackageBuilder):
 
     """
 
-    def locate_packages(self, path: str) -> typing.Iterator[Package]:
+    def locate_packages(
+            self,
+            path: str
+    ) -> typing.Iterator[AbsPackageComponent]:
         """Locate archival packages.
 
         Args:
@@ -52,8 +60,17 @@ class ArchivalNonEAS(AbsPackageBuilder):
         Returns:
             Returns an iterable of package.
 
+        .. versionchanged:: 0.2.16
+            If streaming is set, each package is yielded as soon as it is
+                located.
+
         """
-        package_builder = ArchivalNonEASBuilder()
+        package_builder = ArchivalNonEASBuilder(
+            filesystem=self.filesystem
+        )
+        if self.streaming:
+            yield from package_builder.iter_objects(path)
+            return
         yield from package_builder.build_batch(path)
 
     def transform(self, package: Package, dest: str) -> None:
@@ -80,6 +97,34 @@ class NonEASBuilder(AbsCollectionBuilder):
 
         return new_batch.children[0]
 
+    def iter_objects(self, root: str) -> typing.Iterator[PackageObject]:
+        """Build the objects of a batch one at a time.
+
+        Each object is yielded as soon as it is built. The package does not
+        keep the objects as children, so they can be released by the caller
+        once they are no longer needed.
+
+        .. versionadded:: 0.2.16
+
+        Args:
+            root: path to the batch containing access and preservation
+
+        Yields:
+            Package objects in the order of their group names
+
+        """
+        file_index = self.build_file_index(root)
+        new_package = Package(root, parent=Batch(root))
+        for group_name in sorted(file_index):
+            new_object = self.build_indexed_object(
+                parent=new_package,
+                path=root,
+                group_name=group_name,
+                parts=file_index.pop(group_name)
+            )
+            new_package.objects.remove(new_object)
+            yield new_object
+
     @staticmethod
     def filter_only_access_files(item: "os.DirEntry[str]") -> bool:
         """Filter item so that only an access file will return True."""
@@ -92,43 +137,162 @@ class NonEASBuilder(AbsCollectionBuilder):
             self,
             files: Iterable["os.DirEntry[str]"]
     ) -> Dict[str, List["os.DirEntry[str]"]]:
-        """Sort packages by group."""
-        def key(item: "os.DirEntry[str]") -> str:
-            regex_match = self.grouper_regex.match(item.name)
-            if regex_match is not None:
-                return regex_match.groupdict()['group']
-            return ""
-
-        return {
-            group_key: list(
-                file for file in files
-            ) for (group_key, files) in itertools.groupby(files, key=key)
-        }
+        """Sort packages by group.
+
+        .. versionchanged:: 0.2.16
+            Files of the same group no longer need to be next to each other
+            to be grouped together.
+        """
+        groups: Dict[str, List["os.DirEntry[str]"]] = {}
+        for file in files:
+            regex_match = self.grouper_regex.match(file.name)
+            group_key = \
+                regex_match.groupdict()['group'] \
+                if regex_match is not None else ""
+            groups.setdefault(group_key, []).append(file)
+        return groups
 
     @staticmethod
-    def locate_files_access(path: str) -> 'Iterable[os.DirEntry[str]]':
-        """Locate access files."""
-        return filter(NonEASBuilder.filter_only_access_files, os.scandir(path))
+    def locate_files_access(
+            path: str,
+            scandir: typing.Optional[Scandir] = None
+    ) -> 'Iterable[os.DirEntry[str]]':
+        """Locate access files.
+
+        .. versionchanged:: 0.2.16
+            Added scandir argument, used to list the path. Defaults to
+            os.scandir.
+        """
+        return filter(NonEASBuilder.filter_only_access_files,
+                      (scandir or os.scandir)(path))
 
     @staticmethod
     def locate_files_preservation(
-            path: str
+            path: str,
+            scandir: typing.Optional[Scandir] = None
     ) -> 'Iterable[os.DirEntry[str]]':
-        """Locate preservation files."""
-        return os.scandir(path)
+        """Locate preservation files.
 
-    def build_package(self, parent: Batch, path: str, *_, **__: str) -> None:
+        .. versionchanged:: 0.2.16
+            Added scandir argument, used to list the path. Defaults to
+            os.scandir.
+        """
+        return (scandir or os.scandir)(path)
 
-        access_path = os.path.join(path, "access")
+    def build_package(self, parent: Batch, path: str, *_, **__: str) -> None:
+        """Build package.
 
+        .. versionchanged:: 0.2.16
+            The access and preservation directories are read only once and
+            the objects are built from the resulting index.
+        """
         new_package = Package(path, parent=parent)
-        grouped_access_files = self.group_packages(
-            self.locate_files_access(access_path)
-        )
-        for group_name in grouped_access_files.keys():
-            self.build_object(parent=new_package,
-                              path=path,
-                              group_name=group_name)
+        file_index = self.build_file_index(path)
+        for group_name in sorted(file_index):
+            self.build_indexed_object(
+                parent=new_package,
+                path=path,
+                group_name=group_name,
+                parts=file_index[group_name]
+            )
+
+    def build_file_index(self, path: str) -> FileIndex:
+        """Read the access and preservation directories into an index.
+
+        Each file name is matched only once.
+
+        Args:
+            path: root of the package containing access and preservation
+
+        Returns:
+            Mapping of group to part to category to the files of that
+            category. Only parts with an access file are included.
+
+        """
+        file_index: FileIndex = {}
+        preservation_files: \
+            List[typing.Tuple[Dict[str, str], "os.DirEntry[str]"]] = []
+
+        for category, files in [
+            (
+                InstantiationTypes.ACCESS,
+                self.locate_files_access(os.path.join(path, "access"),
+                                         scandir=self.scandir)
+            ),
+            (
+                InstantiationTypes.PRESERVATION,
+                self.locate_files_preservation(
+                    os.path.join(path, "preservation"),
+                    scandir=self.scandir
+                )
+            ),
+        ]:
+            for item in filter(self.filter_nonsystem_files_only, files):
+                match_result = self.grouper_regex.match(
+                    typing.cast(str, item.name)
+                )
+                if match_result is None:
+                    raise AttributeError(
+                        f"{item.path} does not match expected file structure"
+                    )
+                file_naming_parts = match_result.groupdict()
+                if category == InstantiationTypes.ACCESS:
+                    file_index.setdefault(
+                        file_naming_parts['group'], {}
+                    ).setdefault(
+                        file_naming_parts['part'], {}
+                    ).setdefault(category, []).append(item)
+                else:
+                    preservation_files.append((file_naming_parts, item))
+
+        for file_naming_parts, item in preservation_files:
+            instances = file_index.get(
+                file_naming_parts['group'], {}
+            ).get(file_naming_parts['part'])
+
+            if instances is None:
+                continue
+            instances.setdefault(
+                InstantiationTypes.PRESERVATION, []
+            ).append(item)
+
+        return file_index
+
+    def build_indexed_object(
+            self,
+            parent: Package,
+            path: str,
+            group_name: str,
+            parts: Dict[str, PartIndex]
+    ) -> PackageObject:
+        """Build an object from the files found by build_file_index.
+
+        Args:
+            parent: Package the new object belongs to
+            path: root of the package containing access and preservation
+            group_name: id of the object
+            parts: Mapping of part to category to files for the group
+
+        Returns:
+            The new object
+
+        """
+        new_object = PackageObject(parent=parent)
+        new_object.component_metadata[Metadata.ID] = group_name
+        for item_id in sorted(parts):
+            new_item = Item(parent=new_object)
+            new_item.component_metadata[Metadata.ITEM_NAME] = item_id
+            new_item.component_metadata[Metadata.PATH] = path
+            instances = parts[item_id]
+            for item in itertools.chain(
+                    instances.get(InstantiationTypes.ACCESS, []),
+                    instances.get(InstantiationTypes.PRESERVATION, [])
+            ):
+                self.build_instance(new_item,
+                                    path=typing.cast(str, item.path),
+                                    filename=typing.cast(str, item.name)
+                                    )
+        return new_object
 
     def build_instance(self, parent: Item, path: str, filename: str, *_,
                        **__) -> None:
@@ -183,8 +347,12 @@ class NonEASBuilder(AbsCollectionBuilder):
                     self.filter_nonsystem_files_only,
                     itertools.chain.from_iterable(
                         [
-                            self.locate_files_access(access_path),
-                            self.locate_files_preservation(preservation_path)
+                            self.locate_files_access(
+                                access_path, scandir=self.scandir
+                            ),
+                            self.locate_files_preservation(
+                                preservation_path, scandir=self.scandir
+                            )
                         ])
                 ):
             match_result = self.grouper_regex.match(
@@ -232,7 +400,8 @@ class NonEASBuilder(AbsCollectionBuilder):
                         self.filter_file_is_item_of,
                         group_id=kwargs['group_name']
                     ),
-                    self.locate_files_access(access_dir)
+                    self.locate_files_access(access_dir,
+                                             scandir=self.scandir)
                 )):
 
             match_result = self.grouper_regex.match(item_file.name)
@@ -272,9 +441,22 @@ class CatalogedNonEAS(AbsPackageBuilder):
             MMSID2-002.tif
     """
 
-    def locate_packages(self, path: str) -> typing.Iterator[Package]:
-        """Locate packages found at a given path."""
-        package_builder = CatalogedNonEASBuilder()
+    def locate_packages(
+            self,
+            path: str
+    ) -> typing.Iterator[AbsPackageComponent]:
+        """Locate packages found at a given path.
+
+        .. versionchanged:: 0.2.16
+            If streaming is set, each package is yielded as soon as it is
+                located.
+        """
+        package_builder = CatalogedNonEASBuilder(
+            filesystem=self.filesystem
+        )
+        if self.streaming:
+            yield from package_builder.iter_objects(path)
+            return
         yield from package_builder.build_batch(path)
 
     def transform(self, package: Package, dest: str) -> None:
@@ -0,0 +1,299 @@
+"""Persistent cache of directory listings.
+
+Locating packages reads every directory of a batch. When the same staging
+tree is searched many times, most of those directories have not changed
+since the last time. A :py:class:`ScanCache` wraps the file system the
+packages are located on. It stores the listing of each directory it reads
+together with the directory's modification time and inode, and serves
+the listing of a directory that has not changed from the cache instead of
+reading it again.
+
+The names of the files inside zip files are cached the same way, keyed by
+the size and modification time of the zip file, so the central directory
+of a large zip file is only read again when the zip file changes.
+
+.. versionadded:: 0.2.16
+
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import typing
+from typing import Iterable, List, Optional, Tuple
+
+from .filesystem import \
+    AbsFileSystem, \
+    DirectoryEntry, \
+    LocalFileSystem, \
+    DIRECTORY, \
+    FILE, \
+    OTHER
+
+__all__ = ["ScanCache", "CachedDirEntry"]
+
+# Directories modified this recently may still be changing within the
+# resolution of their timestamp, so their listings are not stored.
+RACY_WINDOW_NS = 2_000_000_000
+
+# Increased whenever the tables change. Listings stored by another version
+# are dropped, since they can always be read again.
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+DROP TABLE IF EXISTS directories;
+DROP TABLE IF EXISTS archives;
+CREATE TABLE directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    entries TEXT NOT NULL
+);
+CREATE TABLE archives (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    members TEXT NOT NULL
+)
+"""
+
+
+CachedDirEntry = DirectoryEntry
+"""Directory entry read from a :py:class:`ScanCache`."""
+
+
+class ScanCache(AbsFileSystem):
+    """Directory listings of another file system stored in SQLite.
+
+    A listing is served from the cache only if the directory still has the
+    same modification time and inode as when it was read, so adding,
+    removing or renaming a file in it causes it to be read again. Changes
+    made inside of a subdirectory do not affect the listing of its parent.
+    Anything else, such as checking if a file exists, is passed on to the
+    file system the cache wraps. Listings of a file system that does not
+    provide :py:meth:`~AbsFileSystem.stat` are never cached.
+
+    The cache can be shared by threads. Use it as a context manager, or call
+    :py:meth:`close`, to make sure the listings are saved.
+
+    Attributes:
+        filesystem: File system the listings are read from
+        hits: Number of listings served from the cache
+        misses: Number of directories and zip files read from the file
+            system
+
+    .. versionadded:: 0.2.16
+
+    """
+
+    commit_interval = 500
+
+    def __init__(self,
+                 database: str = ":memory:",
+                 filesystem: Optional[AbsFileSystem] = None) -> None:
+        """Open a scan cache.
+
+        Args:
+            database: Path to the SQLite file used to store the listings. It
+                is created if it doesn't exist. By default, the listings are
+                only kept in memory.
+            filesystem: File system the listings are read from. Defaults to
+                the local file system.
+        """
+        self.database = database
+        self.filesystem: AbsFileSystem = \
+            LocalFileSystem() if filesystem is None else filesystem
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._connection: Optional[sqlite3.Connection] = \
+            sqlite3.connect(database, check_same_thread=False)
+        version, = self._connection.execute(
+            "PRAGMA user_version"
+        ).fetchone()
+        if version != _SCHEMA_VERSION:
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(
+                f"PRAGMA user_version = {_SCHEMA_VERSION}"
+            )
+            self._connection.commit()
+
+    def scandir(self, path: str) -> Iterable["os.DirEntry[str]"]:
+        """List the entries of a directory.
+
+        Args:
+            path: Path of the directory
+
+        Returns:
+            Entries of the directory, with paths joined to the path given,
+            the same as os.scandir.
+
+        """
+        try:
+            stat_result = self.filesystem.stat(path)
+        except NotImplementedError:
+            return self.filesystem.scandir(path)
+        key = os.path.abspath(path)
+
+        cached = self._get(key, stat_result)
+        if cached is None:
+            listing = self._read_directory(path)
+            with self._lock:
+                self.misses += 1
+            if time.time_ns() - stat_result.st_mtime_ns > RACY_WINDOW_NS:
+                self._store(key, stat_result, listing)
+        return typing.cast(List["os.DirEntry[str]"], [
+            CachedDirEntry(path, name, kind)
+            for name, kind in (listing if cached is None else cached)
+        ])
+
+    def exists(self, path: str) -> bool:
+        """Check if a file or directory exists on the file system."""
+        return self.filesystem.exists(path)
+
+    def stat(self, path: str) -> os.stat_result:
+        """Get the status of a file or directory on the file system."""
+        return self.filesystem.stat(path)
+
+    def list_archive(self, path: str) -> List[str]:
+        """List the names of the files inside a zip file.
+
+        Args:
+            path: Path of the zip file
+
+        Returns:
+            Names of the members of the zip file that are not directories,
+            in the order of its central directory.
+
+        .. versionadded:: 0.2.16
+        """
+        try:
+            stat_result = self.filesystem.stat(path)
+        except NotImplementedError:
+            return self.filesystem.list_archive(path)
+        key = os.path.abspath(path)
+        with self._lock:
+            row = self._get_connection().execute(
+                "SELECT size, mtime_ns, members FROM archives WHERE path = ?",
+                (key,)
+            ).fetchone()
+            if row is not None and \
+                    row[0] == stat_result.st_size and \
+                    row[1] == stat_result.st_mtime_ns:
+                self.hits += 1
+                return json.loads(row[2])
+
+        members = self.filesystem.list_archive(path)
+        with self._lock:
+            self.misses += 1
+            if time.time_ns() - stat_result.st_mtime_ns > RACY_WINDOW_NS:
+                connection = self._get_connection()
+                connection.execute(
+                    "INSERT OR REPLACE INTO archives "
+                    "(path, size, mtime_ns, members) VALUES (?, ?, ?, ?)",
+                    (key,
+                     stat_result.st_size,
+                     stat_result.st_mtime_ns,
+                     json.dumps(members, separators=(",", ":")))
+                )
+                self._pending += 1
+                if self._pending >= self.commit_interval:
+                    connection.commit()
+                    self._pending = 0
+        return members
+
+    def _get(self, key: str,
+             stat_result: os.stat_result) -> Optional[List[List[str]]]:
+        with self._lock:
+            row = self._get_connection().execute(
+                "SELECT mtime_ns, inode, entries "
+                "FROM directories WHERE path = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            mtime_ns, inode, entries = row
+            if mtime_ns != stat_result.st_mtime_ns or \
+                    inode != stat_result.st_ino:
+                return None
+            self.hits += 1
+            return json.loads(entries)
+
+    def _store(self, key: str,
+               stat_result: os.stat_result,
+               listing: List[Tuple[str, str]]) -> None:
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO directories "
+                "(path, mtime_ns, inode, entries) "
+                "VALUES (?, ?, ?, ?)",
+                (key,
+                 stat_result.st_mtime_ns,
+                 stat_result.st_ino,
+                 json.dumps(listing, separators=(",", ":")))
+            )
+            self._pending += 1
+            if self._pending >= self.commit_interval:
+                connection.commit()
+                self._pending = 0
+
+    def _read_directory(self, path: str) -> List[Tuple[str, str]]:
+        listing = []
+        for entry in self.filesystem.scandir(path):
+            if entry.is_dir():
+                kind = DIRECTORY
+            elif entry.is_file():
+                kind = FILE
+            else:
+                kind = OTHER
+            listing.append((entry.name, kind))
+        return listing
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise ValueError("Scan cache is closed")
+        return self._connection
+
+    def flush(self) -> None:
+        """Save the listings read since the last time they were saved."""
+        with self._lock:
+            self._get_connection().commit()
+            self._pending = 0
+
+    def clear(self) -> None:
+        """Remove every listing from the cache."""
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("DELETE FROM directories")
+            connection.execute("DELETE FROM archives")
+            connection.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        """Save the listings and close the database."""
+        with self._lock:
+            if self._connection is None:
+                return
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> "ScanCache":
+        """Use the cache as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the cache, saving the listings."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Get the number of directory and zip file listings cached."""
+        with self._lock:
+            row = self._get_connection().execute(
+                "SELECT (SELECT COUNT(*) FROM directories) + "
+                "(SELECT COUNT(*) FROM archives)"
+            ).fetchone()
+        return row[0]
@@ -0,0 +1,279 @@
+"""Save located packages and load them again without rescanning.
+
+The components are written as JSON lines, one component on each line,
+parents before their children. Each line records the type of the component,
+its parent, its component_metadata and, depending on the type, its path,
+files and sidecar files. Metadata inherited from the parents is not written
+but rebuilt from them when the components are loaded.
+
+Examples:
+    >>> import io
+    >>> from uiucprescon.packager.common import Metadata
+    >>> batch = Package("batch")
+    >>> package_object = PackageObject(parent=batch)
+    >>> package_object.component_metadata[Metadata.ID] = "000001"
+    >>> stream = io.StringIO()
+    >>> dump([package_object], stream)
+    >>> _ = stream.seek(0)
+    >>> loaded = load(stream)
+    >>> loaded[0].metadata[Metadata.ID]
+    '000001'
+    >>> loaded[0].parent.path
+    'batch'
+
+.. versionadded:: 0.2.16
+
+"""
+import itertools
+import json
+from typing import \
+    Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple, Type, cast
+
+from uiucprescon.packager.common import \
+    CollectionEnums, InstantiationTypes, Metadata, PackageTypes
+from .collection import \
+    AbsPackageComponent, \
+    Batch, \
+    Instantiation, \
+    Item, \
+    Package, \
+    PackageObject
+
+__all__ = ["dump", "iter_load", "load", "FORMAT_NAME", "FORMAT_VERSION"]
+
+FORMAT_NAME = "uiucprescon.packager.components"
+FORMAT_VERSION = 1
+
+_COMPONENT_TYPES: Dict[str, Type[AbsPackageComponent]] = {
+    "Batch": Batch,
+    "Package": Package,
+    "PackageObject": PackageObject,
+    "Item": Item,
+    "Instantiation": Instantiation,
+}
+
+_ENUM_TYPES: Dict[str, Type[CollectionEnums]] = {
+    enum_type.__name__: enum_type
+    for enum_type in [PackageTypes, InstantiationTypes]
+}
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, CollectionEnums):
+        return {"enum": type(value).__name__, "value": value.value}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Unable to serialize {type(value).__name__} values")
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _ENUM_TYPES[value["enum"]](value["value"])
+    return value
+
+
+def _encode_component(component: AbsPackageComponent,
+                      component_id: int,
+                      parent_id: Optional[int]) -> Dict[str, Any]:
+    type_name = type(component).__name__
+    if _COMPONENT_TYPES.get(type_name) is not type(component):
+        raise TypeError(f"Unable to serialize {type_name} components")
+
+    record: Dict[str, Any] = {
+        "id": component_id,
+        "type": type_name,
+        "parent": parent_id,
+        "metadata": {},
+    }
+    for key, value in component.component_metadata.items():
+        try:
+            record["metadata"][key.value] = _encode_value(value)
+        except TypeError as error:
+            raise TypeError(
+                f"Unable to serialize the {key.value} metadata of a "
+                f"{type_name}, {value!r}: {error}"
+            ) from error
+    if isinstance(component, (Batch, Package)):
+        record["path"] = component.path
+    if isinstance(component, Package):
+        record["unidentified_objects"] = \
+            [list(other) for other in component.unidentified_objects]
+    if isinstance(component, PackageObject):
+        record["package_files"] = list(component.package_files)
+    if isinstance(component, Instantiation):
+        record["category"] = component.category.value
+        # pylint: disable=protected-access
+        record["files"] = list(component._files)
+        record["sidecar_files"] = list(component.sidecar_files)
+    return record
+
+
+def _decode_component(
+        record: Dict[str, Any],
+        parent: Optional[AbsPackageComponent]
+) -> AbsPackageComponent:
+    type_name = record["type"]
+    component: AbsPackageComponent
+    if type_name == "Batch":
+        component = Batch(path=record.get("path"), parent=parent)
+    elif type_name == "Package":
+        package = Package(path=record.get("path"), parent=parent)
+        package.unidentified_objects.extend(
+            (name, kind)
+            for name, kind in record.get("unidentified_objects", [])
+        )
+        component = package
+    elif type_name == "PackageObject":
+        component = PackageObject(parent=cast(Optional[Package], parent))
+        component.package_files.extend(record.get("package_files", []))
+    elif type_name == "Item":
+        component = Item(parent=cast(Optional[PackageObject], parent))
+    elif type_name == "Instantiation":
+        component = Instantiation(
+            category=InstantiationTypes(record["category"]),
+            parent=cast(Optional[Item], parent),
+            files=list(record.get("files", []))
+        )
+        component.sidecar_files.extend(record.get("sidecar_files", []))
+    else:
+        raise ValueError(f"Unknown component type {type_name}")
+
+    component.component_metadata.update(
+        (Metadata(key), _decode_value(value))
+        for key, value in record["metadata"].items()
+    )
+    return component
+
+
+def _iter_subtree(
+        component: AbsPackageComponent
+) -> Iterator[AbsPackageComponent]:
+    stack = [component]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(list(current.children)))
+
+
+def dump(components: Iterable[AbsPackageComponent], stream: IO[str]) -> None:
+    """Write components and everything they contain to a stream.
+
+    Components can be written one after another as they are located. Their
+    parents are written once, before the first component that belongs to
+    them.
+
+    Args:
+        components: Components to write, such as the packages yielded by
+            locate_packages
+        stream: Text stream the JSON lines are written to
+
+    """
+    # The ancestors are kept referenced so their ids are not reused by
+    # components created after they were written.
+    ancestor_ids: Dict[int, Tuple[int, AbsPackageComponent]] = {}
+    counter = itertools.count()
+
+    def write(record: Dict[str, Any]) -> None:
+        stream.write(json.dumps(record, separators=(",", ":")))
+        stream.write("\n")
+
+    def write_component(component: AbsPackageComponent,
+                        written: Dict[int, Tuple[int, AbsPackageComponent]]
+                        ) -> int:
+        parent_id = None
+        if component.parent is not None:
+            parent_id = (written.get(id(component.parent)) or
+                         ancestor_ids[id(component.parent)])[0]
+        component_id = next(counter)
+        written[id(component)] = (component_id, component)
+        write(_encode_component(component, component_id, parent_id))
+        return component_id
+
+    write({"format": FORMAT_NAME, "version": FORMAT_VERSION})
+    for component in components:
+        ancestors = []
+        parent = component.parent
+        while parent is not None and id(parent) not in ancestor_ids:
+            ancestors.append(parent)
+            parent = parent.parent
+        for ancestor in reversed(ancestors):
+            write_component(ancestor, ancestor_ids)
+
+        subtree: Dict[int, Tuple[int, AbsPackageComponent]] = {}
+        root_id = None
+        for descendant in _iter_subtree(component):
+            component_id = write_component(descendant, subtree)
+            if root_id is None:
+                root_id = component_id
+        write({"end": root_id})
+
+
+def _detach(component: AbsPackageComponent) -> None:
+    parent = component.parent
+    if parent is None:
+        return
+    if isinstance(component, Instantiation) and isinstance(parent, Item):
+        del parent.instantiations[component.category]
+    else:
+        parent.children.remove(component)
+
+
+def iter_load(stream: IO[str],
+              detach: bool = False) -> Iterator[AbsPackageComponent]:
+    """Load the components written by dump one at a time.
+
+    Each component is yielded as soon as every line of it has been read, so
+    the rest of the stream is not read until it is needed.
+
+    Args:
+        stream: Text stream of the JSON lines written by dump
+        detach: If True, each component yielded is removed from its parent,
+            so components that were already processed can be freed. By
+            default, they stay children of their parent as they were when
+            they were written.
+
+    Yields:
+        Components in the order they were written
+
+    """
+    header = json.loads(stream.readline() or "{}")
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError("Stream does not contain serialized components")
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported serialization version {header.get('version')}"
+        )
+
+    loaded: Dict[int, AbsPackageComponent] = {}
+    for line in stream:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "end" in record:
+            component = loaded[record["end"]]
+            # The lines of a component come after the lines of its
+            # ancestors, which are all that the following components need.
+            for component_id in [key for key in loaded
+                                 if key >= record["end"]]:
+                del loaded[component_id]
+            if detach:
+                _detach(component)
+            yield component
+            continue
+        parent_id = record["parent"]
+        parent = None if parent_id is None else loaded[parent_id]
+        loaded[record["id"]] = _decode_component(record, parent)
+
+
+def load(stream: IO[str]) -> List[AbsPackageComponent]:
+    """Load every component written by dump.
+
+    Args:
+        stream: Text stream of the JSON lines written by dump
+
+    Returns:
+        Components in the order they were written, with their parents
+        rebuilt the same as they were.
+
+    """
+    return list(iter_load(stream))
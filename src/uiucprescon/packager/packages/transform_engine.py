@@ -0,0 +1,470 @@
+"""Transform the items of a package concurrently.
+
+Converting an item runs an external encoder which spends most of its time
+outside of Python, so items can be transformed on a pool of threads or of
+processes. :py:func:`run_item_transforms` keeps only a bounded number of
+items queued on the pool, collects the errors of each item instead of
+stopping at the first one, and emits the log messages of each item together
+and in the same order as if the items were transformed one at a time.
+Within an item, a :py:class:`StageGraph` runs the stages that do not depend
+on each other at the same time, on a second, small pool of threads that
+only runs stages.
+
+.. versionadded:: 0.2.16
+
+"""
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
+import logging
+import threading
+from typing import \
+    Callable, Dict, Generic, Iterable, Iterator, List, Optional, Set, Tuple, \
+    TypeVar
+
+from uiucprescon.packager.common import Metadata
+from uiucprescon.packager.errors import TransformError
+from .collection import Item
+from .item_task import ItemTask
+from .zip_session import ZipSession
+
+__all__ = ["run_item_transforms", "StageGraph", "EXECUTORS"]
+
+EXECUTORS = ("thread", "process")
+
+LOGGER_NAME = "uiucprescon.packager"
+
+T = TypeVar("T")
+ItemResult = Tuple[List[logging.LogRecord], Optional[BaseException]]
+
+_capture = threading.local()
+
+_stage_pool: "contextvars.ContextVar[Optional[concurrent.futures.Executor]]" \
+    = contextvars.ContextVar("packager_stage_pool", default=None)
+
+
+def _is_capturing() -> bool:
+    return getattr(_capture, "records", None) is not None
+
+
+class _HoldBackFilter(logging.Filter):  # pylint: disable=R0903
+    """Keep held back records away from the handlers of the package logger."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not _is_capturing()
+
+
+class _CaptureHandler(logging.Handler):
+    """Hold back the records logged while an item is transformed.
+
+    While items are transformed on a pool, the handler is added to the
+    package logger, which stops propagating records. Every record of the
+    package loggers reaches it, including the ones propagated from loggers
+    created later. A record logged by the thread of an item is added to the
+    records of the item. Any other record is passed on to the handlers of
+    the parent loggers, as if the package logger still propagated it.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.users = 0
+        self.propagate = True
+        self.hold_back = _HoldBackFilter()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Called by every thread that logs, so the lock of the handler is
+        # not taken
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not _is_capturing():
+            self._propagate(record)
+            return
+        _capture.records.append(record)
+        # The handlers after this one are called with the record next, so
+        # the ones added since the last record have to be told to skip it
+        for handler in logging.getLogger(LOGGER_NAME).handlers:
+            if handler is not self:
+                handler.addFilter(self.hold_back)
+
+    def _propagate(self, record: logging.LogRecord) -> None:
+        logger = logging.getLogger(LOGGER_NAME)
+        current = logger.parent if self.propagate else None
+        found = len(logger.handlers) - 1
+        while current is not None:
+            for handler in current.handlers:
+                found += 1
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            current = current.parent if current.propagate else None
+        if found == 0 and logging.lastResort is not None and \
+                record.levelno >= logging.lastResort.level:
+            logging.lastResort.handle(record)
+
+
+_capture_handler = _CaptureHandler()
+_capture_lock = threading.Lock()
+
+
+def _start_capturing() -> None:
+    with _capture_lock:
+        _capture_handler.users += 1
+        if _capture_handler.users > 1:
+            return
+        logger = logging.getLogger(LOGGER_NAME)
+        _capture_handler.propagate = logger.propagate
+        logger.handlers.insert(0, _capture_handler)
+        logger.propagate = False
+
+
+def _stop_capturing() -> None:
+    # Only the handler and filter added for capturing are removed, handlers
+    # added in the meantime are kept
+    with _capture_lock:
+        _capture_handler.users -= 1
+        if _capture_handler.users > 0:
+            return
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.removeHandler(_capture_handler)
+        for handler in logger.handlers:
+            handler.removeFilter(_capture_handler.hold_back)
+        logger.propagate = _capture_handler.propagate
+
+
+@contextlib.contextmanager
+def _capturing() -> Iterator[None]:
+    _start_capturing()
+    try:
+        yield
+    finally:
+        _stop_capturing()
+
+
+def _emit(record: logging.LogRecord) -> None:
+    if _is_capturing():
+        # Records of a stage, which belong to the item running the stages
+        _capture.records.append(record)
+        return
+    logging.getLogger(record.name).handle(record)
+
+
+@contextlib.contextmanager
+def _running_stages_on(
+        pool: Optional[concurrent.futures.Executor]
+) -> Iterator[None]:
+    token = _stage_pool.set(pool)
+    try:
+        yield
+    finally:
+        _stage_pool.reset(token)
+
+
+_worker_capturing = threading.Event()
+
+
+def _install_worker_capture() -> None:
+    # Worker processes belong to the pool and stay alive for the whole pool,
+    # so they keep capturing until they exit
+    if not _worker_capturing.is_set():
+        _worker_capturing.set()
+        _start_capturing()
+
+
+def _make_picklable(record: logging.LogRecord) -> logging.LogRecord:
+    record.msg = record.getMessage()
+    record.args = None
+    if record.exc_info:
+        record.exc_text = logging.Formatter().formatException(
+            record.exc_info
+        )
+        record.exc_info = None
+    return record
+
+
+def _run_captured(function: Callable[[], None]) -> ItemResult:
+    previous = getattr(_capture, "records", None)
+    records: List[logging.LogRecord] = []
+    _capture.records = records
+    error: Optional[BaseException] = None
+    try:
+        function()
+    except Exception as exc:  # pylint: disable=broad-except
+        error = exc
+    finally:
+        _capture.records = previous
+    return records, error
+
+
+def _run_item(transform_item: Callable[[T], None],
+              item: T,
+              in_process: bool = False) -> ItemResult:
+    if not in_process:
+        return _run_captured(functools.partial(transform_item, item))
+    _install_worker_capture()
+    # Files a task extracts from zip files are removed before the worker
+    # picks up its next task.
+    with ZipSession():
+        records, error = \
+            _run_captured(functools.partial(transform_item, item))
+    return [_make_picklable(record) for record in records], error
+
+
+def _describe(item: object) -> Tuple[str, str]:
+    if isinstance(item, ItemTask):
+        return item.object_id, item.item_name
+    if isinstance(item, Item):
+        metadata = item.metadata
+        return (str(metadata.get(Metadata.ID, "")),
+                str(metadata.get(Metadata.ITEM_NAME, "")))
+    return "", str(item)
+
+
+class _ItemResults(Generic[T]):
+    """Results of the items on a pool, handled in the order of the items."""
+
+    def __init__(self,
+                 finish_item: Optional[Callable[[T], None]] = None) -> None:
+        self.finish_item = finish_item
+        self.failures: List[Tuple[str, str, BaseException]] = []
+        self._queued: Dict[int, T] = {}
+        self._finished: Dict[int, ItemResult] = {}
+        self._indexes: Dict[concurrent.futures.Future, int] = {}
+        self._next_to_emit = 0
+
+    def add(self, future: concurrent.futures.Future, item: T) -> None:
+        """Add the future of the next item."""
+        index = self._next_to_emit + len(self._queued)
+        self._queued[index] = item
+        self._indexes[future] = index
+
+    def collect(self, done: Iterable[concurrent.futures.Future]) -> None:
+        """Keep the results of futures and handle the ones now in order."""
+        for future in done:
+            index = self._indexes.pop(future)
+            try:
+                self._finished[index] = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                # The worker itself failed, such as an item that could not
+                # be pickled
+                self._finished[index] = ([], error)
+        self._emit_finished()
+
+    def _emit_finished(self) -> None:
+        while self._next_to_emit in self._finished:
+            records, error = self._finished.pop(self._next_to_emit)
+            item = self._queued.pop(self._next_to_emit)
+            for record in records:
+                _emit(record)
+            if error is None and self.finish_item is not None:
+                try:
+                    self.finish_item(item)
+                except Exception as exc:  # pylint: disable=broad-except
+                    error = exc
+            if error is not None:
+                object_id, item_name = _describe(item)
+                self.failures.append((object_id, item_name, error))
+            self._next_to_emit += 1
+
+
+def run_item_transforms(
+        items: Iterable[T],
+        transform_item: Callable[[T], None],
+        max_workers: Optional[int] = None,
+        executor: str = "thread",
+        finish_item: Optional[Callable[[T], None]] = None
+) -> None:
+    """Call transform_item with each item, on a pool if max_workers > 1.
+
+    If max_workers is None or less than 2, the items are transformed one at
+    a time on the current thread and the first error is raised as it is.
+
+    Otherwise every item is transformed, even if some fail, and a
+    TransformError with the error of each item that failed is raised at the
+    end. At most twice max_workers items are queued on the pool at a time.
+    The records logged by the package loggers while an item is transformed
+    are held back, and emitted in the order of the items once every item
+    before it has finished.
+
+    Args:
+        items: Items, or ItemTasks describing them, to transform
+        transform_item: Function transforming a single item. With a process
+            executor, it must be picklable, and so must the items. Sending
+            ItemTasks instead of items avoids pickling the whole batch that
+            an item belongs to.
+        max_workers: Number of items transformed at the same time
+        executor: Either "thread" or "process"
+        finish_item: Called on the current thread with each item that was
+            transformed without errors, in the order of the items, such as
+            to add the files of the item to a zip file
+
+    Raises:
+        TransformError: if any item failed while using a pool
+
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f"Unknown executor {executor}. "
+            f"Expected one of {', '.join(EXECUTORS)}"
+        )
+    if max_workers is None or max_workers < 2:
+        for item in items:
+            transform_item(item)
+            if finish_item is not None:
+                finish_item(item)
+        return
+
+    in_process = executor == "process"
+    pool: concurrent.futures.Executor = \
+        concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) \
+        if in_process else \
+        concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    results = _ItemResults(finish_item)
+    pending: Set[concurrent.futures.Future] = set()
+
+    # The item pool is kept full of queued items, so the stages of an item
+    # are run on a pool of their own, see StageGraph. Its threads are only
+    # started once a stage is submitted.
+    stage_pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    with _capturing(), stage_pool, pool, \
+            _running_stages_on(None if in_process else stage_pool):
+        for item in items:
+            if in_process:
+                future = pool.submit(_run_item, transform_item, item, True)
+            else:
+                future = pool.submit(
+                    contextvars.copy_context().run,
+                    _run_item, transform_item, item
+                )
+            results.add(future, item)
+            pending.add(future)
+            if len(pending) >= max_workers * 2:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                results.collect(done)
+        results.collect(concurrent.futures.wait(pending).done)
+
+    if results.failures:
+        raise TransformError(results.failures)
+
+
+class StageGraph:
+    """Stages of transforming a single item and the order they depend on.
+
+    A stage only waits for the stages it was added after. When the item is
+    transformed on a thread pool by :py:func:`run_item_transforms`,
+    independent stages run at the same time, on a pool of threads that
+    only runs stages and has as many threads as the item pool. Otherwise,
+    or on a process pool, the stages run one at a time in the order they were
+    added.
+
+    Either way, the records logged by each stage are emitted in the order
+    the stages were added, and the error of the first stage that failed is
+    raised once the stages already started have finished. Stages that
+    depend on a failed stage, or that were not started yet, are skipped.
+
+    Examples:
+        >>> order = []
+        >>> stages = StageGraph()
+        >>> stages.add("copy", lambda: order.append("copy"))
+        >>> stages.add("encode", lambda: order.append("encode"))
+        >>> stages.add("check", lambda: order.append("check"),
+        ...            after=["copy", "encode"])
+        >>> stages.run()
+        >>> order
+        ['copy', 'encode', 'check']
+
+    .. versionadded:: 0.2.16
+    """
+
+    def __init__(self) -> None:
+        """Create a graph without any stages."""
+        self._stages: Dict[str, Tuple[Callable[[], None], Tuple[str, ...]]] \
+            = {}
+
+    def add(self,
+            name: str,
+            stage: Callable[[], None],
+            after: Iterable[str] = ()) -> None:
+        """Add a stage.
+
+        Args:
+            name: Name of the stage, unique within the graph
+            stage: Function running the stage
+            after: Names of the stages that have to finish first. They have
+                to be added before this one, so the graph has no cycles.
+
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage {name} was already added")
+        dependencies = tuple(after)
+        for dependency in dependencies:
+            if dependency not in self._stages:
+                raise ValueError(
+                    f"Stage {name} depends on {dependency}, which has not "
+                    f"been added"
+                )
+        self._stages[name] = (stage, dependencies)
+
+    def __len__(self) -> int:
+        """Get the number of stages."""
+        return len(self._stages)
+
+    def run(self) -> None:
+        """Run every stage, in parallel where the graph allows it."""
+        pool = _stage_pool.get()
+        if pool is None:
+            for stage, _ in self._stages.values():
+                stage()
+            return
+
+        results: Dict[str, ItemResult] = {}
+        while True:
+            failed = any(error is not None for _, error in results.values())
+            ready = [
+                name for name, (_, dependencies) in self._stages.items()
+                if name not in results and
+                all(dependency in results for dependency in dependencies)
+            ]
+            if failed or not ready:
+                break
+            self._run_ready(pool, ready, results)
+
+        first_error: Optional[BaseException] = None
+        for name in self._stages:
+            if name not in results:
+                continue
+            records, error = results[name]
+            for record in records:
+                _emit(record)
+            if first_error is None:
+                first_error = error
+        if first_error is not None:
+            raise first_error
+
+    def _run_ready(self,
+                   pool: concurrent.futures.Executor,
+                   ready: List[str],
+                   results: Dict[str, ItemResult]) -> None:
+        # Run the first ready stage on this thread and let the stage pool
+        # pick up the others. Stages the pool has not started by the time
+        # this one finishes are run here as well, before waiting on the ones
+        # it did start, so an item never waits on a pool whose threads are
+        # all busy with the stages of other items.
+        futures = {
+            name: pool.submit(
+                contextvars.copy_context().run,
+                _run_captured, self._stages[name][0]
+            )
+            for name in ready[1:]
+        }
+        results[ready[0]] = _run_captured(self._stages[ready[0]][0])
+        for name, future in futures.items():
+            if future.cancel():
+                results[name] = _run_captured(self._stages[name][0])
+        for name, future in futures.items():
+            if name not in results:
+                results[name] = future.result()
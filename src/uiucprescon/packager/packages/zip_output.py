@@ -0,0 +1,350 @@
+"""Write the files of a transformed package straight into a zip file.
+
+HathiTrust submissions are zip files. Instead of writing loose files and
+zipping them afterwards, package types that support it write each file
+into a :py:class:`ZipPackageWriter` as it is copied or generated, so every
+byte is only written once.
+
+When the items of a package are transformed at the same time, each item
+adds its files to a :py:class:`StagedZipMembers` instead, and they are moved
+into the zip file once every item before it is done, so the files are in the
+same order as when the items are transformed one at a time.
+
+Examples:
+    >>> import io
+    >>> import os
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as dest:
+    ...     with ZipPackageWriter(os.path.join(dest, "000001.zip")) as writer:
+    ...         writer.add_stream(io.BytesIO(b"jp2"), "00000001.jp2")
+    ...     os.listdir(dest)
+    ['000001.zip']
+
+.. versionadded:: 0.2.16
+
+"""
+import contextlib
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+import typing
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from uiucprescon.packager.common import Metadata
+
+if typing.TYPE_CHECKING:
+    from .collection import AbsPackageComponent
+
+__all__ = [
+    "ZipPackageWriter",
+    "ZipPackageWriters",
+    "StagedZipMembers",
+    "ZipMemberWriter",
+    "ZIP_COMPRESSION",
+    "get_compression",
+]
+
+ZIP_COMPRESSION = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED,
+}
+
+
+def get_compression(name: str) -> int:
+    """Get the zipfile compression constant of a compression name."""
+    try:
+        return ZIP_COMPRESSION[name]
+    except KeyError as error:
+        raise ValueError(
+            f"Unknown zip compression {name}. "
+            f"Expected one of {', '.join(ZIP_COMPRESSION)}"
+        ) from error
+
+
+class ZipPackageWriter:
+    """Zip file that the files of a package are written into.
+
+    The zip file is written to a temporary name next to its final path and
+    only renamed to it once it is closed without errors, so an incomplete
+    zip file is never mistaken for a finished one.
+
+    .. versionadded:: 0.2.16
+    """
+
+    def __init__(self, path: str, compression: str = "deflated") -> None:
+        """Create a new zip file.
+
+        Args:
+            path: Path of the zip file to create. Its directory is created
+                if it does not exist.
+            compression: Either "stored" or "deflated"
+        """
+        self.path = path
+        self.names: List[str] = []
+        self._partial_path = f"{path}.partial"
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Closed by close or discard, which the with block calls
+        # pylint: disable-next=consider-using-with
+        self._zip_file: Optional[zipfile.ZipFile] = zipfile.ZipFile(
+            self._partial_path, "w", compression=get_compression(compression)
+        )
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ZipPackageWriter":
+        """Use the zip file as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Finish the zip file, or remove it if the block raised."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def _get_zip_file(self) -> zipfile.ZipFile:
+        if self._zip_file is None:
+            raise ValueError(f"{self.path} is already closed")
+        return self._zip_file
+
+    def add_file(self, source: str, arcname: str) -> None:
+        """Copy a file into the zip file.
+
+        Args:
+            source: Path to the file to copy
+            arcname: Name of the file inside the zip file
+
+        """
+        with self._lock:
+            self._get_zip_file().write(source, arcname=arcname)
+            self.names.append(arcname)
+
+    def add_stream(self, source: BinaryIO, arcname: str) -> None:
+        """Copy the content of a binary stream into the zip file.
+
+        Args:
+            source: Stream to read
+            arcname: Name of the file inside the zip file
+
+        """
+        with self._lock:
+            zip_file = self._get_zip_file()
+            with zip_file.open(arcname, "w", force_zip64=True) as output:
+                shutil.copyfileobj(source, output)
+            self.names.append(arcname)
+
+    @contextlib.contextmanager
+    def add_generated(self, arcname: str) -> Iterator[str]:
+        """Add a file created by a tool that can only write to a path.
+
+        Yields a scratch path with the same name as the file in the zip
+        file. Whatever is written to it is added to the zip file once the
+        ``with`` block finishes, and the scratch file is removed.
+
+        Args:
+            arcname: Name of the file inside the zip file
+
+        Yields:
+            Path to write the file to
+
+        """
+        with tempfile.TemporaryDirectory(prefix="packager-") as scratch:
+            scratch_path = os.path.join(scratch, os.path.basename(arcname))
+            yield scratch_path
+            self.add_file(scratch_path, arcname)
+
+    def close(self) -> None:
+        """Finish the zip file and move it to its final path."""
+        with self._lock:
+            if self._zip_file is None:
+                return
+            self._zip_file.close()
+            self._zip_file = None
+            os.replace(self._partial_path, self.path)
+
+    def discard(self) -> None:
+        """Stop writing and remove the incomplete zip file."""
+        with self._lock:
+            if self._zip_file is None:
+                return
+            self._zip_file.close()
+            self._zip_file = None
+            os.remove(self._partial_path)
+
+
+class StagedZipMembers:
+    """Files of a single item, kept aside until they are added in order.
+
+    Has the same methods to add files as :py:class:`ZipPackageWriter`.
+    Files added by path and generated files stay where they are, and
+    streams are copied to scratch space, until :py:meth:`commit` adds them
+    to the zip file.
+
+    .. versionadded:: 0.2.16
+    """
+
+    def __init__(self, writer: ZipPackageWriter) -> None:
+        """Keep the files of an item for a zip file.
+
+        Args:
+            writer: Zip file that the files are added to when committed
+        """
+        self.writer = writer
+        self.path = writer.path
+        self._members: List[Tuple[str, str]] = []
+        self._scratch: Optional[tempfile.TemporaryDirectory] = None
+
+    def _get_scratch(self) -> str:
+        if self._scratch is None:
+            # Removed by discard, once the files are in the zip file
+            # pylint: disable-next=consider-using-with
+            self._scratch = tempfile.TemporaryDirectory(prefix="packager-")
+        return os.path.join(self._scratch.name, str(len(self._members)))
+
+    def add_file(self, source: str, arcname: str) -> None:
+        """Add a file to the zip file once committed.
+
+        Args:
+            source: Path to the file to copy. It has to exist until the
+                files are committed.
+            arcname: Name of the file inside the zip file
+
+        """
+        self._members.append((source, arcname))
+
+    def add_stream(self, source: BinaryIO, arcname: str) -> None:
+        """Copy the content of a binary stream to scratch space.
+
+        Args:
+            source: Stream to read
+            arcname: Name of the file inside the zip file
+
+        """
+        scratch_path = self._get_scratch()
+        with open(scratch_path, "wb") as output:
+            shutil.copyfileobj(source, output)
+        self.add_file(scratch_path, arcname)
+
+    @contextlib.contextmanager
+    def add_generated(self, arcname: str) -> Iterator[str]:
+        """Add a file created by a tool that can only write to a path.
+
+        Args:
+            arcname: Name of the file inside the zip file
+
+        Yields:
+            Path to write the file to
+
+        """
+        scratch_path = self._get_scratch()
+        os.mkdir(scratch_path)
+        scratch_path = os.path.join(scratch_path, os.path.basename(arcname))
+        yield scratch_path
+        self.add_file(scratch_path, arcname)
+
+    def commit(self) -> None:
+        """Add the files to the zip file, in the order they were added."""
+        try:
+            for source, arcname in self._members:
+                self.writer.add_file(source, arcname)
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        """Forget the files and remove the scratch space."""
+        self._members = []
+        if self._scratch is not None:
+            self._scratch.cleanup()
+            self._scratch = None
+
+
+ZipMemberWriter = Union[ZipPackageWriter, StagedZipMembers]
+"""Where the files of an item are written, directly or staged.
+
+.. versionadded:: 0.2.16
+"""
+
+
+class ZipPackageWriters:
+    """Zip file for each object of a package, created when first needed.
+
+    Used as a context manager. When the ``with`` block finishes, every zip
+    file is closed, or removed if the block raised an exception.
+
+    .. versionadded:: 0.2.16
+    """
+
+    def __init__(self,
+                 dest: str,
+                 compression: str = "deflated",
+                 staged: bool = False) -> None:
+        """Write zip files into a directory.
+
+        Args:
+            dest: Directory the zip files are written into
+            compression: Either "stored" or "deflated"
+            staged: If True, :py:meth:`get_item_writer` keeps the files of
+                each item aside until :py:meth:`commit` is called with it.
+                Used when items are transformed at the same time.
+        """
+        get_compression(compression)
+        self.dest = dest
+        self.compression = compression
+        self.staged = staged
+        self._writers: Dict[str, ZipPackageWriter] = {}
+        self._staged: Dict[int, StagedZipMembers] = {}
+        self._lock = threading.Lock()
+
+    def get_writer(self,
+                   component: "AbsPackageComponent") -> ZipPackageWriter:
+        """Get the zip file of the object that a component belongs to.
+
+        The zip file is named after the ID metadata of the component.
+        """
+        object_name = typing.cast(str, component.metadata[Metadata.ID])
+        with self._lock:
+            writer = self._writers.get(object_name)
+            if writer is None:
+                writer = self._writers[object_name] = ZipPackageWriter(
+                    os.path.join(self.dest, f"{object_name}.zip"),
+                    self.compression
+                )
+            return writer
+
+    def get_item_writer(self, item: "AbsPackageComponent") -> ZipMemberWriter:
+        """Get where the files of an item are written.
+
+        That is the zip file of its object, or if staged is set, the files
+        kept aside for the item until it is committed.
+        """
+        writer = self.get_writer(item)
+        if not self.staged:
+            return writer
+        staged = StagedZipMembers(writer)
+        with self._lock:
+            self._staged[id(item)] = staged
+        return staged
+
+    def commit(self, item: "AbsPackageComponent") -> None:
+        """Add the files kept aside for an item to the zip file.
+
+        Does nothing if staged is not set.
+        """
+        with self._lock:
+            staged = self._staged.pop(id(item), None)
+        if staged is not None:
+            staged.commit()
+
+    def __enter__(self) -> "ZipPackageWriters":
+        """Use the zip files as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Finish every zip file, or remove them if the block raised."""
+        for staged in self._staged.values():
+            staged.discard()
+        self._staged.clear()
+        for writer in self._writers.values():
+            writer.__exit__(exc_type, exc_value, traceback)
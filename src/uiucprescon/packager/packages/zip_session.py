@@ -0,0 +1,447 @@
+"""Reuse open zip files and their extracted files.
+
+Packages such as HathiLimitedView keep their files inside a zip file. A
+:py:class:`ZipSession` keeps the most recently used zip files open, so the
+central directory of each one is only read once, and extracts their files
+into a single scratch directory that is removed when the session is
+cleaned up.
+
+Sessions can be used as a context manager. While the ``with`` block is
+running, the session is used by
+:py:meth:`~uiucprescon.packager.packages.collection.Instantiation.get_files`
+whenever no session is given to it. Outside any ``with`` block, each call
+to get_files extracts its files into its own scratch directory, which is
+removed once the iteration is finished.
+
+Examples:
+    >>> import io
+    >>> import zipfile
+    >>> data = io.BytesIO()
+    >>> with zipfile.ZipFile(data, "w") as archive:
+    ...     archive.writestr("000001/00000001.jp2", b"jp2")
+    >>> with ZipSession() as session:
+    ...     extracted = session.extract(data, "000001/00000001.jp2")
+    ...     session.stats.files_extracted
+    1
+
+.. versionadded:: 0.2.16
+
+"""
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
+import os
+import shutil
+import threading
+import time
+from tempfile import TemporaryDirectory
+from typing import \
+    IO, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union, \
+    OrderedDict
+from zipfile import ZipFile, ZipInfo
+
+__all__ = [
+    "ExtractionReport",
+    "ZipSession",
+    "ZipSessionStats",
+    "current_session",
+]
+
+ArchiveSource = Union[str, "os.PathLike[str]", IO[bytes]]
+
+
+class ZipSessionStats(NamedTuple):
+    """Work done by a :py:class:`ZipSession`."""
+
+    archives_opened: int
+    archives_reused: int
+    files_extracted: int
+    bytes_extracted: int
+    files_opened: int
+
+
+class ExtractionReport(NamedTuple):
+    """Files extracted at once and how long it took.
+
+    Attributes:
+        files: Paths to the extracted files, in the order requested
+        bytes_extracted: Uncompressed size of the files that were extracted
+        seconds: Time taken to extract the files
+
+    .. versionadded:: 0.2.16
+    """
+
+    files: List[str]
+    bytes_extracted: int
+    seconds: float
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """Throughput of the extraction, in megabytes (10^6) per second."""
+        if self.seconds <= 0:
+            return 0.0
+        return self.bytes_extracted / 1_000_000 / self.seconds
+
+
+class ZipSession:
+    """Open zip files and files extracted from them, shared between calls.
+
+    .. versionadded:: 0.2.16
+    """
+
+    def __init__(self,
+                 max_open_archives: int = 8,
+                 extract_dir: Optional[str] = None) -> None:
+        """Create a new session.
+
+        Args:
+            max_open_archives: Number of zip files kept open. The least
+                recently used zip file is closed when another is needed.
+            extract_dir: Directory to extract files into. Defaults to a new
+                temporary directory, created the first time a file is
+                extracted.
+        """
+        if max_open_archives < 1:
+            raise ValueError("max_open_archives must be at least 1")
+        self.max_open_archives = max_open_archives
+        self._extract_root = extract_dir
+        self._temp_dir: Optional[TemporaryDirectory] = None
+        self._archives: OrderedDict[object, ZipFile] = \
+            collections.OrderedDict()
+        self._archive_dirs: Dict[object, str] = {}
+        self._extracted: Dict[Tuple[object, str], str] = {}
+        self._extracting: \
+            Dict[Tuple[object, str], concurrent.futures.Future] = {}
+        self._in_use: Dict[object, int] = {}
+        self._lock = threading.RLock()
+        self._tokens: "list[contextvars.Token]" = []
+        self._archives_opened = 0
+        self._archives_reused = 0
+        self._files_extracted = 0
+        self._bytes_extracted = 0
+        self._files_opened = 0
+
+    def __enter__(self) -> "ZipSession":
+        """Use the session for get_files until the block is finished."""
+        self._tokens.append(_active_session.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Stop using the session and clean it up."""
+        _active_session.reset(self._tokens.pop())
+        self.cleanup()
+
+    @property
+    def extract_dir(self) -> str:
+        """Directory that files are extracted into."""
+        with self._lock:
+            if self._extract_root is not None:
+                return self._extract_root
+            if self._temp_dir is None:
+                # Removed by cleanup, not at the end of a with block
+                # pylint: disable-next=consider-using-with
+                self._temp_dir = TemporaryDirectory(prefix="packager-zip-")
+            return self._temp_dir.name
+
+    @property
+    def stats(self) -> ZipSessionStats:
+        """Number of zip files opened and of files extracted or opened."""
+        with self._lock:
+            return ZipSessionStats(
+                archives_opened=self._archives_opened,
+                archives_reused=self._archives_reused,
+                files_extracted=self._files_extracted,
+                bytes_extracted=self._bytes_extracted,
+                files_opened=self._files_opened,
+            )
+
+    @staticmethod
+    def _key(archive: ArchiveSource) -> object:
+        if hasattr(archive, "read"):
+            return archive
+        return os.path.abspath(os.fspath(archive))
+
+    def open_archive(self, archive: ArchiveSource) -> ZipFile:
+        """Get the open zip file, opening it if it is not open already.
+
+        Args:
+            archive: Path to a zip file or a binary stream of one
+
+        Returns:
+            Zip file that stays open until the session is cleaned up or it
+            becomes the least recently used of more than max_open_archives.
+            A zip file that a file is being extracted from is only closed
+            once the extraction is done.
+
+        """
+        key = self._key(archive)
+        with self._lock:
+            zip_file = self._archives.get(key)
+            if zip_file is not None:
+                self._archives.move_to_end(key)
+                self._archives_reused += 1
+                return zip_file
+            # Closed once it is the least recently used or by cleanup
+            # pylint: disable-next=consider-using-with
+            zip_file = ZipFile(archive)
+            self._archives[key] = zip_file
+            self._archives_opened += 1
+            for oldest in list(self._archives):
+                if len(self._archives) <= self.max_open_archives:
+                    break
+                if oldest != key and oldest not in self._in_use:
+                    self._archives.pop(oldest).close()
+            return zip_file
+
+    def extract(self, archive: ArchiveSource, member: str) -> str:
+        """Extract a file from a zip file, unless it was already extracted.
+
+        The file is written without holding the lock of the session, so
+        other threads can use the session at the same time. A thread asking
+        for a file that another thread is extracting waits for it instead.
+
+        Args:
+            archive: Path to a zip file or a binary stream of one
+            member: Name of the file inside the zip file
+
+        Returns:
+            Path to the extracted file
+
+        Raises:
+            KeyError: if the zip file has no member with the name given
+
+        """
+        key = self._key(archive)
+        with self._lock:
+            extracted = self._extracted_path(key, member)
+            if extracted is not None:
+                return extracted
+            zip_file = self.open_archive(archive)
+            infos, waiting = self._claim(key, zip_file, [member])
+            archive_dir = self._archive_dir(key)
+            if not waiting:
+                self._in_use[key] = self._in_use.get(key, 0) + 1
+        if waiting:
+            return waiting[0].result()
+
+        try:
+            extracted = _extract_member(zip_file, infos[member], archive_dir)
+        except BaseException as error:
+            self._finish(key, infos, {}, error)
+            raise
+        finally:
+            with self._lock:
+                self._in_use[key] -= 1
+                if not self._in_use[key]:
+                    del self._in_use[key]
+        self._finish(key, infos, {member: extracted})
+        return extracted
+
+    def _extracted_path(self, key: object, member: str) -> Optional[str]:
+        extracted = self._extracted.get((key, member))
+        if extracted is not None and os.path.exists(extracted):
+            return extracted
+        return None
+
+    def _claim(
+            self,
+            key: object,
+            zip_file: ZipFile,
+            members: Iterable[str]
+    ) -> Tuple[Dict[str, ZipInfo], List[concurrent.futures.Future]]:
+        """Mark the members that are not extracted yet as being extracted.
+
+        Must be called with the lock held. Returns the members the caller
+        has to extract, and the pending extractions of the members that
+        other threads are already extracting.
+        """
+        infos: Dict[str, ZipInfo] = {}
+        waiting: List[concurrent.futures.Future] = []
+        for member in members:
+            pending = self._extracting.get((key, member))
+            if pending is not None:
+                waiting.append(pending)
+            elif self._extracted_path(key, member) is None:
+                try:
+                    infos[member] = zip_file.getinfo(member)
+                except KeyError as error:
+                    raise KeyError(member) from error
+        for member in infos:
+            self._extracting[(key, member)] = concurrent.futures.Future()
+        return infos, waiting
+
+    def _finish(self,
+                key: object,
+                infos: Dict[str, ZipInfo],
+                paths: Dict[str, str],
+                error: Optional[BaseException] = None) -> None:
+        """Record the members claimed, or the error extracting them.
+
+        Threads waiting for the members get the same path or error.
+        """
+        with self._lock:
+            for member in infos:
+                pending = self._extracting.pop((key, member))
+                if error is not None:
+                    pending.set_exception(error)
+                    continue
+                self._extracted[(key, member)] = paths[member]
+                pending.set_result(paths[member])
+            if error is None:
+                self._files_extracted += len(paths)
+                self._bytes_extracted += \
+                    sum(info.file_size for info in infos.values())
+
+    def _archive_dir(self, key: object) -> str:
+        with self._lock:
+            archive_dir = self._archive_dirs.get(key)
+            if archive_dir is None:
+                archive_dir = self._archive_dirs[key] = os.path.join(
+                    self.extract_dir, str(len(self._archive_dirs))
+                )
+            return archive_dir
+
+    def extract_many(self,
+                     archive: Union[str, "os.PathLike[str]"],
+                     members: Iterable[str],
+                     max_workers: Optional[int] = None) -> ExtractionReport:
+        """Extract many files from a zip file, on a pool of threads.
+
+        Each thread reads the zip file with its own handle, so the threads
+        decompress and write files at the same time. Files already
+        extracted by the session are not extracted again.
+
+        Args:
+            archive: Path to a zip file
+            members: Names of the files inside the zip file
+            max_workers: Number of threads. If None or less than 2, the files
+                are extracted on the current thread.
+
+        Returns:
+            Paths to the extracted files and the throughput of the
+            extraction
+
+        Raises:
+            KeyError: with the name of the first file that the zip file does
+                not have
+
+        .. versionadded:: 0.2.16
+        """
+        started = time.perf_counter()
+        key = self._key(archive)
+        members = list(members)
+        with self._lock:
+            infos, waiting = \
+                self._claim(key, self.open_archive(archive), members)
+            archive_dir = self._archive_dir(key)
+
+        try:
+            paths = _extract_members(archive, infos, archive_dir, max_workers)
+        except BaseException as error:
+            self._finish(key, infos, {}, error)
+            raise
+        self._finish(key, infos, paths)
+        for pending in waiting:
+            pending.result()
+
+        with self._lock:
+            files = [self._extracted[(key, member)] for member in members]
+        return ExtractionReport(
+            files=files,
+            bytes_extracted=sum(info.file_size for info in infos.values()),
+            seconds=time.perf_counter() - started,
+        )
+
+    def open(self, archive: ArchiveSource, member: str) -> IO[bytes]:
+        """Open a file inside a zip file for reading, without extracting it.
+
+        The stream stays readable even if the zip file is closed by the
+        session before the stream is.
+
+        Args:
+            archive: Path to a zip file or a binary stream of one
+            member: Name of the file inside the zip file
+
+        Returns:
+            Binary stream of the uncompressed content of the file
+
+        Raises:
+            KeyError: if the zip file has no member with the name given
+
+        """
+        with self._lock:
+            stream = self.open_archive(archive).open(member)
+            self._files_opened += 1
+            return stream
+
+    def close_archives(self) -> None:
+        """Close every open zip file but keep the extracted files."""
+        with self._lock:
+            while self._archives:
+                _, zip_file = self._archives.popitem()
+                zip_file.close()
+
+    def cleanup(self) -> None:
+        """Close every open zip file and remove the extracted files.
+
+        The session can still be used afterwards.
+        """
+        with self._lock:
+            self.close_archives()
+            if self._temp_dir is not None:
+                self._temp_dir.cleanup()
+                self._temp_dir = None
+            else:
+                for archive_dir in self._archive_dirs.values():
+                    shutil.rmtree(archive_dir, ignore_errors=True)
+            self._archive_dirs.clear()
+            self._extracted.clear()
+
+
+def _extract_member(zip_file: ZipFile, info: ZipInfo, path: str) -> str:
+    try:
+        return zip_file.extract(info, path=path)
+    except FileExistsError:
+        # Another thread created the same parent directory between ZipFile
+        # checking for it and creating it.
+        return zip_file.extract(info, path=path)
+
+
+def _extract_members(archive: Union[str, "os.PathLike[str]"],
+                     infos: Dict[str, ZipInfo],
+                     path: str,
+                     max_workers: Optional[int]) -> Dict[str, str]:
+    handles = threading.local()
+    handles_lock = threading.Lock()
+    with contextlib.ExitStack() as stack:
+
+        def extract_one(info: ZipInfo) -> str:
+            zip_file = getattr(handles, "zip_file", None)
+            if zip_file is None:
+                with handles_lock:
+                    zip_file = handles.zip_file = \
+                        stack.enter_context(ZipFile(archive))
+            return _extract_member(zip_file, info, path)
+
+        if max_workers is None or max_workers < 2 or len(infos) < 2:
+            return dict(zip(infos, map(extract_one, infos.values())))
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers) as executor:
+            return dict(
+                zip(infos, executor.map(extract_one, infos.values()))
+            )
+
+
+_active_session: "contextvars.ContextVar[Optional[ZipSession]]" = \
+    contextvars.ContextVar("zip_session", default=None)
+
+
+def current_session() -> Optional[ZipSession]:
+    """Get the session of the innermost ``with ZipSession()`` block.
+
+    Returns:
+        The session, or None outside any ``with`` block
+
+    """
+    return _active_session.get()
@@ -4,7 +4,7 @@ import abc
 import logging
 import os
 import shutil
-from typing import Optional
+from typing import BinaryIO, Optional
 from py3exiv2bind.core import set_dpi
 try:
     import pykdu_compress
@@ -60,6 +60,16 @@ class CopyFile(AbsTransformation):
         """Copy the file from the source to the destination without changes."""
         return shutil.copy(source, destination)
 
+    @staticmethod
+    def copy_stream(source: BinaryIO, destination: str) -> str:
+        """Write the content of a binary stream to the destination.
+
+        .. versionadded:: 0.2.16
+        """
+        with open(destination, "wb") as output:
+            shutil.copyfileobj(source, output)
+        return destination
+
 
 class ConvertTiff(AbsTransformation):
     """ConvertTiff."""
@@ -8,6 +8,7 @@ from uiucprescon.packager import Metadata
 from uiucprescon.packager.packages import \
     collection, \
     capture_one_package, \
+    filesystem, \
     CaptureOnePackage, \
     DigitalLibraryCompound
 import pytest
@@ -392,7 +393,8 @@ class TestTransform:
                 list_of_tiff_files
             )
 
-            def locate_tiff_instances(_, path, is_it_an_instance):
+            def locate_tiff_instances(_, path, is_it_an_instance,
+                                      scandir=None):
                 return [os.path.join(path, "access", file_name)]
 
             monkeypatch.setattr(
@@ -517,3 +519,105 @@ def test_grouper_regex_builder_invalid_throws_on_build(part_delimiter,
     regex_builder.volume_delimiter = volume_delimiter
     with pytest.raises(ValueError):
         regex_builder.build()
+
+
+@pytest.mark.parametrize("number_of_groups, parts_per_group", [
+    (1, 10),
+    (10, 10),
+    (20, 50),
+])
+def test_build_batch_scales_linearly(
+        tmpdir, monkeypatch, number_of_groups, parts_per_group
+):
+    # Each file name should be parsed once and the session folder scanned once
+    # no matter how many groups and parts are in the session.
+    for group_id in range(number_of_groups):
+        for part_id in range(parts_per_group):
+            (tmpdir / f"{str(group_id).zfill(6)}_"
+                      f"{str(part_id).zfill(8)}.tif").ensure()
+
+    builder = capture_one_package.CaptureOneBuilder()
+    splitter = Mock(wraps=capture_one_package.underscore_splitter)
+    builder.splitter = splitter
+    scandir = Mock(wraps=os.scandir)
+    monkeypatch.setattr(capture_one_package.os, "scandir", scandir)
+
+    batch = builder.build_batch(tmpdir.strpath)
+
+    number_of_files = number_of_groups * parts_per_group
+    assert len(batch) == number_of_groups
+    assert sum(len(obj) for obj in batch) == number_of_files
+    assert splitter.call_count == number_of_files
+    assert scandir.call_count == 1
+
+
+def test_get_splitter_compiles_once():
+    assert capture_one_package.get_splitter('-', '_') is \
+           capture_one_package.get_splitter('-', '_')
+
+
+def test_splitter_cache_hits():
+    splitter = capture_one_package.FileNameSplitter(
+        capture_one_package.compile_grouper_regex('_')
+    )
+    for _ in range(3):
+        splitter("000001_00000001.tif")
+    splitter("000001_00000002.tif")
+    info = splitter.cache_info()
+    assert info.hits == 2 and info.misses == 2
+
+
+def test_splitter_cache_is_bounded():
+    splitter = capture_one_package.FileNameSplitter(
+        capture_one_package.compile_grouper_regex('_'),
+        cache_size=2
+    )
+    for part in range(5):
+        splitter(f"000001_{str(part).zfill(8)}.tif")
+    assert splitter.cache_info().currsize == 2
+
+
+def test_splitter_result_is_a_copy():
+    splitter = capture_one_package.get_splitter('_')
+    splitter("000001_00000001.tif")['group'] = "spam"
+    assert splitter("000001_00000001.tif")['group'] == "000001"
+
+
+@pytest.mark.parametrize("file_name, expected_group, expected_part", [
+    ("000001+00000001.tif", "000001", "00000001"),
+    ("000001+00000002.jp2", "000001", "00000002"),
+])
+def test_delimiter_splitter(file_name, expected_group, expected_part):
+    result = capture_one_package.delimiter_splitter(file_name, "+")
+    assert result['group'] == expected_group and \
+           result['part'] == expected_part
+
+
+def test_streaming_locate_packages(capture_one_fixture):
+    source = os.path.join(capture_one_fixture, CAPTURE_ONE_BATCH_NAME)
+    factory = packager.PackageFactory(CaptureOnePackage())
+
+    streamed = factory.locate_packages(path=source, streaming=True)
+    first = next(streamed)
+    assert first.metadata[Metadata.ID] == "000001"
+    assert len(first) == 3
+    assert len(first.parent) == 0
+    assert [p.metadata[Metadata.ID] for p in streamed] == ["000002"]
+
+
+def test_locate_packages_leaves_package_builder_alone(capture_one_fixture):
+    source = os.path.join(capture_one_fixture, CAPTURE_ONE_BATCH_NAME)
+    package_type = CaptureOnePackage()
+    files = filesystem.InMemoryFileSystem(
+        os.path.join(source, name)
+        for name in ["000003_00000001.tif", "000003_00000002.tif"]
+    )
+    factory = packager.PackageFactory(package_type)
+    in_memory = factory.locate_packages(source, filesystem=files,
+                                        streaming=True)
+    first = next(in_memory)
+    assert package_type.package_builder.filesystem is not files
+    local = list(factory.locate_packages(source, streaming=True))
+    assert first.metadata[Metadata.ID] == "000003"
+    assert len(first) == 2
+    assert [p.metadata[Metadata.ID] for p in local] == ["000001", "000002"]
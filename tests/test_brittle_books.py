@@ -1,4 +1,4 @@
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, call
 
 import pytest
 
@@ -48,3 +48,51 @@ def test_build_bb_batch(tmpdir, monkeypatch):
         x = collection_builder.build_bb_batch("./somepath")
     assert len(x) == 10
 
+
+
+@pytest.fixture
+def brittle_books_batch(tmpdir):
+    batch = tmpdir.mkdir("batch")
+    package_dir = batch.mkdir("1234567")
+    for page in range(1, 21):
+        stem = str(page).zfill(8)
+        (package_dir / f"{stem}.jp2").ensure()
+        (package_dir / f"{stem}.txt").ensure()
+    return batch.strpath, package_dir.strpath
+
+
+@pytest.mark.parametrize("builder_class", [
+    collection_builder.BrittleBooksBuilder,
+    collection_builder.DSBuilder,
+])
+def test_builder_reads_directory_once(
+        brittle_books_batch, monkeypatch, builder_class
+):
+    batch_dir, package_dir = brittle_books_batch
+    scandir = Mock(wraps=os.scandir)
+    monkeypatch.setattr(collection_builder.os, "scandir", scandir)
+
+    batch = builder_class().build_batch(batch_dir)
+
+    assert scandir.call_args_list.count(call(package_dir)) == 1
+    package_object = batch[0]
+    assert len(package_object) == 20
+    access = package_object[0].instantiations[
+        collection_builder.InstantiationTypes.ACCESS
+    ]
+    assert sorted(access.get_files()) == [
+        os.path.join(package_dir, "00000001.jp2"),
+        os.path.join(package_dir, "00000001.txt"),
+    ]
+
+
+@pytest.mark.filterwarnings("ignore:Use BrittleBooksBuilder")
+def test_build_bb_batch_files(brittle_books_batch):
+    batch_dir, package_dir = brittle_books_batch
+    batch = collection_builder.build_bb_batch(batch_dir)
+    item = batch[0][0]
+    access = item.instantiations[collection_builder.InstantiationTypes.ACCESS]
+    assert sorted(access.get_files()) == [
+        os.path.join(package_dir, "00000001.jp2"),
+        os.path.join(package_dir, "00000001.txt"),
+    ]
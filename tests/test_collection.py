@@ -1,3 +1,8 @@
+import collections
+import os
+import pickle
+import timeit
+import tracemalloc
 from unittest.mock import Mock, MagicMock
 
 import pytest
@@ -42,3 +47,281 @@ class TestInstantiation:
             files=["somefile.txt"]
         )
         assert isinstance(access, collection.Instantiation)
+
+    @pytest.mark.parametrize("files", [
+        [os.path.join("batch", "000001", "00000001.jp2"),
+         os.path.join("batch", "000001", "00000001.tif")],
+        [os.path.join("batch", "access", "00000001.jp2"),
+         os.path.join("batch", "preservation", "00000001.tif")],
+        ["00000001.jp2"],
+        [],
+    ])
+    def test_files_are_kept_exactly(self, files):
+        access = collection.Instantiation(files=list(files))
+        assert access._files == files
+
+    def test_sidecar_files_can_be_added(self):
+        access = collection.Instantiation()
+        access.sidecar_files.append("00000001.txt")
+        assert access.sidecar_files == ["00000001.txt"]
+
+
+def test_metadata_is_inherited_from_parents():
+    package_object = collection.PackageObject()
+    item = collection.Item(parent=package_object)
+    package_object.component_metadata[Metadata.ID] = "000001"
+    item.component_metadata[Metadata.ITEM_NAME] = "00000001"
+    assert item.metadata == {
+        Metadata.ID: "000001",
+        Metadata.ITEM_NAME: "00000001",
+    }
+    assert item._metadata[Metadata.ID] == "000001"
+
+
+def build_pages(number_of_objects, pages_per_object):
+    batch = collection.Package(os.path.join("staging", "batch"))
+    for object_id in range(number_of_objects):
+        package_object = collection.PackageObject(parent=batch)
+        package_object.component_metadata[Metadata.ID] = f"{object_id:06d}"
+        path = os.path.join("staging", "batch", f"{object_id:06d}")
+        package_object.component_metadata[Metadata.PATH] = path
+        for page in range(pages_per_object):
+            item = collection.Item(parent=package_object)
+            item.component_metadata[Metadata.ITEM_NAME] = f"{page:08d}"
+            collection.Instantiation(
+                category=collection.InstantiationTypes.ACCESS,
+                parent=item,
+                files=[os.path.join(path, f"{page:08d}.jp2")]
+            )
+    return batch
+
+
+def test_memory_per_page():
+    # Each page used about 1.9 kB before components used __slots__ and
+    # stopped copying the metadata of their parents.
+    tracemalloc.start()
+    try:
+        batch = build_pages(number_of_objects=20, pages_per_object=500)
+        used, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(batch) == 20
+    assert used / 10_000 < 1400
+    assert not hasattr(batch[0][0], "__dict__")
+
+
+class TestInstantiationFiles:
+    def test_append_to_files(self):
+        instantiation = collection.Instantiation()
+        with pytest.warns(DeprecationWarning):
+            instantiation.files.append(os.path.join("access", "1.jp2"))
+        with pytest.warns(DeprecationWarning):
+            instantiation.files.append(os.path.join("access", "2.jp2"))
+        with pytest.warns(DeprecationWarning):
+            assert instantiation.files == [
+                os.path.join("access", "1.jp2"),
+                os.path.join("access", "2.jp2"),
+            ]
+
+    def test_append_from_another_directory(self):
+        instantiation = collection.Instantiation(
+            files=[os.path.join("access", "1.jp2")]
+        )
+        instantiation._files.append(os.path.join("preservation", "1.tif"))
+        instantiation._files.append("2.tif")
+        assert instantiation._files == [
+            os.path.join("access", "1.jp2"),
+            os.path.join("preservation", "1.tif"),
+            "2.tif",
+        ]
+
+    def test_change_files_in_place(self):
+        instantiation = collection.Instantiation(files=["1.jp2", "2.jp2"])
+        instantiation._files[0] = "0.jp2"
+        instantiation._files.remove("2.jp2")
+        instantiation._files.extend(["3.jp2", "4.jp2"])
+        assert list(instantiation._files) == ["0.jp2", "3.jp2", "4.jp2"]
+        assert len(instantiation._files) == 3
+
+
+class TestMetadataView:
+    @pytest.fixture
+    def item(self):
+        package_object = collection.PackageObject()
+        package_object.component_metadata[Metadata.ID] = "000001"
+        item = collection.Item(parent=package_object)
+        item.component_metadata[Metadata.ITEM_NAME] = "00000001"
+        return item
+
+    def test_lookup_inherited_key(self, item):
+        assert item.metadata[Metadata.ID] == "000001"
+        assert Metadata.ID in item.metadata
+        assert Metadata.PATH not in item.metadata
+        assert item.metadata.get(Metadata.PATH, "default") == "default"
+        with pytest.raises(KeyError):
+            item.metadata[Metadata.PATH]
+
+    def test_view_is_read_only(self, item):
+        with pytest.raises(TypeError):
+            item.metadata[Metadata.ID] = "000002"
+
+    def test_view_sees_parent_changes(self, item):
+        metadata = item.metadata
+        item.parent.component_metadata[Metadata.PATH] = "batch"
+        assert metadata[Metadata.PATH] == "batch"
+
+    def test_view_is_live_but_snapshot_is_not(self, item):
+        # Before 0.2.16 the metadata property returned a copy, which kept
+        # the values from when it was requested.
+        metadata = item.metadata
+        snapshot = metadata.snapshot()
+        item.component_metadata[Metadata.ITEM_NAME] = "00000002"
+        item.parent.component_metadata[Metadata.ID] = "000002"
+        assert dict(metadata) == {
+            Metadata.ID: "000002",
+            Metadata.ITEM_NAME: "00000002",
+        }
+        assert snapshot == {
+            Metadata.ID: "000001",
+            Metadata.ITEM_NAME: "00000001",
+        }
+
+    def test_snapshot_is_a_copy(self, item):
+        snapshot = item.snapshot()
+        snapshot[Metadata.ID] = "000002"
+        assert item.metadata[Metadata.ID] == "000001"
+        assert snapshot == {
+            Metadata.ID: "000002",
+            Metadata.ITEM_NAME: "00000001"
+        }
+
+    def test_lookups_do_not_allocate(self, item):
+        item.metadata[Metadata.ID]
+        tracemalloc.start()
+        try:
+            for _ in range(1000):
+                item.metadata[Metadata.ID]
+                item.metadata[Metadata.ITEM_NAME]
+            used, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert used < 1000
+
+
+    def test_lookup_reads_each_component_once(self, item, monkeypatch):
+        instantiation = collection.Instantiation(parent=item)
+        reads = []
+        get = collection._ComponentMetadata.get
+
+        def counting_get(metadata, key, *args):
+            reads.append(key)
+            return get(metadata, key, *args)
+
+        monkeypatch.setattr(collection._ComponentMetadata, "get",
+                            counting_get)
+        assert instantiation.metadata[Metadata.ID] == "000001"
+        assert reads == [Metadata.ID] * 3
+
+    def test_lookups_are_faster_than_copying(self, item):
+        # Microbenchmark of two inherited lookups on an item, through the
+        # view and through a copy of a ChainMap of the metadata, which is
+        # what the metadata property returned before 0.2.16. Run pytest
+        # with -s to see the rates.
+        chain = collections.ChainMap(item.component_metadata,
+                                     item.parent.metadata.snapshot())
+
+        def view():
+            item.metadata[Metadata.ID]
+            item.metadata[Metadata.ITEM_NAME]
+
+        def copy():
+            dict(chain)[Metadata.ID]
+            dict(chain)[Metadata.ITEM_NAME]
+
+        number = 20_000
+        rates = {
+            name: 2 * number / min(timeit.repeat(lookup, number=number,
+                                                 repeat=5))
+            for name, lookup in [("view", view), ("copy", copy)]
+        }
+        print(", ".join(f"{name}: {rate / 1e6:.2f}M lookups/s"
+                        for name, rate in rates.items()))
+        assert rates["view"] > 2 * rates["copy"]
+
+
+class TestFindComponents:
+    @pytest.fixture
+    def batch(self):
+        return build_pages(number_of_objects=5, pages_per_object=10)
+
+    def test_find_object(self, batch):
+        assert batch.find_object("000003") is batch.objects[3]
+        assert batch.find_object("999999") is None
+
+    def test_find_item(self, batch):
+        package_object = batch.find_object("000002")
+        assert package_object.find_item("00000007") is \
+               package_object.items[7]
+        assert package_object.find_item("99999999") is None
+
+    def test_find_object_added_after_lookup(self, batch):
+        batch.find_object("000001")
+        new_object = collection.PackageObject(parent=batch)
+        new_object.component_metadata[Metadata.ID] = "000005"
+        assert batch.find_object("000005") is new_object
+
+    def test_find_object_after_id_changed(self, batch):
+        batch.find_object("000001")
+        batch.objects[1].component_metadata[Metadata.ID] = "renamed"
+        assert batch.find_object("000001") is None
+        assert batch.find_object("renamed") is batch.objects[1]
+
+    def test_find_object_after_removed(self, batch):
+        batch.find_object("000001")
+        batch.objects.remove(batch.objects[1])
+        assert batch.find_object("000001") is None
+
+    def test_find_item_does_not_compare_every_item(self, batch,
+                                                   monkeypatch):
+        package_object = batch.objects[0]
+        package_object.find_item("00000000")
+        get = Mock(wraps=collection.MetadataView.get)
+        monkeypatch.setattr(collection.MetadataView, "get",
+                            lambda *args: get(*args))
+        assert package_object.find_item("00000005") is \
+               package_object.items[5]
+        assert get.call_count == 0
+
+    def test_missing_item_does_not_compare_every_item(self, batch,
+                                                      monkeypatch):
+        package_object = batch.objects[0]
+        package_object.find_item("00000000")
+        get = Mock(wraps=collection.MetadataView.get)
+        monkeypatch.setattr(collection.MetadataView, "get",
+                            lambda *args: get(*args))
+        for _ in range(100):
+            assert package_object.find_item("99999999") is None
+        assert get.call_count == 0
+
+    def test_find_item_renamed_through_update(self, batch):
+        package_object = batch.objects[0]
+        package_object.find_item("00000000")
+        package_object.items[3].component_metadata.update(
+            {Metadata.ITEM_NAME: "renamed"}
+        )
+        assert package_object.find_item("00000003") is None
+        assert package_object.find_item("renamed") is package_object.items[3]
+
+    def test_first_of_duplicate_ids_is_found(self, batch):
+        batch.find_object("000001")
+        batch.objects[3].component_metadata[Metadata.ID] = "000001"
+        assert batch.find_object("000001") is batch.objects[1]
+        batch.objects[1].component_metadata[Metadata.ID] = "renamed"
+        assert batch.find_object("000001") is batch.objects[3]
+
+    def test_find_after_pickling(self, batch):
+        batch.find_object("000001")
+        copied = pickle.loads(pickle.dumps(batch))
+        assert copied.find_object("000002") is copied.objects[2]
+        copied.objects[2].component_metadata[Metadata.ID] = "renamed"
+        assert copied.find_object("renamed") is copied.objects[2]
@@ -0,0 +1,134 @@
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from uiucprescon import packager
+from uiucprescon.packager.common import Metadata
+from uiucprescon.packager.packages import \
+    collection_builder, filesystem, noneas
+from uiucprescon.packager.packages.hathi_jp2_package import HathiJp2Builder
+
+
+def tree_summary(package):
+    return [
+        (
+            package_object.metadata[Metadata.ID],
+            [
+                (
+                    item.metadata[Metadata.ITEM_NAME],
+                    sorted(
+                        file_
+                        for inst in item
+                        for file_ in inst.get_files()
+                    )
+                ) for item in package_object
+            ]
+        ) for package_object in package
+    ]
+
+
+@pytest.fixture
+def multi_package_batch(tmpdir):
+    batch = tmpdir.mkdir("batch")
+    for package_id in range(8):
+        package_dir = batch.mkdir(str(package_id).zfill(6))
+        access = package_dir.mkdir("access")
+        preservation = package_dir.mkdir("preservation")
+        for page in range(1, 6):
+            stem = str(page).zfill(8)
+            for extension in [".tif", ".jp2", ".txt"]:
+                (package_dir / f"{stem}{extension}").ensure()
+            (access / f"{stem}.jp2").ensure()
+            (preservation / f"{stem}.tif").ensure()
+    return batch.strpath
+
+
+@pytest.mark.parametrize("builder_class", [
+    collection_builder.HathiTiffBuilder,
+    HathiJp2Builder,
+    collection_builder.DigitalLibraryCompoundBuilder,
+    collection_builder.BrittleBooksBuilder,
+])
+def test_parallel_build_batch_matches_serial(
+        multi_package_batch, builder_class
+):
+    serial = builder_class().build_batch(multi_package_batch)
+    parallel = builder_class(max_workers=4).build_batch(multi_package_batch)
+    assert tree_summary(parallel) == tree_summary(serial)
+    assert len(parallel) == 8
+
+
+def test_build_packages_raises_worker_errors(multi_package_batch):
+    builder = collection_builder.HathiTiffBuilder(max_workers=2)
+    builder.build_package = Mock(side_effect=FileNotFoundError)
+    with pytest.raises(FileNotFoundError):
+        builder.build_packages([
+            (Mock(), os.path.join(multi_package_batch, "000000")),
+            (Mock(), os.path.join(multi_package_batch, "000001")),
+        ])
+
+
+def test_package_factory_locate_packages_max_workers(multi_package_batch):
+    package_type = packager.packages.HathiTiff()
+    factory = packager.PackageFactory(package_type)
+    packages = list(
+        factory.locate_packages(multi_package_batch, max_workers=4)
+    )
+    assert len(packages) == 8
+    assert package_type.max_workers is None
+
+
+def in_memory_copy(root):
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        files += [os.path.join(dirpath, name) for name in filenames]
+    return filesystem.InMemoryFileSystem(files)
+
+
+@pytest.mark.parametrize("builder_class", [
+    collection_builder.HathiTiffBuilder,
+    HathiJp2Builder,
+    collection_builder.DigitalLibraryCompoundBuilder,
+    collection_builder.BrittleBooksBuilder,
+])
+def test_in_memory_build_batch_matches_local(
+        multi_package_batch, builder_class
+):
+    local = builder_class().build_batch(multi_package_batch)
+    in_memory = builder_class(
+        filesystem=in_memory_copy(multi_package_batch)
+    ).build_batch(multi_package_batch)
+    assert sorted(tree_summary(in_memory)) == sorted(tree_summary(local))
+
+
+def test_locate_synthetic_batch_in_memory(monkeypatch):
+    monkeypatch.setattr(os, "scandir", Mock(side_effect=AssertionError))
+    batch = os.path.join("synthetic", "batch")
+    files = filesystem.InMemoryFileSystem(
+        os.path.join(batch, str(package_id).zfill(6), f"{page:08d}{ext}")
+        for package_id in range(100)
+        for page in range(1, 51)
+        for ext in [".jp2", ".txt"]
+    )
+    factory = packager.PackageFactory(packager.packages.HathiJp2())
+    packages = list(factory.locate_packages(batch, filesystem=files))
+    assert len(packages) == 100
+    assert all(len(package) == 50 for package in packages)
+
+
+def test_non_eas_build_batch_in_memory(tmpdir, monkeypatch):
+    batch = tmpdir.mkdir("batch")
+    for folder in ["access", "preservation"]:
+        batch.mkdir(folder)
+        for group_id in range(1, 3):
+            for part_id in range(1, 3):
+                file_name = f"0001_{group_id:03d}-{part_id:03d}.tif"
+                (batch / folder / file_name).ensure()
+    local = noneas.ArchivalNonEASBuilder().build_batch(batch.strpath)
+    files = in_memory_copy(batch.strpath)
+    monkeypatch.setattr(os, "scandir", Mock(side_effect=AssertionError))
+    builder = noneas.ArchivalNonEASBuilder(filesystem=files)
+    in_memory = builder.build_batch(batch.strpath)
+    assert sorted(tree_summary(in_memory)) == sorted(tree_summary(local))
+    assert len(in_memory) == 2
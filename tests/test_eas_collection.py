@@ -386,14 +386,10 @@ class TestTransform:
                 locate_files_access
             )
 
+            # build_object builds the items straight from these files, so
+            # they are the paths that the real method yields
             def locate_package_files(_, path):
-                pres_entry = Mock()
-                pres_entry.name = file_name
-                pres_entry.path = os.path.join(path, "preservation")
-                access_entry = Mock()
-                access_entry.name = file_name
-                access_entry.path = os.path.join(path, "access")
-                return [pres_entry, access_entry]
+                return [pathlib.Path(path, file_name)]
 
             monkeypatch.setattr(
                 eas.EASBuilder,
@@ -474,7 +470,89 @@ class TestTransform:
             "transform",
             transform
         )
+        process = Mock()
+        monkeypatch.setattr(
+            packager.packages.digital_library_compound.
+            AbsItemTransformStrategy,
+            "process",
+            process
+        )
+        monkeypatch.setattr(
+            packager.packages.hathi_jp2_package.pathlib.Path,
+            "mkdir",
+            Mock()
+        )
         output_dir = "output"
         factory = packager.PackageFactory(eas.Eas())
         for p in factory.locate_packages(eas_collection(source_file)):
             packager.PackageFactory(package_type()).transform(p, output_dir)
+        destinations = \
+            [c.kwargs['dest'] for c in process.call_args_list] + \
+            [c.args[1] for c in transform.call_args_list]
+
+        assert os.path.join(output_dir, expected_out) in destinations
+
+
+class FakeDirEntry:
+    def __init__(self, path, is_file=True):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._is_file = is_file
+
+    def is_file(self):
+        return self._is_file
+
+    def is_dir(self):
+        return not self._is_file
+
+
+@pytest.mark.parametrize("number_of_files", [1_000, 10_000, 100_000])
+def test_build_batch_scaling(monkeypatch, number_of_files):
+    # The access directory should be scanned once and each file name
+    # matched once when locating files plus once when grouping them.
+    files_per_group = 100
+    root = os.path.join("fake", "batch")
+    access = os.path.join(root, "access")
+    entries = [
+        FakeDirEntry(
+            os.path.join(
+                access,
+                f"{99000000000000000 + i // files_per_group}-"
+                f"{str(i % files_per_group).zfill(8)}.tif"
+            )
+        ) for i in range(number_of_files)
+    ] + [FakeDirEntry(os.path.join(access, "subdir"), is_file=False)]
+
+    real_scandir = os.scandir
+    scandir = Mock(
+        side_effect=lambda path: entries if path == access
+        else real_scandir(path)
+    )
+    monkeypatch.setattr(eas.os, "scandir", scandir)
+    monkeypatch.setattr(eas.os.path, "exists", lambda path: True)
+    grouper_regex = Mock(wraps=eas.EASBuilder.grouper_regex)
+    monkeypatch.setattr(eas.EASBuilder, "grouper_regex", grouper_regex)
+
+    package = eas.EASBuilder().build_batch(root)
+
+    assert len(package) == number_of_files // files_per_group
+    assert sum(len(obj) for obj in package) == number_of_files
+    assert scandir.call_args_list.count(call(access)) == 1
+    assert grouper_regex.match.call_count == number_of_files * 2
+
+
+def test_streaming_locate_packages(tmpdir):
+    for file_name in [
+        "99338384012205899-00000001.tif",
+        "99338384012205899-00000002.tif",
+        "99350592312205899-00000001.tif",
+    ]:
+        (tmpdir / "access" / file_name).ensure()
+    factory = packager.PackageFactory(eas.Eas())
+
+    streamed = list(factory.locate_packages(tmpdir.strpath, streaming=True))
+
+    assert sorted(
+        (p.metadata[packager.Metadata.ID], len(p)) for p in streamed
+    ) == [("99338384012205899", 2), ("99350592312205899", 1)]
+    assert all(len(p.parent) == 0 for p in streamed)
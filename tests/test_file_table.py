@@ -0,0 +1,89 @@
+import io
+
+import pytest
+
+from uiucprescon import packager
+from uiucprescon.packager.packages.file_table import FileRecord, FileTable
+
+
+@pytest.fixture
+def hathi_jp2_batch(tmp_path):
+    batch = tmp_path / "batch"
+    for package_id in ["000001", "000002"]:
+        package_dir = batch / package_id
+        package_dir.mkdir(parents=True)
+        for page in range(1, 4):
+            (package_dir / f"{page:08d}.jp2").write_bytes(b"x" * page)
+            (package_dir / f"{page:08d}.txt").write_bytes(b"t")
+    return str(batch)
+
+
+def walk_files(packages):
+    rows = []
+    for package_object in packages:
+        for item in package_object:
+            for instantiation in item:
+                for path in instantiation.get_files():
+                    rows.append((
+                        package_object.metadata[packager.Metadata.ID],
+                        item.metadata[packager.Metadata.ITEM_NAME],
+                        instantiation.category.value,
+                        path,
+                    ))
+    return rows
+
+
+def test_from_component_matches_object_graph(hathi_jp2_batch):
+    factory = packager.PackageFactory(packager.packages.HathiJp2())
+    packages = list(factory.locate_packages(hathi_jp2_batch))
+    table = FileTable.from_component(packages, include_sizes=True)
+    assert [row[:4] for row in table] == walk_files(packages)
+    assert table.count_by("object_id") == {"000001": 3, "000002": 3}
+    assert table.sum_by("object_id") == {"000001": 6, "000002": 6}
+    assert set(table.column("extension")) == {".jp2"}
+
+
+def test_select_and_group_by():
+    table = FileTable()
+    table.append(FileRecord("1", "01", "access", "1/01.jp2", 10, ".jp2"))
+    table.append(FileRecord("1", "01", "preservation", "1/01.tif", 30, ".tif"))
+    table.append(FileRecord("1", "02", "access", "1/02.jp2", 11, ".jp2"))
+    table.append(FileRecord("2", "01", "access", "2/01.jp2", -1, ".jp2"))
+
+    access = table.select(category="access")
+    assert access.column("path") == ["1/01.jp2", "1/02.jp2", "2/01.jp2"]
+    assert access.sum_by("object_id") == {"1": 21, "2": 0}
+    assert table.select(object_id="1", extension=".tif")[0].size == 30
+    assert len(table.select(object_id="3")) == 0
+    assert table.select(category="access", item_name="01",
+                        size=-1).column("path") == ["2/01.jp2"]
+    assert len(table.select(category="access", extension=".tif")) == 0
+    assert table.count_by("item_name") == {"01": 3, "02": 1}
+
+
+def test_dump_and_load_round_trip():
+    table = FileTable()
+    table.append(FileRecord("1", "01", "access", "1/01.jp2", 10, ".jp2"))
+    table.append(FileRecord("2", "ü", "access", "2/ü.jp2", -1, ".jp2"))
+    loaded = FileTable.load(io.BytesIO(table.to_bytes()))
+    assert list(loaded) == list(table)
+    assert list(FileTable.load(io.BytesIO(FileTable().to_bytes()))) == []
+
+
+def test_dump_values_with_nul():
+    table = FileTable()
+    table.append(FileRecord("1\0", "01", "access", "1/01.jp2", 10, ".jp2"))
+    table.append(FileRecord("1", "", "access", "1/02.jp2", 11, ".jp2"))
+    loaded = FileTable.load(io.BytesIO(table.to_bytes()))
+    assert list(loaded) == list(table)
+
+
+@pytest.mark.parametrize("data", [b"", b"PKGFTBL1\x01", b"not a table"])
+def test_load_rejects_invalid_streams(data):
+    with pytest.raises(ValueError):
+        FileTable.load(io.BytesIO(data))
+
+
+def test_unknown_column():
+    with pytest.raises(KeyError):
+        FileTable().column("checksum")
@@ -0,0 +1,69 @@
+import os
+import stat
+
+import pytest
+
+from uiucprescon.packager.packages import filesystem
+
+
+@pytest.fixture
+def in_memory():
+    return filesystem.InMemoryFileSystem([
+        os.path.join("batch", "000001", "00000001.jp2"),
+        os.path.join("batch", "000001", "00000001.txt"),
+        os.path.join("batch", "000002", "00000001.jp2"),
+    ])
+
+
+def test_in_memory_scandir(in_memory):
+    path = os.path.join("batch", "000001")
+    entries = in_memory.scandir(path)
+    assert sorted(entry.path for entry in entries) == [
+        os.path.join(path, "00000001.jp2"),
+        os.path.join(path, "00000001.txt"),
+    ]
+    assert all(entry.is_file() and not entry.is_dir() for entry in entries)
+
+
+def test_in_memory_parent_directories_are_added(in_memory):
+    entries = in_memory.scandir("batch")
+    assert sorted(entry.name for entry in entries) == ["000001", "000002"]
+    assert all(entry.is_dir() for entry in entries)
+    assert in_memory.listdir(os.curdir) == ["batch"]
+
+
+def test_in_memory_missing_directory_raises(in_memory):
+    with pytest.raises(FileNotFoundError):
+        in_memory.scandir(os.path.join("batch", "000003"))
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("batch", True),
+    (os.path.join("batch", "000002", "00000001.jp2"), True),
+    (os.path.join("batch", "000002", "00000002.jp2"), False),
+    ("other", False),
+])
+def test_in_memory_exists(in_memory, path, expected):
+    assert in_memory.exists(path) is expected
+
+
+def test_in_memory_stat(in_memory):
+    directory = in_memory.stat("batch")
+    assert stat.S_ISDIR(directory.st_mode)
+    assert stat.S_ISREG(
+        in_memory.stat(os.path.join("batch", "000001", "00000001.jp2")).st_mode
+    )
+    in_memory.add_file(os.path.join("batch", "000003", "00000001.jp2"))
+    assert in_memory.stat("batch").st_mtime_ns > directory.st_mtime_ns
+    with pytest.raises(FileNotFoundError):
+        in_memory.stat("other")
+
+
+def test_local_file_system_matches_os(tmp_path):
+    (tmp_path / "sample.tif").touch()
+    (tmp_path / "subdirectory").mkdir()
+    local = filesystem.LocalFileSystem()
+    assert sorted(local.listdir(str(tmp_path))) == \
+           sorted(os.listdir(str(tmp_path)))
+    assert local.exists(str(tmp_path / "sample.tif"))
+    assert not local.exists(str(tmp_path / "missing.tif"))
@@ -5,7 +5,7 @@ import pytest
 
 from uiucprescon.packager import packages
 from uiucprescon.packager import package, common
-from uiucprescon.packager.packages import collection
+from uiucprescon.packager.packages import collection, hathi_jp2_package
 from uiucprescon import packager
 
 
@@ -221,3 +221,47 @@ class TestConvertStrategy:
         strategy.convert = Mock()
         with pytest.raises(AssertionError):
             strategy.transform_access_file(capture_one_tiff, dest="out")
+
+
+@pytest.mark.parametrize("builder_class, main_extension", [
+    (packages.hathi_jp2_package.HathiJp2Builder, ".jp2"),
+    (packages.collection_builder.HathiTiffBuilder, ".tif"),
+])
+def test_builder_sidecar_files(
+        tmpdir, monkeypatch, builder_class, main_extension
+):
+    number_of_pages = 50
+    volume = tmpdir.mkdir("batch").mkdir("000001")
+    for page in range(1, number_of_pages + 1):
+        stem = str(page).zfill(8)
+        (volume / f"{stem}{main_extension}").ensure()
+        (volume / f"{stem}.txt").ensure()
+        (volume / f"{stem}.xml").ensure()
+
+    scandir = Mock(wraps=os.scandir)
+    monkeypatch.setattr(packages.collection_builder.os, "scandir", scandir)
+
+    package = builder_class().build_batch(tmpdir.join("batch").strpath)
+
+    assert scandir.call_args_list.count(call(volume.strpath)) == 1
+    package_object = package[0]
+    assert len(package_object) == number_of_pages
+
+    first_access = \
+        package_object[0].instantiations[collection.InstantiationTypes.ACCESS]
+    assert list(first_access.get_files()) == [
+        volume.join(f"00000001{main_extension}").strpath
+    ]
+    assert sorted(first_access.sidecar_files) == [
+        volume.join("00000001.txt").strpath,
+        volume.join("00000001.xml").strpath,
+    ]
+
+
+def test_strategy_must_write_access_files_to_zip():
+    class CopyOnly(hathi_jp2_package.AbsItemTransformStrategy):
+        def transform_access_file(self, item, dest):
+            pass
+
+    with pytest.raises(TypeError):
+        CopyOnly()
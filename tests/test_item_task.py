@@ -0,0 +1,162 @@
+import os
+import pickle
+import zipfile
+
+import pytest
+
+from uiucprescon import packager
+from uiucprescon.packager import transformations
+from uiucprescon.packager.common import InstantiationTypes, Metadata
+from uiucprescon.packager.packages import collection, zip_session
+from uiucprescon.packager.packages.item_task import ItemTask
+
+
+def make_object(root, object_id, categories, pages=3):
+    package = collection.Package(str(root))
+    package.component_metadata[Metadata.PATH] = str(root)
+    package_object = collection.PackageObject(parent=package)
+    package_object.component_metadata[Metadata.ID] = object_id
+    for page in range(1, pages + 1):
+        item = collection.Item(parent=package_object)
+        item.component_metadata[Metadata.ITEM_NAME] = f"{page:08d}"
+        for category, extension in categories.items():
+            directory = root / category.value
+            directory.mkdir(exist_ok=True)
+            name = f"{object_id}_{page:08d}{extension}"
+            (directory / name).write_bytes(f"{category.value}{page}".encode())
+            instantiation = collection.Instantiation(category, item, [name])
+            instantiation.component_metadata[Metadata.PATH] = str(directory)
+    return package_object
+
+
+def fake_encode(_, source, destination, logger):
+    with open(destination, "wb") as file:
+        file.write(b"encoded " + os.path.basename(source).encode())
+    return destination
+
+
+def read_tree(path):
+    contents = {}
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            with open(file_path, "rb") as file:
+                contents[os.path.relpath(file_path, path)] = file.read()
+    return contents
+
+
+def test_task_is_smaller_than_item(tmp_path):
+    package_object = make_object(
+        tmp_path, "000001",
+        {InstantiationTypes.PRESERVATION: ".tif"}, pages=50
+    )
+    item = package_object.items[0]
+    task = packager.packages.HathiTiff().create_task(item)
+    assert len(pickle.dumps(task)) < 1000
+    assert len(pickle.dumps(task)) * 10 < len(pickle.dumps(item))
+
+
+def test_to_item_round_trip(tmp_path):
+    package_object = make_object(
+        tmp_path, "000001", {
+            InstantiationTypes.PRESERVATION: ".tif",
+            InstantiationTypes.ACCESS: ".jp2",
+        }
+    )
+    item = package_object.items[1]
+    task = ItemTask.from_item(item, strategy="copy")
+    assert task.object_id == "000001"
+    assert task.item_name == "00000002"
+    assert task.categories == (
+        InstantiationTypes.PRESERVATION, InstantiationTypes.ACCESS
+    )
+    assert task.get_files(InstantiationTypes.ACCESS) == (
+        str(tmp_path / "access" / "000001_00000002.jp2"),
+    )
+    with pytest.raises(KeyError):
+        task.get_files(InstantiationTypes.SUPPLEMENTARY)
+    rebuilt = task.to_item()
+    assert list(
+        rebuilt.instantiations[InstantiationTypes.ACCESS].get_files()
+    ) == list(item.instantiations[InstantiationTypes.ACCESS].get_files())
+    assert ItemTask.from_item(rebuilt, strategy="copy") == task
+
+
+def test_zipped_files_are_extracted(tmp_path):
+    archive = tmp_path / "1234.zip"
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("1234/00000001.jp2", b"jp2")
+    package = collection.Package(str(archive))
+    package.component_metadata[Metadata.PATH] = str(archive)
+    package_object = collection.PackageObject(parent=package)
+    package_object.component_metadata[Metadata.ID] = "1234"
+    item = collection.Item(parent=package_object)
+    item.component_metadata[Metadata.ITEM_NAME] = "00000001"
+    instantiation = collection.Instantiation(
+        InstantiationTypes.ACCESS, item, ["00000001.jp2"]
+    )
+    instantiation.component_metadata[Metadata.PATH] = "1234"
+
+    with zip_session.ZipSession() as session:
+        task = ItemTask.from_item(item)
+        assert session.stats.files_extracted == 0
+        source, = task.get_files(InstantiationTypes.ACCESS, session=session)
+        with open(source, "rb") as file:
+            assert file.read() == b"jp2"
+
+
+def test_hathi_jp2_task_only_has_strategy_source(tmp_path):
+    package_object = make_object(
+        tmp_path, "000001", {
+            InstantiationTypes.PRESERVATION: ".tif",
+            InstantiationTypes.ACCESS: ".tif",
+        }
+    )
+    task = packager.packages.HathiJp2().create_task(package_object.items[0])
+    assert task.strategy == "convert_access"
+    assert task.categories == (InstantiationTypes.ACCESS,)
+
+
+@pytest.mark.parametrize("categories,strategy", [
+    ({InstantiationTypes.PRESERVATION: ".tif"}, "UsePreservationForAll"),
+    ({InstantiationTypes.ACCESS: ".tif",
+      InstantiationTypes.PRESERVATION: ".tif"}, "UseAccessTiffs"),
+])
+def test_dlc_task_output_matches_item(tmp_path, monkeypatch, categories,
+                                      strategy):
+    monkeypatch.setattr(transformations.ConvertJp2Standard, "transform",
+                        fake_encode)
+    (tmp_path / "source").mkdir()
+    package_object = make_object(tmp_path / "source", "000001", categories)
+    builder = packager.packages.DigitalLibraryCompound()
+    for item in package_object:
+        builder.transform_one_item(item, str(tmp_path / "items"))
+        task = builder.create_task(item)
+        assert task.strategy == strategy
+        builder.transform_task(task, str(tmp_path / "tasks"))
+
+    builder.transform_workers = 2
+    builder.transform_executor = "process"
+    builder.transform(package_object, str(tmp_path / "pool"))
+
+    expected = read_tree(tmp_path / "items")
+    assert len(expected) == 6
+    assert read_tree(tmp_path / "tasks") == expected
+    assert read_tree(tmp_path / "pool") == expected
+
+
+def test_to_item_keeps_parent_metadata(tmp_path):
+    package = collection.Package(str(tmp_path))
+    package.component_metadata[Metadata.PATH] = str(tmp_path)
+    package_object = collection.PackageObject(parent=package)
+    package_object.component_metadata[Metadata.ID] = "1234"
+    package_object.component_metadata[Metadata.TITLE_PAGE] = "00000002"
+    item = collection.Item(parent=package_object)
+    item.component_metadata[Metadata.ITEM_NAME] = "00000001"
+    collection.Instantiation(
+        InstantiationTypes.ACCESS, item, ["00000001.jp2"]
+    )
+
+    rebuilt = ItemTask.from_item(item).to_item()
+    assert rebuilt.metadata[Metadata.PATH] == str(tmp_path)
+    assert rebuilt.metadata[Metadata.TITLE_PAGE] == "00000002"
@@ -0,0 +1,155 @@
+import io
+import json
+import os
+import zipfile
+from unittest.mock import Mock
+
+import pytest
+
+from uiucprescon import packager
+from uiucprescon.packager.common import Metadata
+from uiucprescon.packager.packages import manifest
+
+
+def tree_summary(packages):
+    return sorted(
+        (
+            package_object.metadata[Metadata.ID],
+            [
+                (
+                    item.metadata[Metadata.ITEM_NAME],
+                    sorted(
+                        file_
+                        for inst in item
+                        for file_ in inst.get_files()
+                    )
+                ) for item in package_object
+            ]
+        )
+        for package in packages
+        for package_object in package
+    )
+
+
+@pytest.fixture
+def dlc_batch(tmp_path):
+    batch = tmp_path / "batch"
+    for package_id in ["000001", "000002"]:
+        for page in range(1, 4):
+            stem = str(page).zfill(8)
+            for category, extension in [("access", ".jp2"),
+                                        ("preservation", ".tif")]:
+                directory = batch / package_id / category
+                directory.mkdir(parents=True, exist_ok=True)
+                (directory / f"{stem}{extension}").touch()
+    return str(batch)
+
+
+def list_relative_files(root):
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            yield os.path.relpath(os.path.join(dirpath, name), root)
+
+
+def write_manifest(root, manifest_format):
+    files = sorted(list_relative_files(root))
+    if manifest_format == "lines":
+        return io.StringIO("".join(f"{path}\n" for path in files))
+    if manifest_format == "csv":
+        return io.StringIO(
+            "path,type\n" + "".join(f"{path},file\n" for path in files)
+        )
+    return io.StringIO(json.dumps(files))
+
+
+@pytest.mark.parametrize("manifest_format", manifest.MANIFEST_FORMATS)
+def test_manifest_matches_local_discovery(dlc_batch, manifest_format,
+                                          monkeypatch):
+    factory = packager.PackageFactory(
+        packager.packages.DigitalLibraryCompound()
+    )
+    local = list(factory.locate_packages(dlc_batch))
+    stream = write_manifest(dlc_batch, manifest_format)
+
+    monkeypatch.setattr(os, "scandir", Mock(side_effect=AssertionError))
+    from_manifest = list(
+        factory.locate_packages(dlc_batch,
+                                manifest=stream,
+                                manifest_format=manifest_format)
+    )
+    assert tree_summary(from_manifest) == tree_summary(local)
+
+
+def test_manifest_file_format_from_extension(tmp_path):
+    manifest_file = tmp_path / "inventory.json"
+    manifest_file.write_text(json.dumps([
+        {"path": "000001", "type": "directory"},
+        {"path": "000001/00000001.jp2"},
+    ]))
+    filesystem = manifest.load_manifest(str(manifest_file), root="batch")
+    assert [entry.is_dir() for entry in filesystem.scandir("batch")] == \
+           [True]
+    assert filesystem.listdir(os.path.join("batch", "000001")) == \
+           ["00000001.jp2"]
+
+
+def test_find_output_directories_before_files():
+    stream = io.StringIO(".\n./000001\n./000001/00000001.jp2\n./000002/\n")
+    filesystem = manifest.load_manifest(stream, "lines", root="batch")
+    assert sorted(
+        (entry.name, entry.is_dir()) for entry in filesystem.scandir("batch")
+    ) == [("000001", True), ("000002", True)]
+
+
+@pytest.mark.parametrize("manifest_format, text", [
+    ("csv", "name\n000001/00000001.jp2\n"),
+    ("json", '{"path": "000001/00000001.jp2"}'),
+    ("json", '[{"name": "000001/00000001.jp2"}]'),
+    ("csv", "path,type\n000001,link\n"),
+])
+def test_invalid_manifest_raises(manifest_format, text):
+    with pytest.raises(ValueError):
+        manifest.load_manifest(io.StringIO(text), manifest_format)
+
+
+def test_unknown_manifest_format_raises():
+    with pytest.raises(ValueError):
+        manifest.load_manifest(io.StringIO(""), "xml")
+
+
+def test_manifest_lists_zip_members(tmp_path, monkeypatch):
+    package_dir = tmp_path / "batch" / "uiuc.1234"
+    package_dir.mkdir(parents=True)
+    (package_dir / "1234.mets.xml").touch()
+    members = ["1234/1234.mets.xml"] + [
+        f"1234/{page:08d}{extension}"
+        for page in range(1, 3)
+        for extension in [".jp2", ".txt", ".xml"]
+    ]
+    with zipfile.ZipFile(package_dir / "1234.zip", "w") as archive:
+        for member in members:
+            archive.writestr(member, b"")
+    factory = packager.PackageFactory(packager.packages.HathiLimitedView())
+    batch = str(tmp_path / "batch")
+    local = list(factory.locate_packages(batch))
+    stream = io.StringIO("uiuc.1234/1234.mets.xml\n" + "".join(
+        f"uiuc.1234/1234.zip!{member}\n" for member in members
+    ))
+
+    monkeypatch.setattr(zipfile, "ZipFile",
+                        Mock(side_effect=AssertionError("opened")))
+    from_manifest = list(
+        factory.locate_packages(batch, manifest=stream,
+                                manifest_format="lines")
+    )
+
+    def summary(packages):
+        return [
+            (item.metadata[Metadata.ITEM_NAME], inst.list_file_names())
+            for package in packages
+            for item in package
+            for inst in item
+        ]
+
+    assert len(summary(local)) == 4
+    assert summary(from_manifest) == summary(local)
@@ -389,7 +389,7 @@ def sample_cataloged_collection(
     number_of_parts_each = 4
     packages: typing.Set[str] = set()
 
-    def scandir(_, path):
+    def scandir(_, path, **_kwargs):
 
         if path == batch_root:
             for f in packages:
@@ -631,7 +631,7 @@ class TestTransform:
     def cataloged_collection(self, monkeypatch):
 
         def factory(file_name):
-            def locate_files_access(_, path):
+            def locate_files_access(_, path, scandir=None):
                 dir_entry = Mock()
                 dir_entry.name = file_name
                 dir_entry.path = os.path.join(path, "access")
@@ -643,7 +643,7 @@ class TestTransform:
                 locate_files_access
             )
 
-            def locate_files_preservation(_, path):
+            def locate_files_preservation(_, path, scandir=None):
                 dir_entry = Mock()
                 dir_entry.name = file_name
                 dir_entry.path = os.path.join(path, "preservation")
@@ -756,3 +756,69 @@ class TestTransform:
             )
         else:
             assert False, f"testing '{package_type}' not supported"
+
+
+def test_group_packages_non_contiguous():
+    def dir_entry(name):
+        entry = Mock()
+        entry.name = name
+        return entry
+
+    builder = noneas.CatalogedNonEASBuilder()
+    groups = builder.group_packages([
+        dir_entry("1234-001.tif"),
+        dir_entry("5678-001.tif"),
+        dir_entry("1234-002.tif"),
+    ])
+    assert len(groups["1234"]) == 2 and len(groups["5678"]) == 1
+
+
+@pytest.mark.parametrize("number_of_groups, parts_per_group", [
+    (1, 10),
+    (10, 10),
+    (20, 50),
+])
+def test_build_batch_scales_linearly(
+        tmpdir, monkeypatch, number_of_groups, parts_per_group
+):
+    # Each directory should be read once and each file name matched once
+    # no matter how many groups and parts are in the batch.
+    access = tmpdir.mkdir("access")
+    preservation = tmpdir.mkdir("preservation")
+    for group_id in range(number_of_groups):
+        for part_id in range(parts_per_group):
+            file_name = \
+                f"0001_{str(group_id).zfill(3)}-{str(part_id).zfill(3)}.tif"
+            (access / file_name).ensure()
+            (preservation / file_name).ensure()
+
+    builder = noneas.ArchivalNonEASBuilder()
+    grouper_regex = Mock(wraps=noneas.ArchivalNonEASBuilder.grouper_regex)
+    builder.grouper_regex = grouper_regex
+    scandir = Mock(wraps=os.scandir)
+    monkeypatch.setattr(noneas.os, "scandir", scandir)
+
+    package = builder.build_batch(tmpdir.strpath)
+
+    number_of_files = number_of_groups * parts_per_group
+    assert len(package) == number_of_groups
+    assert all(
+        len(item.instantiations) == 2 for obj in package for item in obj
+    )
+    assert grouper_regex.match.call_count == number_of_files * 2
+    assert scandir.call_count == 2
+
+
+def test_streaming_locate_packages(tmpdir):
+    for directory in ["access", "preservation"]:
+        for file_name in ["1234-001.tif", "1234-002.tif", "5678-001.tif"]:
+            (tmpdir / directory / file_name).ensure()
+    factory = packager.PackageFactory(noneas.CatalogedNonEAS())
+
+    streamed = list(factory.locate_packages(tmpdir.strpath, streaming=True))
+    batched = list(factory.locate_packages(tmpdir.strpath))
+
+    assert [p.metadata[packager.Metadata.ID] for p in streamed] == \
+           [p.metadata[packager.Metadata.ID] for p in batched]
+    assert [len(p) for p in streamed] == [2, 1]
+    assert all(len(p.parent) == 0 for p in streamed)
@@ -0,0 +1,276 @@
+import os
+import pickle
+import sqlite3
+import time
+import zipfile
+from unittest.mock import call, Mock
+
+import pytest
+
+from uiucprescon import packager
+from uiucprescon.packager.packages import \
+    capture_one_package, eas, filesystem, noneas, scan_cache
+
+
+def age(path, seconds=60):
+    """Backdate the modification time of path."""
+    timestamp = time.time() - seconds
+    os.utime(path, (timestamp, timestamp))
+
+
+@pytest.fixture
+def sample_dir(tmp_path):
+    (tmp_path / "00000001.jp2").touch()
+    (tmp_path / "00000001.txt").touch()
+    (tmp_path / "subdirectory").mkdir()
+    age(tmp_path)
+    return str(tmp_path)
+
+
+def listing(entries):
+    return sorted(
+        (entry.name, entry.path, entry.is_file(), entry.is_dir())
+        for entry in entries
+    )
+
+
+def test_scandir_matches_os_scandir(sample_dir):
+    with scan_cache.ScanCache() as cache:
+        assert listing(cache.scandir(sample_dir)) == \
+               listing(os.scandir(sample_dir))
+        assert listing(cache.scandir(sample_dir)) == \
+               listing(os.scandir(sample_dir))
+        assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_unchanged_directory_is_not_read_again(sample_dir, monkeypatch):
+    cache = scan_cache.ScanCache()
+    cache.scandir(sample_dir)
+    scandir = Mock(wraps=os.scandir)
+    monkeypatch.setattr(scan_cache.os, "scandir", scandir)
+    cache.scandir(sample_dir)
+    assert scandir.call_args_list.count(call(sample_dir)) == 0
+
+
+def test_changed_directory_is_read_again(sample_dir):
+    cache = scan_cache.ScanCache()
+    cache.scandir(sample_dir)
+    open(os.path.join(sample_dir, "00000002.jp2"), "w").close()
+    age(sample_dir, seconds=30)
+    names = [entry.name for entry in cache.scandir(sample_dir)]
+    assert "00000002.jp2" in names
+    assert cache.misses == 2
+
+
+def test_recently_modified_directory_is_not_stored(tmp_path):
+    cache = scan_cache.ScanCache()
+    cache.scandir(str(tmp_path))
+    assert len(cache) == 0
+
+
+def test_listings_persist_between_sessions(sample_dir, tmp_path_factory):
+    database = str(tmp_path_factory.mktemp("cache") / "scans.sqlite")
+    with scan_cache.ScanCache(database) as cache:
+        cache.scandir(sample_dir)
+
+    with scan_cache.ScanCache(database) as cache:
+        cache.scandir(sample_dir)
+        assert (cache.misses, cache.hits) == (0, 1)
+
+
+def test_closed_cache_raises(sample_dir):
+    cache = scan_cache.ScanCache()
+    cache.close()
+    with pytest.raises(ValueError):
+        cache.scandir(sample_dir)
+
+
+def test_rediscovery_only_reads_changed_directories(tmp_path, monkeypatch):
+    batch = tmp_path / "batch"
+    batch.mkdir()
+    for package_id in ["000001", "000002"]:
+        package_dir = batch / package_id
+        package_dir.mkdir()
+        for page in range(1, 4):
+            (package_dir / f"{str(page).zfill(8)}.jp2").touch()
+        age(package_dir)
+    age(batch)
+
+    factory = packager.PackageFactory(packager.packages.HathiJp2())
+    cache = scan_cache.ScanCache()
+    first = [
+        len(package_object)
+        for package_object in factory.locate_packages(
+            str(batch), filesystem=cache
+        )
+    ]
+
+    changed = batch / "000002"
+    (changed / "00000004.jp2").touch()
+    age(changed, seconds=30)
+
+    scandir = Mock(wraps=os.scandir)
+    monkeypatch.setattr(scan_cache.os, "scandir", scandir)
+    second = [
+        len(package_object)
+        for package_object in factory.locate_packages(
+            str(batch), filesystem=cache
+        )
+    ]
+    assert first == [3, 3]
+    assert sorted(second) == [3, 4]
+    assert scandir.call_args_list == [call(str(changed))]
+
+
+@pytest.fixture
+def sample_archive(tmp_path):
+    path = tmp_path / "1234.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("1234/", "")
+        archive.writestr("1234/00000001.jp2", "")
+        archive.writestr("1234/00000001.txt", "")
+    age(path)
+    return str(path)
+
+
+def test_archive_listing_is_cached(sample_archive, monkeypatch):
+    cache = scan_cache.ScanCache()
+    expected = ["1234/00000001.jp2", "1234/00000001.txt"]
+    assert cache.list_archive(sample_archive) == expected
+    monkeypatch.setattr(
+        filesystem.zipfile, "ZipFile",
+        Mock(side_effect=AssertionError("zip file read"))
+    )
+    assert cache.list_archive(sample_archive) == expected
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_changed_archive_is_read_again(sample_archive):
+    cache = scan_cache.ScanCache()
+    cache.list_archive(sample_archive)
+    with zipfile.ZipFile(sample_archive, "a") as archive:
+        archive.writestr("1234/00000002.jp2", "")
+    age(sample_archive, seconds=30)
+    assert "1234/00000002.jp2" in cache.list_archive(sample_archive)
+    assert cache.misses == 2
+
+
+def test_hathi_limited_view_uses_cached_archive_index(tmp_path, monkeypatch):
+    package_dir = tmp_path / "batch" / "uiuc.1234"
+    package_dir.mkdir(parents=True)
+    (package_dir / "1234.mets.xml").touch()
+    with zipfile.ZipFile(package_dir / "1234.zip", "w") as archive:
+        for page in range(1, 4):
+            archive.writestr(f"1234/{page:08d}.jp2", "")
+            archive.writestr(f"1234/{page:08d}.txt", "")
+    age(package_dir / "1234.zip")
+
+    factory = packager.PackageFactory(packager.packages.HathiLimitedView())
+    cache = scan_cache.ScanCache()
+
+    def describe():
+        return [
+            [(item.metadata[packager.Metadata.ITEM_NAME],
+              list(item.instantiations)) for item in package_object]
+            for package_object in factory.locate_packages(
+                str(tmp_path / "batch"), filesystem=cache
+            )
+        ]
+
+    first = describe()
+    monkeypatch.setattr(
+        filesystem.zipfile, "ZipFile",
+        Mock(side_effect=AssertionError("zip file read"))
+    )
+    assert describe() == first
+    assert [name for name, _ in first[0]] == \
+           ["00000001", "00000002", "00000003"]
+
+
+def test_wraps_another_filesystem():
+    files = filesystem.InMemoryFileSystem([
+        os.path.join("batch", "000001", f"{page:08d}.jp2")
+        for page in range(1, 4)
+    ])
+    cache = scan_cache.ScanCache(filesystem=files)
+    factory = packager.PackageFactory(packager.packages.HathiJp2())
+    package_object, = factory.locate_packages("batch", filesystem=cache)
+    assert len(package_object) == 3
+    assert cache.exists(os.path.join("batch", "000001", "00000001.jp2"))
+    assert not os.path.exists("batch")
+    # The in-memory file system was changed just now, so its listings are
+    # too recent to be stored
+    assert len(cache) == 0
+
+
+def test_in_memory_listings_are_read_again_after_a_change(monkeypatch):
+    monkeypatch.setattr(scan_cache, "RACY_WINDOW_NS", -1)
+    files = filesystem.InMemoryFileSystem(
+        [os.path.join("batch", "000001", "00000001.jp2")]
+    )
+    cache = scan_cache.ScanCache(filesystem=files)
+    assert cache.listdir("batch") == ["000001"]
+    assert cache.listdir("batch") == ["000001"]
+    assert (cache.misses, cache.hits) == (1, 1)
+    files.add_directory(os.path.join("batch", "000002"))
+    assert sorted(cache.listdir("batch")) == ["000001", "000002"]
+    assert cache.misses == 2
+
+
+def test_package_type_pickles_without_cache(sample_dir):
+    package_type = packager.packages.HathiJp2()
+    package_type.filesystem = scan_cache.ScanCache()
+    copied = pickle.loads(pickle.dumps(package_type))
+    assert isinstance(copied.filesystem, filesystem.LocalFileSystem)
+    assert package_type.filesystem.scandir(sample_dir)
+
+
+def test_database_of_older_version_is_replaced(sample_dir, tmp_path_factory):
+    database = str(tmp_path_factory.mktemp("cache") / "scans.sqlite")
+    connection = sqlite3.connect(database)
+    connection.execute(
+        "CREATE TABLE directories (path TEXT PRIMARY KEY, "
+        "mtime_ns INTEGER NOT NULL, inode INTEGER NOT NULL, "
+        "entry_count INTEGER NOT NULL, entries TEXT NOT NULL)"
+    )
+    connection.commit()
+    connection.close()
+    with scan_cache.ScanCache(database) as cache:
+        cache.scandir(sample_dir)
+    with scan_cache.ScanCache(database) as cache:
+        assert listing(cache.scandir(sample_dir)) == \
+               listing(os.scandir(sample_dir))
+        assert (cache.misses, cache.hits) == (0, 1)
+
+
+@pytest.mark.parametrize("builder,method,args,expected", [
+    (capture_one_package.CaptureOneBuilder, "locate_batch_files", (),
+     ["000001_00000001.tif"]),
+    (capture_one_package.CaptureOneBuilder, "get_non_system_files", (),
+     ["000001_00000001.jp2", "000001_00000001.tif"]),
+    (capture_one_package.CaptureOneBuilder, "locate_tiff_instances",
+     (lambda entry: True,), ["000001_00000001.tif"]),
+    (eas.EASBuilder, "locate_files_access", (),
+     ["000001_00000001.jp2", "000001_00000001.tif"]),
+    (noneas.ArchivalNonEASBuilder, "locate_files_access", (),
+     ["000001_00000001.tif"]),
+    (noneas.ArchivalNonEASBuilder, "locate_files_preservation", (),
+     ["000001_00000001.jp2", "000001_00000001.tif"]),
+])
+def test_locate_methods_list_with_scandir(tmp_path, builder, method, args,
+                                          expected):
+    names = ["000001_00000001.jp2", "000001_00000001.tif"]
+    for name in names:
+        (tmp_path / name).touch()
+    files = filesystem.InMemoryFileSystem(
+        os.path.join("batch", name) for name in names
+    )
+
+    def located(entries):
+        return sorted(os.path.basename(entry) for entry in entries)
+
+    assert located(getattr(builder, method)(str(tmp_path), *args)) == \
+           expected
+    assert located(
+        getattr(builder, method)("batch", *args, scandir=files.scandir)
+    ) == expected
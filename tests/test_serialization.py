@@ -0,0 +1,135 @@
+import io
+
+import pytest
+
+from uiucprescon import packager
+from uiucprescon.packager.common import Metadata
+from uiucprescon.packager.packages import collection, serialization
+
+
+def describe(component):
+    description = {
+        "type": type(component).__name__,
+        "component_metadata": dict(component.component_metadata),
+        "metadata": component.metadata,
+        "children": [describe(child) for child in component],
+    }
+    for attribute in ["path", "unidentified_objects", "package_files",
+                      "category", "_files", "sidecar_files"]:
+        if hasattr(component, attribute):
+            description[attribute] = getattr(component, attribute)
+    return description
+
+
+def describe_with_parents(component):
+    parents = []
+    parent = component.parent
+    while parent is not None:
+        parents.append((
+            type(parent).__name__,
+            dict(parent.component_metadata),
+            getattr(parent, "path", None)
+        ))
+        parent = parent.parent
+    return describe(component), parents
+
+
+@pytest.fixture
+def hathi_jp2_batch(tmp_path):
+    batch = tmp_path / "batch"
+    for package_id in ["000001", "000002", "000003"]:
+        package_dir = batch / package_id
+        package_dir.mkdir(parents=True)
+        for page in range(1, 4):
+            (package_dir / f"{page:08d}.jp2").touch()
+            (package_dir / f"{page:08d}.txt").touch()
+    return str(batch)
+
+
+def dump_and_load(components):
+    stream = io.StringIO()
+    serialization.dump(components, stream)
+    stream.seek(0)
+    return serialization.load(stream)
+
+
+def test_round_trip_located_packages(hathi_jp2_batch):
+    factory = packager.PackageFactory(packager.packages.HathiJp2())
+    located = list(factory.locate_packages(hathi_jp2_batch))
+    loaded = dump_and_load(located)
+    assert [describe_with_parents(c) for c in loaded] == \
+           [describe_with_parents(c) for c in located]
+    assert loaded[0].parent is loaded[-1].parent
+    assert len(loaded[0].parent) == 3
+
+
+def test_round_trip_instantiation_categories():
+    package_object = collection.PackageObject()
+    package_object.component_metadata[Metadata.ID] = "000001"
+    package_object.component_metadata[Metadata.PACKAGE_TYPE] = \
+        packager.PackageTypes.DIGITAL_LIBRARY_COMPOUND
+    item = collection.Item(parent=package_object)
+    item.component_metadata[Metadata.ITEM_NAME] = "00000001"
+    item.component_metadata[Metadata.TITLE_PAGE] = None
+    for category, file_name in [
+        (packager.InstantiationTypes.ACCESS, "00000001.jp2"),
+        (packager.InstantiationTypes.PRESERVATION, "00000001.tif"),
+    ]:
+        instantiation = collection.Instantiation(
+            category=category, parent=item, files=[file_name]
+        )
+        instantiation.component_metadata[Metadata.PATH] = "source"
+        instantiation.sidecar_files.append("00000001.txt")
+
+    loaded, = dump_and_load([package_object])
+    assert describe(loaded) == describe(package_object)
+
+
+def test_iter_load_is_lazy(hathi_jp2_batch):
+    factory = packager.PackageFactory(packager.packages.HathiJp2())
+    stream = io.StringIO()
+    serialization.dump(factory.locate_packages(hathi_jp2_batch), stream)
+    lines = stream.getvalue().splitlines(keepends=True)
+    lines_read = []
+
+    def read_lines():
+        for line in lines:
+            lines_read.append(line)
+            yield line
+
+    reader = read_lines()
+    header = next(reader)
+
+    class LineStream:
+        def readline(self):
+            return header
+
+        def __iter__(self):
+            return reader
+
+    components = serialization.iter_load(LineStream())
+    next(components)
+    assert len(lines_read) < len(lines) / 2
+
+
+def test_iter_load_detach(hathi_jp2_batch):
+    factory = packager.PackageFactory(packager.packages.HathiJp2())
+    stream = io.StringIO()
+    serialization.dump(factory.locate_packages(hathi_jp2_batch), stream)
+    stream.seek(0)
+    for component in serialization.iter_load(stream, detach=True):
+        assert len(component.parent) == 0
+        assert len(component) == 3
+
+
+def test_load_rejects_other_streams():
+    with pytest.raises(ValueError):
+        serialization.load(io.StringIO('{"id": 0}\n'))
+
+
+def test_unserializable_metadata_names_the_key():
+    package_object = collection.PackageObject()
+    package_object.component_metadata[Metadata.ID] = "000001"
+    package_object.component_metadata[Metadata.PATH] = object()
+    with pytest.raises(TypeError, match="path metadata of a PackageObject"):
+        serialization.dump([package_object], io.StringIO())
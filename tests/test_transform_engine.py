@@ -0,0 +1,379 @@
+import logging
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from uiucprescon import packager
+from uiucprescon.packager import transformations
+from uiucprescon.packager.common import InstantiationTypes, Metadata
+from uiucprescon.packager.errors import TransformError
+from uiucprescon.packager.packages import collection, hathi_jp2_package
+from uiucprescon.packager.packages.transform_engine import \
+    StageGraph, run_item_transforms
+
+
+def make_batch(root, extension, pages=6):
+    batch = root / "batch"
+    for package_id in ["000001", "000002"]:
+        package_dir = batch / package_id
+        package_dir.mkdir(parents=True)
+        for page in range(1, pages + 1):
+            (package_dir / f"{page:08d}{extension}").write_bytes(
+                f"{package_id}-{page}".encode() * 100
+            )
+    return str(batch)
+
+
+def read_tree(path):
+    contents = {}
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            with open(file_path, "rb") as file:
+                contents[os.path.relpath(file_path, path)] = file.read()
+    return contents
+
+
+def make_item(object_id, item_name, categories=None, root=None):
+    package_object = collection.PackageObject()
+    package_object.component_metadata[Metadata.ID] = object_id
+    package_object.component_metadata[Metadata.PATH] = str(root or "")
+    item = collection.Item(package_object)
+    item.component_metadata[Metadata.ITEM_NAME] = item_name
+    for category, path in (categories or {}).items():
+        instantiation = collection.Instantiation(category, item, [path])
+        instantiation.component_metadata[Metadata.PATH] = ""
+    return item
+
+
+def fake_convert(_, source, destination):
+    # Finish the items in a different order than they were started
+    page = int(os.path.splitext(os.path.basename(source))[0])
+    time.sleep(0.01 * (page % 3))
+    logging.getLogger(hathi_jp2_package.__name__).info("Converting %s", page)
+    with open(destination, "wb") as file:
+        file.write(b"converted " + os.path.basename(source).encode())
+    logging.getLogger(hathi_jp2_package.__name__).info("Converted %s", page)
+
+
+def transform_batch(batch, dest, package_type, **options):
+    for package in packager.PackageFactory(packager.packages.HathiTiff()) \
+            .locate_packages(batch):
+        object_name = package.metadata[packager.Metadata.ID]
+        (dest / object_name).mkdir(parents=True)
+        packager.PackageFactory(package_type).transform(
+            package, str(dest), **options
+        )
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_copy_output_matches_serial(tmp_path, executor):
+    batch = make_batch(tmp_path, ".tif")
+    transform_batch(batch, tmp_path / "serial",
+                    packager.packages.HathiTiff())
+    transform_batch(batch, tmp_path / "parallel",
+                    packager.packages.HathiTiff(),
+                    max_workers=3, executor=executor)
+    assert read_tree(tmp_path / "parallel") == read_tree(tmp_path / "serial")
+
+
+def test_convert_output_and_logs_match_serial(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(hathi_jp2_package.ConvertStrategy, "convert",
+                        fake_convert)
+    batch = make_batch(tmp_path, ".tif")
+    with caplog.at_level(logging.INFO):
+        transform_batch(batch, tmp_path / "serial",
+                        packager.packages.HathiJp2())
+        serial_logs = [record.getMessage() for record in caplog.records]
+        caplog.clear()
+        transform_batch(batch, tmp_path / "parallel",
+                        packager.packages.HathiJp2(), max_workers=4)
+        parallel_logs = [record.getMessage() for record in caplog.records]
+
+    assert read_tree(tmp_path / "parallel") == read_tree(tmp_path / "serial")
+    assert serial_logs
+    assert parallel_logs == serial_logs
+
+
+def test_errors_are_collected_per_item(tmp_path, monkeypatch):
+    def convert(strategy, source, destination):
+        if os.path.basename(source) in ["00000002.tif", "00000005.tif"]:
+            raise RuntimeError(f"cannot convert {source}")
+        fake_convert(strategy, source, destination)
+
+    monkeypatch.setattr(hathi_jp2_package.ConvertStrategy, "convert",
+                        convert)
+    batch = make_batch(tmp_path, ".tif")
+    package = next(iter(
+        packager.PackageFactory(packager.packages.HathiTiff())
+        .locate_packages(batch)
+    ))
+    object_name = package.metadata[packager.Metadata.ID]
+    (tmp_path / "out" / object_name).mkdir(parents=True)
+    with pytest.raises(TransformError) as error:
+        packager.PackageFactory(packager.packages.HathiJp2()).transform(
+            package, str(tmp_path / "out"), max_workers=2
+        )
+    assert [(object_id, item_name)
+            for object_id, item_name, _ in error.value.failures] == \
+           [(object_name, "00000002"), (object_name, "00000005")]
+    assert sorted(os.listdir(tmp_path / "out" / object_name)) == [
+        f"{page:08d}.jp2" for page in [1, 3, 4, 6]
+    ]
+
+
+def test_serial_raises_first_error():
+    def fail(item):
+        raise RuntimeError(item)
+
+    with pytest.raises(RuntimeError):
+        run_item_transforms(iter(range(3)), fail)
+
+
+def test_items_are_consumed_a_few_at_a_time(tmp_path):
+    batch = make_batch(tmp_path, ".tif", pages=20)
+    package = next(iter(
+        packager.PackageFactory(packager.packages.HathiTiff())
+        .locate_packages(batch)
+    ))
+    lock = threading.Lock()
+    counts = {"consumed": 0, "started": 0}
+    ahead = []
+
+    def items():
+        for item in package:
+            with lock:
+                counts["consumed"] += 1
+            yield item
+
+    def transform_item(_):
+        with lock:
+            counts["started"] += 1
+            ahead.append(counts["consumed"] - counts["started"])
+        time.sleep(0.005)
+
+    run_item_transforms(items(), transform_item, max_workers=2)
+    assert counts["started"] == 20
+    assert max(ahead) <= 4
+
+
+def test_unknown_executor_is_rejected():
+    factory = packager.PackageFactory(packager.packages.HathiTiff())
+    with pytest.raises(ValueError):
+        factory.transform(None, "out", max_workers=2, executor="fiber")
+
+
+def test_independent_stages_overlap_on_pool():
+    barrier = threading.Barrier(2, timeout=5)
+    finished = []
+
+    def stage(name):
+        def run():
+            barrier.wait()
+            finished.append(name)
+        return run
+
+    def transform_item(_):
+        graph = StageGraph()
+        graph.add("preservation", stage("preservation"))
+        graph.add("access", stage("access"))
+        graph.add("done", lambda: finished.append("done"),
+                  after=["preservation", "access"])
+        graph.run()
+
+    run_item_transforms([make_item("000001", "00000001")], transform_item,
+                        max_workers=2)
+    assert sorted(finished[:2]) == ["access", "preservation"]
+    assert finished[2] == "done"
+
+
+def test_stages_run_in_order_without_pool():
+    order = []
+    graph = StageGraph()
+    for name in ["supplementary", "preservation", "access"]:
+        graph.add(name, lambda name=name: order.append(name))
+    graph.run()
+    assert order == ["supplementary", "preservation", "access"]
+
+
+def test_stage_must_be_added_after_dependencies():
+    graph = StageGraph()
+    with pytest.raises(ValueError):
+        graph.add("access", lambda: None, after=["preservation"])
+    graph.add("access", lambda: None)
+    with pytest.raises(ValueError):
+        graph.add("access", lambda: None)
+
+
+def test_stage_logs_and_errors_keep_stage_order(caplog):
+    logger = logging.getLogger("uiucprescon.packager.test")
+
+    def first():
+        time.sleep(0.05)
+        logger.warning("first")
+        raise RuntimeError("first failed")
+
+    def second():
+        logger.warning("second")
+        raise RuntimeError("second failed")
+
+    def transform_item(item):
+        graph = StageGraph()
+        graph.add("first", first)
+        graph.add("second", second)
+        graph.add("never", lambda: logger.warning("never"),
+                  after=["first"])
+        graph.run()
+
+    with pytest.raises(TransformError) as error:
+        with caplog.at_level(logging.INFO):
+            run_item_transforms(
+                [make_item("000001", "00000001")], transform_item,
+                max_workers=3
+            )
+    assert [record.getMessage() for record in caplog.records] == \
+           ["first", "second"]
+    (_, _, item_error), = error.value.failures
+    assert str(item_error) == "first failed"
+
+
+def test_items_with_stages_do_not_deadlock():
+    def transform_item(_):
+        graph = StageGraph()
+        for name in ["supplementary", "preservation", "access"]:
+            graph.add(name, lambda: time.sleep(0.001))
+        graph.run()
+
+    items = [make_item("000001", f"{page:08d}") for page in range(50)]
+    run_item_transforms(items, transform_item, max_workers=2)
+
+
+def test_dlc_copies_preservation_while_encoding_access(tmp_path,
+                                                      monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def copy(_, source, destination, logger):
+        barrier.wait()
+        shutil.copyfile(source, destination)
+        return destination
+
+    def encode(_, source, destination, logger):
+        barrier.wait()
+        with open(destination, "wb") as file:
+            file.write(b"encoded")
+        return destination
+
+    monkeypatch.setattr(transformations.CopyFile, "transform", copy)
+    monkeypatch.setattr(transformations.ConvertJp2Standard, "transform",
+                        encode)
+    source = tmp_path / "000001_00000001.tif"
+    source.write_bytes(b"tiff")
+    item = make_item(
+        "000001", "00000001",
+        {InstantiationTypes.PRESERVATION: str(source)}
+    )
+    builder = packager.packages.DigitalLibraryCompound()
+    builder.transform_workers = 2
+    builder.transform(item.parent, str(tmp_path / "out"))
+    assert read_tree(tmp_path / "out") == {
+        os.path.join("000001", "preservation", "000001-00000001.tif"):
+            b"tiff",
+        os.path.join("000001", "access", "000001-00000001.jp2"):
+            b"encoded",
+    }
+
+
+def test_overlapping_transforms_leave_logger_alone(caplog):
+    logger = logging.getLogger("uiucprescon.packager")
+    added = logging.NullHandler()
+    started = threading.Barrier(2, timeout=5)
+
+    def transform_item(item):
+        started.wait()
+        if item.metadata[Metadata.ID] == "000002":
+            logger.addHandler(added)
+        logging.getLogger("uiucprescon.packager.test").warning(
+            item.metadata[Metadata.ID]
+        )
+
+    def transform(object_id):
+        run_item_transforms(
+            [make_item(object_id, "00000001")] * 2, transform_item,
+            max_workers=2
+        )
+
+    threads = [
+        threading.Thread(target=transform, args=(object_id,))
+        for object_id in ["000001", "000002"]
+    ]
+    handlers = list(logger.handlers)
+    try:
+        with caplog.at_level(logging.INFO):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert logger.handlers == handlers + [added]
+        assert logger.propagate is True
+    finally:
+        logger.removeHandler(added)
+    assert sorted(record.getMessage() for record in caplog.records) == \
+           ["000001", "000001", "000002", "000002"]
+
+
+def test_records_of_new_loggers_keep_item_order(caplog):
+    logger = logging.getLogger("uiucprescon.packager")
+    received = []
+    handler = logging.Handler()
+    handler.emit = lambda record: received.append(record.getMessage())
+    logger.addHandler(handler)
+
+    def transform_item(item):
+        page = int(item.metadata[Metadata.ITEM_NAME])
+        time.sleep(0.01 * (page % 3))
+        # A logger that did not exist when the transform started
+        logging.getLogger(
+            f"uiucprescon.packager.new.page{page}"
+        ).warning("page %d", page)
+
+    items = [make_item("000001", f"{page:08d}") for page in range(6)]
+    try:
+        with caplog.at_level(logging.INFO):
+            run_item_transforms(items, transform_item, max_workers=3)
+    finally:
+        logger.removeHandler(handler)
+    expected = [f"page {page}" for page in range(6)]
+    assert [record.getMessage() for record in caplog.records] == expected
+    assert received == expected
+    assert handler.filters == []
+
+
+def test_stages_overlap_while_items_are_queued():
+    barriers = {}
+    lock = threading.Lock()
+
+    def stage(page):
+        def run():
+            with lock:
+                barrier = barriers.setdefault(
+                    page, threading.Barrier(2, timeout=5)
+                )
+            barrier.wait()
+        return run
+
+    def transform_item(item):
+        page = item.metadata[Metadata.ITEM_NAME]
+        graph = StageGraph()
+        graph.add("preservation", stage(page))
+        graph.add("access", stage(page))
+        graph.run()
+
+    # More items than threads, so the item pool always has queued items
+    items = [make_item("000001", f"{page:08d}") for page in range(8)]
+    run_item_transforms(items, transform_item, max_workers=2)
+    assert all(barrier.n_waiting == 0 and not barrier.broken
+               for barrier in barriers.values())
+    assert len(barriers) == 8
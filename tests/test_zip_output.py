@@ -0,0 +1,177 @@
+import os
+import time
+import zipfile
+
+import pytest
+
+from uiucprescon import packager
+from uiucprescon.packager.packages import hathi_jp2_package, zip_output
+
+
+def make_batch(root, extension, pages=3):
+    batch = root / "batch"
+    for package_id in ["000001", "000002"]:
+        package_dir = batch / package_id
+        package_dir.mkdir(parents=True)
+        for page in range(1, pages + 1):
+            (package_dir / f"{page:08d}{extension}").write_bytes(
+                f"{package_id}-{page}".encode() * 100
+            )
+    return str(batch)
+
+
+def read_directory(path):
+    contents = {}
+    for name in sorted(os.listdir(path)):
+        with open(os.path.join(path, name), "rb") as file:
+            contents[name] = file.read()
+    return contents
+
+
+def read_zip(path):
+    with zipfile.ZipFile(path) as archive:
+        return {
+            name: archive.read(name) for name in sorted(archive.namelist())
+        }
+
+
+@pytest.mark.parametrize("package_type,extension", [
+    (packager.packages.HathiJp2, ".jp2"),
+    (packager.packages.HathiTiff, ".tif"),
+])
+@pytest.mark.parametrize("compression,compress_type", [
+    ("stored", zipfile.ZIP_STORED),
+    ("deflated", zipfile.ZIP_DEFLATED),
+])
+def test_zip_output_matches_directory_output(tmp_path, package_type,
+                                             extension, compression,
+                                             compress_type):
+    batch = make_batch(tmp_path, extension)
+    factory = packager.PackageFactory(package_type())
+    directory_dest = tmp_path / "directories"
+    zip_dest = tmp_path / "zips"
+    for object_name in ["000001", "000002"]:
+        (directory_dest / object_name).mkdir(parents=True)
+    for package in factory.locate_packages(batch):
+        factory.transform(package, str(directory_dest))
+    for package in factory.locate_packages(batch):
+        factory.transform(package, str(zip_dest), zip_output=compression)
+
+    assert sorted(os.listdir(zip_dest)) == ["000001.zip", "000002.zip"]
+    for object_name in ["000001", "000002"]:
+        zip_path = zip_dest / f"{object_name}.zip"
+        assert read_zip(zip_path) == \
+               read_directory(directory_dest / object_name)
+        with zipfile.ZipFile(zip_path) as archive:
+            assert {info.compress_type for info in archive.infolist()} == \
+                   {compress_type}
+
+
+def test_converted_files_are_added_from_scratch(tmp_path, monkeypatch):
+    generated = []
+
+    def convert(_, source, destination):
+        with open(destination, "wb") as file:
+            file.write(b"converted " + os.path.basename(source).encode())
+        generated.append(destination)
+
+    monkeypatch.setattr(hathi_jp2_package.ConvertStrategy, "convert", convert)
+    batch = make_batch(tmp_path, ".tif")
+    package = next(iter(
+        packager.PackageFactory(packager.packages.HathiTiff())
+        .locate_packages(batch)
+    ))
+    builder = packager.packages.HathiJp2()
+    builder.zip_output = "deflated"
+    builder.transform(package, str(tmp_path / "out"))
+
+    object_name = package.metadata[packager.Metadata.ID]
+    assert os.listdir(tmp_path / "out") == [f"{object_name}.zip"]
+    assert read_zip(tmp_path / "out" / f"{object_name}.zip") == {
+        f"{page:08d}.jp2": f"converted {page:08d}.tif".encode()
+        for page in range(1, 4)
+    }
+    assert not any(os.path.exists(path) for path in generated)
+
+
+def test_failed_transform_leaves_no_zip(tmp_path, monkeypatch):
+    def fail(*_):
+        raise RuntimeError("encoder failed")
+
+    monkeypatch.setattr(hathi_jp2_package.ConvertStrategy, "convert", fail)
+    batch = make_batch(tmp_path, ".tif")
+    package = next(iter(
+        packager.PackageFactory(packager.packages.HathiTiff())
+        .locate_packages(batch)
+    ))
+    factory = packager.PackageFactory(packager.packages.HathiJp2())
+    with pytest.raises(RuntimeError):
+        factory.transform(package, str(tmp_path / "out"), zip_output="stored")
+    assert os.listdir(tmp_path / "out") == []
+
+
+def test_zip_output_is_validated():
+    factory = packager.PackageFactory(packager.packages.HathiJp2())
+    with pytest.raises(ValueError):
+        factory.transform(None, "out", zip_output="bzip2")
+    factory = packager.PackageFactory(
+        packager.packages.DigitalLibraryCompound()
+    )
+    with pytest.raises(ValueError):
+        factory.transform(None, "out", zip_output="stored")
+
+
+def test_writer_rejects_writes_after_close(tmp_path):
+    writer = zip_output.ZipPackageWriter(str(tmp_path / "000001.zip"))
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.add_file(__file__, "test.py")
+
+
+def test_parallel_zip_members_keep_item_order(tmp_path, monkeypatch):
+    def convert(_, source, destination):
+        # Finish the items in a different order than they were started
+        page = int(os.path.splitext(os.path.basename(source))[0])
+        time.sleep(0.01 * (page % 3))
+        with open(destination, "wb") as file:
+            file.write(b"converted " + os.path.basename(source).encode())
+
+    monkeypatch.setattr(hathi_jp2_package.ConvertStrategy, "convert", convert)
+    batch = make_batch(tmp_path, ".tif", pages=6)
+    package = next(iter(
+        packager.PackageFactory(packager.packages.HathiTiff())
+        .locate_packages(batch)
+    ))
+    object_name = package.metadata[packager.Metadata.ID]
+    factory = packager.PackageFactory(packager.packages.HathiJp2())
+    factory.transform(package, str(tmp_path / "serial"), zip_output="stored")
+    factory.transform(package, str(tmp_path / "parallel"),
+                      zip_output="stored", max_workers=3)
+
+    def members(dest):
+        with zipfile.ZipFile(dest / f"{object_name}.zip") as archive:
+            return [(name, archive.read(name))
+                    for name in archive.namelist()]
+
+    assert members(tmp_path / "parallel") == members(tmp_path / "serial")
+    assert [name for name, _ in members(tmp_path / "parallel")] == \
+           [f"{page:08d}.jp2" for page in range(1, 7)]
+
+
+def test_parallel_copied_zip_matches_serial(tmp_path):
+    batch = make_batch(tmp_path, ".tif", pages=6)
+    factory = packager.PackageFactory(packager.packages.HathiTiff())
+    for package in factory.locate_packages(batch):
+        factory.transform(package, str(tmp_path / "serial"),
+                          zip_output="deflated")
+        factory.transform(package, str(tmp_path / "parallel"),
+                          zip_output="deflated", max_workers=3)
+    for object_name in ["000001", "000002"]:
+        with zipfile.ZipFile(tmp_path / "serial" / f"{object_name}.zip") \
+                as serial, \
+                zipfile.ZipFile(
+                    tmp_path / "parallel" / f"{object_name}.zip"
+                ) as parallel:
+            assert parallel.namelist() == serial.namelist()
+            assert all(parallel.read(name) == serial.read(name)
+                       for name in serial.namelist())
@@ -0,0 +1,372 @@
+import concurrent.futures
+import os
+import tempfile
+import threading
+import zipfile
+from unittest.mock import Mock
+
+import pytest
+
+from uiucprescon import packager
+from uiucprescon.packager import errors
+from uiucprescon.packager.common import InstantiationTypes, Metadata
+from uiucprescon.packager.packages import \
+    collection, digital_library_compound, zip_session
+
+
+@pytest.fixture
+def archives(tmp_path):
+    paths = []
+    for bib_id in ["1234", "5678", "9012"]:
+        path = tmp_path / f"{bib_id}.zip"
+        with zipfile.ZipFile(path, "w") as archive:
+            for page in range(1, 4):
+                archive.writestr(f"{bib_id}/{page:08d}.jp2", b"x" * page)
+        paths.append(str(path))
+    return paths
+
+
+def zipped_instantiation(archive):
+    bib_id = os.path.splitext(os.path.basename(archive))[0]
+    package = collection.Package(archive)
+    package.component_metadata[Metadata.PATH] = archive
+    package_object = collection.PackageObject(parent=package)
+    item = collection.Item(parent=package_object)
+    instantiation = collection.Instantiation(
+        InstantiationTypes.ACCESS, item,
+        [f"{page:08d}.jp2" for page in range(1, 4)]
+    )
+    instantiation.component_metadata[Metadata.PATH] = bib_id
+    return instantiation
+
+
+def test_get_files_opens_archive_once(archives, monkeypatch):
+    opened = Mock(wraps=zipfile.ZipFile)
+    monkeypatch.setattr(zip_session, "ZipFile", opened)
+    with zip_session.ZipSession() as session:
+        files = list(zipped_instantiation(archives[0]).get_files(session))
+        assert [os.path.getsize(f) for f in files] == [1, 2, 3]
+        assert opened.call_count == 1
+        assert session.stats == zip_session.ZipSessionStats(
+            archives_opened=1, archives_reused=2,
+            files_extracted=3, bytes_extracted=6, files_opened=0
+        )
+    assert not any(os.path.exists(f) for f in files)
+
+
+def test_extracted_files_are_shared(archives):
+    with zip_session.ZipSession() as session:
+        instantiation = zipped_instantiation(archives[0])
+        first = list(instantiation.get_files())
+        second = list(instantiation.get_files())
+        assert first == second
+        assert session.stats.files_extracted == 3
+        assert all(f.startswith(session.extract_dir) for f in first)
+
+
+def test_least_recently_used_archive_is_closed(archives):
+    session = zip_session.ZipSession(max_open_archives=2)
+    first = session.open_archive(archives[0])
+    session.open_archive(archives[1])
+    session.open_archive(archives[0])
+    session.open_archive(archives[2])
+    assert first.fp is not None
+    assert session.stats.archives_opened == 3
+    assert session.open_archive(archives[0]) is first
+    session.cleanup()
+    assert first.fp is None
+
+
+def test_same_member_name_in_different_archives(tmp_path):
+    session = zip_session.ZipSession(extract_dir=str(tmp_path / "scratch"))
+    extracted = []
+    for name in ["a", "b"]:
+        archive = tmp_path / f"{name}.zip"
+        with zipfile.ZipFile(archive, "w") as zip_file:
+            zip_file.writestr("page.jp2", name)
+        extracted.append(session.extract(str(archive), "page.jp2"))
+    with open(extracted[0]) as first, open(extracted[1]) as second:
+        assert (first.read(), second.read()) == ("a", "b")
+    session.cleanup()
+    assert os.listdir(tmp_path / "scratch") == []
+
+
+def test_missing_member(archives):
+    instantiation = zipped_instantiation(archives[0])
+    instantiation._files = ["missing.jp2"]
+    with zip_session.ZipSession():
+        with pytest.raises(errors.ZipFileException):
+            list(instantiation.get_files())
+
+
+def test_current_session_is_innermost():
+    with zip_session.ZipSession() as outer:
+        assert zip_session.current_session() is outer
+        with zip_session.ZipSession() as inner:
+            assert zip_session.current_session() is inner
+        assert zip_session.current_session() is outer
+    assert zip_session.current_session() is None
+
+
+def test_get_files_outside_a_session(archives):
+    files = zipped_instantiation(archives[0]).get_files()
+    first = next(files)
+    assert os.path.exists(first)
+    assert zip_session.current_session() is None
+    rest = list(files)
+    assert len(rest) == 2
+    assert not any(os.path.exists(f) for f in [first] + rest)
+
+
+def test_extract_files_needs_a_session(archives):
+    with pytest.raises(ValueError):
+        zipped_instantiation(archives[0]).parent.extract_files()
+
+
+def test_extract_does_not_hold_the_lock(archives, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    extract_member = zip_session._extract_member
+
+    def slow_extract_member(zip_file, info, path):
+        started.set()
+        release.wait(5)
+        return extract_member(zip_file, info, path)
+
+    monkeypatch.setattr(zip_session, "_extract_member", slow_extract_member)
+    with zip_session.ZipSession() as session, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(session.extract, archives[0], "1234/00000001.jp2")
+        assert started.wait(5)
+        try:
+            with session.open(archives[1], "5678/00000002.jp2") as stream:
+                assert stream.read() == b"xx"
+            same = pool.submit(
+                session.extract, archives[0], "1234/00000001.jp2"
+            )
+        finally:
+            release.set()
+        assert same.result(timeout=5) == first.result(timeout=5)
+        assert session.stats.files_extracted == 1
+
+
+def test_invalid_max_open_archives():
+    with pytest.raises(ValueError):
+        zip_session.ZipSession(max_open_archives=0)
+
+
+def test_iter_streams_from_archive(archives, monkeypatch):
+    extract = Mock(side_effect=AssertionError("extracted"))
+    monkeypatch.setattr(zip_session.ZipSession, "extract", extract)
+    instantiation = zipped_instantiation(archives[0])
+    streams = []
+    with zip_session.ZipSession() as session:
+        for name, stream in instantiation.iter_streams():
+            streams.append((name, stream.read()))
+            assert not stream.closed
+        assert session.stats.files_opened == 3
+    assert streams == [
+        ("1234/00000001.jp2", b"x"),
+        ("1234/00000002.jp2", b"xx"),
+        ("1234/00000003.jp2", b"xxx"),
+    ]
+
+
+def test_iter_streams_closes_previous_stream(tmp_path):
+    package = collection.Package(str(tmp_path))
+    package.component_metadata[Metadata.PATH] = str(tmp_path)
+    item = collection.Item(parent=collection.PackageObject(parent=package))
+    instantiation = collection.Instantiation(
+        InstantiationTypes.ACCESS, item, ["a.jp2", "b.jp2"]
+    )
+    instantiation.component_metadata[Metadata.PATH] = str(tmp_path)
+    (tmp_path / "a.jp2").write_bytes(b"a")
+    (tmp_path / "b.jp2").write_bytes(b"b")
+
+    streams = instantiation.iter_streams()
+    name, first = next(streams)
+    assert name == str(tmp_path / "a.jp2")
+    next(streams)
+    assert first.closed
+
+    opened = list(instantiation.open_files())
+    assert [stream.read() for stream in opened] == [b"a", b"b"]
+    for stream in opened:
+        stream.close()
+
+
+def test_open_stream_outlives_archive_handle(archives):
+    session = zip_session.ZipSession(max_open_archives=1)
+    stream = session.open(archives[0], "1234/00000003.jp2")
+    session.open_archive(archives[1])
+    session.cleanup()
+    with stream:
+        assert stream.read() == b"xxx"
+
+
+def test_supplementary_copied_from_archive(tmp_path, monkeypatch):
+    archive = tmp_path / "1234.zip"
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("1234/00000001.txt", b"ocr")
+    package = collection.Package(str(archive))
+    package.component_metadata[Metadata.PATH] = str(archive)
+    package_object = collection.PackageObject(parent=package)
+    package_object.component_metadata[Metadata.ID] = "1234"
+    item = collection.Item(parent=package_object)
+    supplementary = collection.Instantiation(
+        InstantiationTypes.SUPPLEMENTARY, item, ["00000001.txt"]
+    )
+    supplementary.component_metadata[Metadata.PATH] = "1234"
+    monkeypatch.setattr(
+        zip_session.ZipSession, "extract",
+        Mock(side_effect=AssertionError("extracted"))
+    )
+
+    strategy = digital_library_compound.UseAccessTiffs()
+    strategy.transform_supplementary_data(item, dest=str(tmp_path / "out"))
+    output = tmp_path / "out" / "1234" / "supplementary" / "00000001.txt"
+    assert output.read_bytes() == b"ocr"
+
+
+def test_list_file_names_does_not_open_archive(archives, monkeypatch):
+    monkeypatch.setattr(
+        zip_session, "ZipFile", Mock(side_effect=AssertionError("opened"))
+    )
+    instantiation = zipped_instantiation(archives[0])
+    assert instantiation.list_file_names() == [
+        "1234/00000001.jp2", "1234/00000002.jp2", "1234/00000003.jp2"
+    ]
+
+
+def test_strategy_selection_does_not_extract(archives, monkeypatch):
+    monkeypatch.setattr(
+        zip_session.ZipSession, "extract",
+        Mock(side_effect=AssertionError("extracted"))
+    )
+    item = zipped_instantiation(archives[0]).parent
+    builder = digital_library_compound.DigitalLibraryCompound()
+    strategy = builder._get_item_transformer_strategy(item)
+    assert isinstance(strategy, digital_library_compound.UsePreservationForAll)
+
+
+@pytest.fixture
+def large_archive(tmp_path):
+    path = tmp_path / "5678.zip"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for page in range(1, 41):
+            archive.writestr(f"5678/{page:08d}.jp2", os.urandom(20_000))
+            archive.writestr(f"5678/{page:08d}.txt", b"ocr")
+    return str(path)
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_extract_many(large_archive, max_workers):
+    with zipfile.ZipFile(large_archive) as archive:
+        members = archive.namelist()
+        expected = [archive.read(member) for member in members]
+    with zip_session.ZipSession() as session:
+        report = session.extract_many(large_archive, members, max_workers)
+        assert len(report.files) == 80
+        contents = []
+        for path in report.files:
+            with open(path, "rb") as extracted:
+                contents.append(extracted.read())
+        assert contents == expected
+        assert report.bytes_extracted == sum(map(len, expected))
+        assert report.megabytes_per_second > 0
+        assert session.stats.files_extracted == 80
+
+        again = session.extract_many(large_archive, members, max_workers)
+        assert again.files == report.files
+        assert again.bytes_extracted == 0
+
+
+def test_extract_many_uses_a_handle_per_thread(large_archive, monkeypatch):
+    opened = Mock(wraps=zipfile.ZipFile)
+    monkeypatch.setattr(zip_session, "ZipFile", opened)
+    with zipfile.ZipFile(large_archive) as archive:
+        members = archive.namelist()
+    with zip_session.ZipSession() as session:
+        session.extract_many(large_archive, members, max_workers=3)
+    # One handle for the session and at most one for each thread
+    assert 2 <= opened.call_count <= 4
+
+
+def test_component_extract_files(archives):
+    instantiations = [zipped_instantiation(archive) for archive in archives]
+    with zip_session.ZipSession() as session:
+        report = instantiations[0].parent.parent.extract_files(
+            max_workers=2
+        )
+        assert len(report.files) == 3
+        assert list(instantiations[0].get_files()) == report.files
+        assert session.stats.files_extracted == 3
+
+
+def test_component_extract_files_missing_member(archives):
+    instantiation = zipped_instantiation(archives[0])
+    instantiation._files = ["00000001.jp2", "missing.jp2"]
+    with zip_session.ZipSession():
+        with pytest.raises(errors.ZipFileException) as error:
+            instantiation.parent.extract_files(max_workers=2)
+    assert error.value.problem_files == ["1234/missing.jp2"]
+
+
+def zipped_item(tmp_path, extension):
+    archive = tmp_path / "1234.zip"
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr(f"1234/00000001{extension}", b"page")
+    package = collection.Package(str(archive))
+    package.component_metadata[Metadata.PATH] = str(archive)
+    package_object = collection.PackageObject(parent=package)
+    package_object.component_metadata[Metadata.ID] = "1234"
+    item = collection.Item(parent=package_object)
+    item.component_metadata[Metadata.ITEM_NAME] = "00000001"
+    instantiation = collection.Instantiation(
+        InstantiationTypes.ACCESS, item, [f"00000001{extension}"]
+    )
+    instantiation.component_metadata[Metadata.PATH] = "1234"
+    return package_object
+
+
+@pytest.mark.parametrize("package_type,extension", [
+    (packager.packages.HathiJp2, ".jp2"),
+    (packager.packages.HathiTiff, ".tif"),
+    (packager.packages.CaptureOnePackage, ".tif"),
+])
+@pytest.mark.parametrize("workers,executor", [
+    (None, "thread"),
+    (2, "thread"),
+    (2, "process"),
+])
+def test_transform_removes_extracted_files(tmp_path, monkeypatch,
+                                           package_type, extension,
+                                           workers, executor):
+    # Worker processes extract their own files, so only an empty temporary
+    # directory shows they were removed there too.
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir()
+    monkeypatch.setenv("TMPDIR", str(temp_dir))
+    monkeypatch.setattr(tempfile, "tempdir", None)
+    extracted = []
+    extract = zip_session.ZipSession.extract
+
+    def recording_extract(self, archive, member):
+        path = extract(self, archive, member)
+        extracted.append(path)
+        return path
+
+    monkeypatch.setattr(zip_session.ZipSession, "extract",
+                        recording_extract)
+    package_object = zipped_item(tmp_path, extension)
+    dest = tmp_path / "out"
+    (dest / "1234").mkdir(parents=True)
+    packager.PackageFactory(package_type()).transform(
+        package_object, str(dest), max_workers=workers, executor=executor
+    )
+
+    assert extracted or executor == "process"
+    assert not any(os.path.exists(path) for path in extracted)
+    assert list(temp_dir.iterdir()) == []
+    assert [path.read_bytes() for path in dest.rglob("*") if path.is_file()] \
+        == [b"page"]